@@ -38,7 +38,92 @@ class Settings:
     AZURE_TTS_KEY: str = os.getenv("AZURE_TTS_KEY", "")
     AZURE_TTS_REGION: str = os.getenv("AZURE_TTS_REGION", "")
     AZURE_TTS_VOICE: str = os.getenv("AZURE_TTS_VOICE", "")
+    GOOGLE_TTS_API_KEY: str = os.getenv("GOOGLE_TTS_API_KEY", "")
+    GOOGLE_TTS_LANGUAGE: str = os.getenv("GOOGLE_TTS_LANGUAGE", "en-US")
+    GOOGLE_TTS_VOICE: str = os.getenv("GOOGLE_TTS_VOICE", "en-US-Neural2-D")
+    # Synthesized audio cache (services/audio_cache.py), content-addressed files with LRU eviction
+    TTS_CACHE_DIR: str = os.getenv(
+        "TTS_CACHE_DIR",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "tts_cache"),
+    )
+    TTS_CACHE_MAX_MB: int = int(os.getenv("TTS_CACHE_MAX_MB", "500"))
+
+    # Job search (JSearch) result cache
+    JOB_SEARCH_TTL_HOURS: float = float(os.getenv("JOB_SEARCH_TTL_HOURS", "6"))
+    JOB_SEARCH_STALE_HOURS: float = float(os.getenv("JOB_SEARCH_STALE_HOURS", "48"))
+    JOB_SEARCH_CACHE_MAX_ENTRIES: int = int(os.getenv("JOB_SEARCH_CACHE_MAX_ENTRIES", "500"))
+    JOB_SEARCH_FETCH_LIMIT: int = int(os.getenv("JOB_SEARCH_FETCH_LIMIT", "10"))
+
+    # Local job index (services/job_index.py)
+    JOB_INDEX_MAX_AGE_DAYS: int = int(os.getenv("JOB_INDEX_MAX_AGE_DAYS", "30"))
+    JOB_INDEX_MAX_JOBS: int = int(os.getenv("JOB_INDEX_MAX_JOBS", "50000"))
+    JOB_INGEST_ROLES: int = int(os.getenv("JOB_INGEST_ROLES", "20"))
+    JOB_INDEX_RELOAD_MINUTES: int = int(os.getenv("JOB_INDEX_RELOAD_MINUTES", "60"))
+
+    # Local sentence embeddings (services/embeddings.py), CPU only
+    EMBEDDINGS_ENABLED: bool = os.getenv("EMBEDDINGS_ENABLED", "true").lower() == "true"
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+    EMBEDDING_DIR: str = os.getenv(
+        "EMBEDDING_DIR",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "embeddings"),
+    )
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    EMBEDDING_SKILL_THRESHOLD: float = float(os.getenv("EMBEDDING_SKILL_THRESHOLD", "0.75"))
+
+    # Mock interview prompt memory: verbatim turns, and how many older turns to fold per summary update
+    INTERVIEW_HISTORY_WINDOW: int = int(os.getenv("INTERVIEW_HISTORY_WINDOW", "3"))
+    INTERVIEW_SUMMARY_BATCH: int = int(os.getenv("INTERVIEW_SUMMARY_BATCH", "2"))
+    # Speculative next questions (generated while the candidate answers) with feedback delivered afterwards
+    INTERVIEW_PREFETCH_ENABLED: bool = os.getenv("INTERVIEW_PREFETCH_ENABLED", "true").lower() == "true"
+    INTERVIEW_FOLLOW_UP_MIN_WORDS: int = int(os.getenv("INTERVIEW_FOLLOW_UP_MIN_WORDS", "15"))
+    INTERVIEW_FEEDBACK_WAIT_SECONDS: float = float(os.getenv("INTERVIEW_FEEDBACK_WAIT_SECONDS", "20"))
+    # An answer still without feedback after this long lost its evaluation (e.g. worker restart) and is re-evaluated
+    INTERVIEW_FEEDBACK_LOST_SECONDS: int = int(os.getenv("INTERVIEW_FEEDBACK_LOST_SECONDS", "120"))
+    # Live (WebSocket) interview sessions: idle time before state is dropped, events kept for resume
+    INTERVIEW_LIVE_IDLE_SECONDS: int = int(os.getenv("INTERVIEW_LIVE_IDLE_SECONDS", "300"))
+    INTERVIEW_LIVE_REPLAY_EVENTS: int = int(os.getenv("INTERVIEW_LIVE_REPLAY_EVENTS", "500"))
+
+    # Outbound HTTP clients (services/http_clients.py)
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10"))
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+    HTTP_READ_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", "15"))
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "60"))
     
+    # Prompt token budget (per LLM call, excluding the reserved completion)
+    LLM_INPUT_TOKEN_BUDGET: int = int(os.getenv("LLM_INPUT_TOKEN_BUDGET", "12000"))
+
+    # Resume uploads
+    MAX_RESUME_UPLOAD_BYTES: int = int(os.getenv("MAX_RESUME_UPLOAD_BYTES", str(5 * 1024 * 1024)))
+    # Allowance for multipart framing on top of the file cap when the whole request body is limited
+    UPLOAD_MULTIPART_OVERHEAD_BYTES: int = int(os.getenv("UPLOAD_MULTIPART_OVERHEAD_BYTES", str(64 * 1024)))
+    UPLOAD_CHUNK_BYTES: int = int(os.getenv("UPLOAD_CHUNK_BYTES", str(64 * 1024)))
+
+    # Roadmap resource lookups (YouTube search results)
+    RESOURCE_CACHE_TTL_HOURS: int = int(os.getenv("RESOURCE_CACHE_TTL_HOURS", str(24 * 14)))
+    RESOURCE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESOURCE_CACHE_MAX_ENTRIES", "5000"))
+    RESOURCE_SEARCH_WORKERS: int = int(os.getenv("RESOURCE_SEARCH_WORKERS", "8"))
+    RESOURCE_SEARCH_CONCURRENCY: int = int(os.getenv("RESOURCE_SEARCH_CONCURRENCY", "6"))
+    RESOURCE_LOOKUP_TIMEOUT_SECONDS: float = float(os.getenv("RESOURCE_LOOKUP_TIMEOUT_SECONDS", "20"))
+    ENRICHMENT_DEADLINE_SECONDS: float = float(os.getenv("ENRICHMENT_DEADLINE_SECONDS", "45"))
+    # Local resource index; live YouTube search mode: inline | background | off
+    RESOURCE_INDEX_DATASET: str = os.getenv(
+        "RESOURCE_INDEX_DATASET",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "curated_resources.json"),
+    )
+    RESOURCE_INDEX_MIN_SCORE: float = float(os.getenv("RESOURCE_INDEX_MIN_SCORE", "0.5"))
+    RESOURCE_LIVE_SEARCH: str = os.getenv("RESOURCE_LIVE_SEARCH", "background").lower()
+
+    # Roadmap curriculum storage: "normalized" (phase/topic/resource rows) or "blob"
+    ROADMAP_STORAGE: str = os.getenv("ROADMAP_STORAGE", "normalized").lower()
+
+    # A streamed roadmap still "generating" with no section written for this long lost its worker and is failed
+    ROADMAP_GENERATION_STALE_MINUTES: int = int(os.getenv("ROADMAP_GENERATION_STALE_MINUTES", "15"))
+
+    # Shared per-role roadmap templates (0 disables the cache)
+    ROADMAP_TEMPLATE_TTL_HOURS: int = int(os.getenv("ROADMAP_TEMPLATE_TTL_HOURS", "24"))
+    ROADMAP_TEMPLATE_MAX_ENTRIES: int = int(os.getenv("ROADMAP_TEMPLATE_MAX_ENTRIES", "200"))
+
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
     CORS_ORIGINS: List[str] = os.getenv(
         "CORS_ORIGINS", "http://localhost:5173,http://localhost:3000"
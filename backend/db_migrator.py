@@ -41,6 +41,15 @@ MIGRATIONS = {
             duration_minutes INT NOT NULL,
             state_json JSON NOT NULL,
             status VARCHAR(50) DEFAULT 'active',
+            current_round INT NOT NULL DEFAULT 1,
+            max_rounds INT NOT NULL DEFAULT 5,
+            remaining_seconds INT NOT NULL DEFAULT 0,
+            report_json JSON,
+            history_summary TEXT,
+            summary_through INT NOT NULL DEFAULT -1,
+            history_tokens_folded INT NOT NULL DEFAULT 0,
+            history_tokens_full INT NOT NULL DEFAULT 0,
+            history_tokens_sent INT NOT NULL DEFAULT 0,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
             updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
                 ON UPDATE CURRENT_TIMESTAMP,
@@ -48,6 +57,25 @@ MIGRATIONS = {
                 ON DELETE CASCADE
         );
     """,
+    "mock_interview_turns": """
+        CREATE TABLE IF NOT EXISTS mock_interview_turns (
+            turn_id INT AUTO_INCREMENT PRIMARY KEY,
+            session_id INT NOT NULL,
+            turn_index INT NOT NULL,
+            interviewer_name VARCHAR(255),
+            question TEXT NOT NULL,
+            answer TEXT,
+            feedback JSON,
+            skipped BOOLEAN DEFAULT FALSE,
+            elapsed_seconds INT,
+            penalty_seconds INT DEFAULT 0,
+            asked_at DATETIME,
+            answered_at DATETIME,
+            UNIQUE KEY uq_mock_turn (session_id, turn_index),
+            FOREIGN KEY (session_id) REFERENCES mock_interview_sessions(session_id)
+                ON DELETE CASCADE
+        );
+    """,
     "resumes": """
         CREATE TABLE IF NOT EXISTS resumes (
             resume_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -56,6 +84,8 @@ MIGRATIONS = {
             file_path VARCHAR(500),
             raw_file LONGBLOB,
             mime_type VARCHAR(255),
+            file_size INT,
+            file_sha256 CHAR(64),
             parsed_json JSON,
             uploaded_at DATETIME DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (user_id) REFERENCES users(user_id)
@@ -70,6 +100,15 @@ MIGRATIONS = {
         );
     """,
 
+    "skill_aliases": """
+        CREATE TABLE IF NOT EXISTS skill_aliases (
+            alias_key VARCHAR(255) PRIMARY KEY,
+            skill_id INT NOT NULL,
+            FOREIGN KEY (skill_id) REFERENCES skills(skill_id)
+                ON DELETE CASCADE
+        );
+    """,
+
     "user_skills": """
         CREATE TABLE IF NOT EXISTS user_skills (
             user_skill_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -78,6 +117,7 @@ MIGRATIONS = {
             level VARCHAR(50),
             last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 ON UPDATE CURRENT_TIMESTAMP,
+            UNIQUE KEY uq_user_skill (user_id, skill_id),
             FOREIGN KEY (user_id) REFERENCES users(user_id)
                 ON DELETE CASCADE,
             FOREIGN KEY (skill_id) REFERENCES skills(skill_id)
@@ -92,6 +132,15 @@ MIGRATIONS = {
             start_date DATE,
             end_date DATE,
             completion_percentage FLOAT DEFAULT 0,
+            overview_summary TEXT,
+            difficulty_level VARCHAR(100),
+            duration_total VARCHAR(100),
+            phase_count INT,
+            topic_count INT,
+            resource_count INT,
+            job_count INT,
+            content_version INT NOT NULL DEFAULT 0,
+            content_updated_at DATETIME,
             FOREIGN KEY (user_id) REFERENCES users(user_id)
                 ON DELETE CASCADE
         );
@@ -111,6 +160,64 @@ MIGRATIONS = {
                 ON DELETE SET NULL
         );
     """,
+    "roadmap_phases": """
+        CREATE TABLE IF NOT EXISTS roadmap_phases (
+            roadmap_id INT NOT NULL,
+            phase_index INT NOT NULL,
+            phase_title VARCHAR(255),
+            duration_weeks INT,
+            due_date DATE,
+            extra_json TEXT,
+            PRIMARY KEY (roadmap_id, phase_index),
+            FOREIGN KEY (roadmap_id) REFERENCES roadmaps(roadmap_id)
+                ON DELETE CASCADE
+        );
+    """,
+    "roadmap_topics": """
+        CREATE TABLE IF NOT EXISTS roadmap_topics (
+            topic_id INT AUTO_INCREMENT PRIMARY KEY,
+            roadmap_id INT NOT NULL,
+            phase_index INT NOT NULL,
+            topic_index INT NOT NULL,
+            title VARCHAR(255),
+            completed BOOLEAN DEFAULT FALSE,
+            completed_at DATETIME,
+            due_date DATE,
+            extra_json TEXT,
+            UNIQUE KEY uq_roadmap_topic (roadmap_id, phase_index, topic_index),
+            KEY idx_roadmap_topic_due (roadmap_id, due_date, completed),
+            KEY idx_roadmap_topic_title (title),
+            FOREIGN KEY (roadmap_id) REFERENCES roadmaps(roadmap_id)
+                ON DELETE CASCADE
+        );
+    """,
+    "roadmap_topic_resources": """
+        CREATE TABLE IF NOT EXISTS roadmap_topic_resources (
+            roadmap_id INT NOT NULL,
+            phase_index INT NOT NULL,
+            topic_index INT NOT NULL,
+            position INT NOT NULL,
+            title VARCHAR(255),
+            type VARCHAR(100),
+            url VARCHAR(500),
+            extra_json TEXT,
+            PRIMARY KEY (roadmap_id, phase_index, topic_index, position),
+            KEY idx_roadmap_resource_url (url(191)),
+            FOREIGN KEY (roadmap_id) REFERENCES roadmaps(roadmap_id)
+                ON DELETE CASCADE
+        );
+    """,
+    "roadmap_templates": """
+        CREATE TABLE IF NOT EXISTS roadmap_templates (
+            template_key CHAR(64) PRIMARY KEY,
+            target_role VARCHAR(255),
+            career_level VARCHAR(100),
+            timeline_months INT,
+            location VARCHAR(255),
+            template_json LONGTEXT,
+            created_at DATETIME
+        );
+    """,
     "resources": """
         CREATE TABLE IF NOT EXISTS resources (
             resource_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -120,7 +227,10 @@ MIGRATIONS = {
             url VARCHAR(500),
             difficulty VARCHAR(50),
             duration_minutes INT,
-            rating FLOAT
+            rating FLOAT,
+            query_key CHAR(40),
+            fetched_at DATETIME,
+            UNIQUE KEY uq_resource_query (query_key, type)
         );
     """,
     "jobs": """
@@ -131,7 +241,21 @@ MIGRATIONS = {
             location VARCHAR(255),
             salary_range VARCHAR(255),
             url VARCHAR(500),
-            posted_date DATE
+            posted_date DATE,
+            external_id VARCHAR(255),
+            description TEXT,
+            posted_label VARCHAR(100),
+            fetched_at DATETIME,
+            UNIQUE KEY uq_job_external (external_id)
+        );
+    """,
+    "job_searches": """
+        CREATE TABLE IF NOT EXISTS job_searches (
+            query_key CHAR(40) PRIMARY KEY,
+            query VARCHAR(255),
+            location VARCHAR(255),
+            job_ids TEXT,
+            fetched_at DATETIME
         );
     """,
 
@@ -140,6 +264,7 @@ MIGRATIONS = {
             requirement_id INT AUTO_INCREMENT PRIMARY KEY,
             job_id INT NOT NULL,
             skill_id INT NOT NULL,
+            UNIQUE KEY uq_job_skill (job_id, skill_id),
             FOREIGN KEY (job_id) REFERENCES jobs(job_id)
                 ON DELETE CASCADE,
             FOREIGN KEY (skill_id) REFERENCES skills(skill_id)
@@ -148,6 +273,89 @@ MIGRATIONS = {
     """
 }
 
+# Columns added after the initial schema. CREATE TABLE IF NOT EXISTS does not
+# touch existing tables, so these are applied only when the column is missing.
+ALTERATIONS = [
+    ("resumes", "file_size", "ALTER TABLE resumes ADD COLUMN file_size INT"),
+    ("resumes", "file_sha256", "ALTER TABLE resumes ADD COLUMN file_sha256 CHAR(64)"),
+    ("resources", "query_key", "ALTER TABLE resources ADD COLUMN query_key CHAR(40)"),
+    ("resources", "fetched_at", "ALTER TABLE resources ADD COLUMN fetched_at DATETIME"),
+    ("roadmaps", "overview_summary", "ALTER TABLE roadmaps ADD COLUMN overview_summary TEXT"),
+    ("roadmaps", "difficulty_level", "ALTER TABLE roadmaps ADD COLUMN difficulty_level VARCHAR(100)"),
+    ("roadmaps", "duration_total", "ALTER TABLE roadmaps ADD COLUMN duration_total VARCHAR(100)"),
+    ("roadmaps", "phase_count", "ALTER TABLE roadmaps ADD COLUMN phase_count INT"),
+    ("roadmaps", "topic_count", "ALTER TABLE roadmaps ADD COLUMN topic_count INT"),
+    ("roadmaps", "resource_count", "ALTER TABLE roadmaps ADD COLUMN resource_count INT"),
+    ("roadmaps", "job_count", "ALTER TABLE roadmaps ADD COLUMN job_count INT"),
+    ("jobs", "external_id", "ALTER TABLE jobs ADD COLUMN external_id VARCHAR(255)"),
+    ("jobs", "description", "ALTER TABLE jobs ADD COLUMN description TEXT"),
+    ("jobs", "posted_label", "ALTER TABLE jobs ADD COLUMN posted_label VARCHAR(100)"),
+    ("jobs", "fetched_at", "ALTER TABLE jobs ADD COLUMN fetched_at DATETIME"),
+    ("roadmaps", "content_version", "ALTER TABLE roadmaps ADD COLUMN content_version INT NOT NULL DEFAULT 0"),
+    ("roadmaps", "content_updated_at", "ALTER TABLE roadmaps ADD COLUMN content_updated_at DATETIME"),
+    ("mock_interview_sessions", "current_round", "ALTER TABLE mock_interview_sessions ADD COLUMN current_round INT NOT NULL DEFAULT 1"),
+    ("mock_interview_sessions", "max_rounds", "ALTER TABLE mock_interview_sessions ADD COLUMN max_rounds INT NOT NULL DEFAULT 5"),
+    ("mock_interview_sessions", "remaining_seconds", "ALTER TABLE mock_interview_sessions ADD COLUMN remaining_seconds INT NOT NULL DEFAULT 0"),
+    ("mock_interview_sessions", "report_json", "ALTER TABLE mock_interview_sessions ADD COLUMN report_json JSON"),
+    ("mock_interview_sessions", "history_summary", "ALTER TABLE mock_interview_sessions ADD COLUMN history_summary TEXT"),
+    ("mock_interview_sessions", "summary_through", "ALTER TABLE mock_interview_sessions ADD COLUMN summary_through INT NOT NULL DEFAULT -1"),
+    ("mock_interview_sessions", "history_tokens_folded", "ALTER TABLE mock_interview_sessions ADD COLUMN history_tokens_folded INT NOT NULL DEFAULT 0"),
+    ("mock_interview_sessions", "history_tokens_full", "ALTER TABLE mock_interview_sessions ADD COLUMN history_tokens_full INT NOT NULL DEFAULT 0"),
+    ("mock_interview_sessions", "history_tokens_sent", "ALTER TABLE mock_interview_sessions ADD COLUMN history_tokens_sent INT NOT NULL DEFAULT 0"),
+]
+
+# Indexes added after the initial schema: (table, index_name, statements).
+# Statements run in order, so any cleanup needed before a UNIQUE key goes first.
+INDEX_ALTERATIONS = [
+    ("user_skills", "uq_user_skill", [
+        """
+        DELETE us1 FROM user_skills us1
+        JOIN user_skills us2
+          ON us1.user_id = us2.user_id AND us1.skill_id = us2.skill_id
+         AND us1.user_skill_id < us2.user_skill_id
+        """,
+        "ALTER TABLE user_skills ADD UNIQUE KEY uq_user_skill (user_id, skill_id)",
+    ]),
+    ("jobs", "uq_job_external", [
+        "ALTER TABLE jobs ADD UNIQUE KEY uq_job_external (external_id)",
+    ]),
+    ("job_requirements", "uq_job_skill", [
+        """
+        DELETE jr1 FROM job_requirements jr1
+        JOIN job_requirements jr2
+          ON jr1.job_id = jr2.job_id AND jr1.skill_id = jr2.skill_id
+         AND jr1.requirement_id < jr2.requirement_id
+        """,
+        "ALTER TABLE job_requirements ADD UNIQUE KEY uq_job_skill (job_id, skill_id)",
+    ]),
+    ("resources", "uq_resource_query", [
+        "ALTER TABLE resources ADD UNIQUE KEY uq_resource_query (query_key, type)",
+    ]),
+]
+
+
+def _column_exists(cursor, table: str, column: str) -> bool:
+    cursor.execute(
+        """
+        SELECT 1 AS present FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """,
+        (table, column),
+    )
+    return cursor.fetchone() is not None
+
+
+def _index_exists(cursor, table: str, index: str) -> bool:
+    cursor.execute(
+        """
+        SELECT 1 AS present FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        LIMIT 1
+        """,
+        (table, index),
+    )
+    return cursor.fetchone() is not None
+
 
 def run_migrations():
     try:
@@ -155,6 +363,17 @@ def run_migrations():
             for table, query in MIGRATIONS.items():
                 print(f"→ Ensuring table: {table}")
                 cursor.execute(query)
+            for table, column, query in ALTERATIONS:
+                if _column_exists(cursor, table, column):
+                    continue
+                print(f"→ Adding column: {table}.{column}")
+                cursor.execute(query)
+            for table, index, statements in INDEX_ALTERATIONS:
+                if _index_exists(cursor, table, index):
+                    continue
+                print(f"→ Adding index: {table}.{index}")
+                for query in statements:
+                    cursor.execute(query)
     except Exception:
         traceback.print_exc()
 
@@ -1,10 +1,24 @@
 import os,sys,logging
+import asyncio
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from config import settings
 from database import init_db
-from routes import auth, user, skills, roadmap, mock_interview
+from models import Roadmap, MockInterview
+from services.skill_canonical import skill_index
+from services.resource_index import resource_index
+from services.http_clients import http_clients
+from services.job_search_cache import job_search_cache
+from services.job_index import job_index
+from services.embeddings import embedding_service
+from services.interview_prefetch import interview_prefetch
+from services.interview_live import live_interviews
+from services.tts import tts_cache
+from services.resource_cache import resource_cache
+from services.services_utils import UploadSizeLimit
+from routes import auth, user, skills, roadmap, mock_interview, jobs
 
 
 os.environ["PYTHONIOENCODING"] = "utf-8"
@@ -31,6 +45,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger("main")
 
+# Added first so CORS headers still wrap its 413s.
+app.add_middleware(UploadSizeLimit, limits={
+    "/api/user/upload/resume": settings.MAX_RESUME_UPLOAD_BYTES + settings.UPLOAD_MULTIPART_OVERHEAD_BYTES,
+})
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173", "http://127.0.0.1:5173"],
@@ -43,17 +61,74 @@ app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 @app.on_event("startup")
 def startup_event():
+    tts_cache.load()
     try:
         init_db()
         logger.info("✅ MySQL initialized successfully")
     except Exception as e:
         logger.warning(f"⚠️ MySQL init failed but continuing startup: {e}")
+        resource_index.load(include_db=False)
+        return
+
+    skill_index.load()
+    resource_index.load()
+    job_index.load()
+    try:
+        filled = Roadmap.backfill_summaries()
+        if filled:
+            logger.info(f"Backfilled summaries for {filled} roadmaps")
+    except Exception as e:
+        logger.warning(f"⚠️ Roadmap summary backfill failed: {e}")
+    try:
+        moved = MockInterview.backfill_turns()
+        if moved:
+            logger.info(f"Moved {moved} mock interview sessions to turn rows")
+    except Exception as e:
+        logger.warning(f"⚠️ Mock interview turn backfill failed: {e}")
+
+
+@app.on_event("startup")
+async def start_http_clients():
+    await http_clients.start()
+
+
+async def _reload_job_index():
+    # Postings ingested by the celery worker land in the DB, not in this process's index.
+    while True:
+        await asyncio.sleep(settings.JOB_INDEX_RELOAD_MINUTES * 60)
+        await asyncio.to_thread(job_index.load)
+
+
+@app.on_event("startup")
+async def start_job_index_reload():
+    if settings.JOB_INDEX_RELOAD_MINUTES > 0:
+        app.state.job_index_reload = asyncio.create_task(_reload_job_index())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await live_interviews.close_all()
+    await http_clients.aclose()
+    if embedding_service.enabled:
+        await asyncio.to_thread(embedding_service.flush)
 
 
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy", "version": "1.0.0"}
 
+@app.get("/api/metrics/cache")
+async def cache_metrics():
+    """In-process cache counters; api_calls_saved is the external quota not spent."""
+    return {
+        "job_search": job_search_cache.metrics(),
+        "resources": dict(resource_cache.stats),
+        "job_index": {"jobs": len(job_index)},
+        "interview_prefetch": interview_prefetch.metrics(),
+        "live_interviews": len(live_interviews),
+        "tts": tts_cache.metrics(),
+    }
+
 @app.get("/")
 async def root():
     return {"message": "Career Roadmap API running"}
@@ -64,6 +139,7 @@ app.include_router(user.router, prefix="/api/user")
 app.include_router(skills.router, prefix="/api/skills")
 app.include_router(roadmap.router, prefix="/api/roadmap")
 app.include_router(mock_interview.router, prefix="/api/mock-interview")
+app.include_router(jobs.router, prefix="/api/jobs")
 
 if __name__ == "__main__":
     try:
@@ -2,7 +2,8 @@
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any
 from database import get_db
-import logging, json
+from config import settings
+import logging, json, hashlib
 
 mysql_db = get_db()
 logger = logging.getLogger(__name__)
@@ -66,18 +67,29 @@ class Resume:
     """Resume model with binary storage and parsed JSON."""
 
     @staticmethod
-    def create_binary(user_id: int, filename: str, file_bytes: bytes, mime_type: str, parsed_json: dict):
-        """Store uploaded resume file + parsed JSON directly in DB."""
+    def create_binary(user_id: int, filename: str, file_bytes, mime_type: str, parsed_json: dict,
+                      file_size: Optional[int] = None, file_sha256: Optional[str] = None):
+        """
+        Store uploaded resume file + parsed JSON directly in DB.
+        file_bytes may be raw bytes or a seekable file handle (spooled upload);
+        a handle is read once, straight into the INSERT parameter.
+        """
         try:
+            if hasattr(file_bytes, "read"):
+                file_bytes.seek(0)
+                file_bytes = file_bytes.read()
             query = """
-                INSERT INTO resumes (user_id, file_path, raw_file, mime_type, parsed_json, uploaded_at)
-                VALUES (%s, %s, %s, %s, %s, %s)
+                INSERT INTO resumes (user_id, file_path, raw_file, mime_type, file_size, file_sha256,
+                                     parsed_json, uploaded_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
             """
             mysql_db.execute_query(query, (
                 user_id,
                 filename,
                 file_bytes,
                 mime_type,
+                file_size if file_size is not None else len(file_bytes or b""),
+                file_sha256,
                 json.dumps(parsed_json, ensure_ascii=False),
                 datetime.now(),
             ))
@@ -101,6 +113,21 @@ class Resume:
         query = "SELECT * FROM resumes WHERE resume_id=%s"
         return mysql_db.fetch_one(query, (resume_id,))
 
+    @staticmethod
+    def get_version(resume_id: int) -> Optional[Dict]:
+        """Owner and content identity only (no file or parsed JSON), for conditional requests."""
+        return mysql_db.fetch_one(
+            "SELECT resume_id, user_id, file_sha256, uploaded_at FROM resumes WHERE resume_id=%s",
+            (resume_id,),
+        )
+
+    @staticmethod
+    def get_parsed(resume_id: int) -> Optional[Dict]:
+        return mysql_db.fetch_one(
+            "SELECT resume_id, user_id, file_path, uploaded_at, parsed_json FROM resumes WHERE resume_id=%s",
+            (resume_id,),
+        )
+
     @staticmethod
     def delete(resume_id: int, user_id: int):
         query = "DELETE FROM resumes WHERE resume_id=%s AND user_id=%s"
@@ -134,43 +161,152 @@ class Resume:
             return None
 
 
+# skill_name -> skill_id, keyed case-insensitively to match the column collation.
+# Skills are never renamed or deleted by the app, so entries never go stale.
+_SKILL_ID_CACHE: Dict[str, int] = {}
+_SKILL_ID_CACHE_MAX = 20000
+
+
+def _skill_key(skill_name: str) -> str:
+    return (skill_name or "").strip().lower()
+
+
 class Skill:
     @staticmethod
     def get_or_create(skill_name: str, category: str = None) -> int:
+        key = _skill_key(skill_name)
+        if key in _SKILL_ID_CACHE:
+            return _SKILL_ID_CACHE[key]
         row = mysql_db.fetch_one("SELECT skill_id FROM SKILLS WHERE skill_name = %s", (skill_name,))
         if row:
+            Skill._remember(key, row["skill_id"])
             return row["skill_id"]
         with mysql_db.get_cursor() as cursor:
             cursor.execute(
                 "INSERT INTO SKILLS (skill_name, category) VALUES (%s, %s)",
                 (skill_name, category),
             )
+            Skill._remember(key, cursor.lastrowid)
             return cursor.lastrowid
 
+    @staticmethod
+    def _remember(key: str, skill_id: int):
+        if len(_SKILL_ID_CACHE) >= _SKILL_ID_CACHE_MAX:
+            _SKILL_ID_CACHE.clear()
+        _SKILL_ID_CACHE[key] = skill_id
+
+    @staticmethod
+    def remember(ids: Dict[str, int]):
+        """Cache {lowercased name: skill_id} pairs once the transaction that created them has committed."""
+        for key, skill_id in ids.items():
+            Skill._remember(key, skill_id)
+
+    @staticmethod
+    def bulk_get_or_create(skill_names: List[str], cursor=None) -> Dict[str, int]:
+        """
+        Resolve many skill names to ids: cache hits cost nothing, the rest take
+        one multi-row INSERT ... ON DUPLICATE KEY UPDATE plus one SELECT ... IN.
+        Returns {lowercased name: skill_id}. Pass a cursor to join its transaction;
+        the new ids are then not cached (the transaction may still roll back), and
+        the caller passes the result to Skill.remember after it commits.
+        """
+        names = {}
+        for name in skill_names or []:
+            name = (name or "").strip()[:255]
+            if name and _skill_key(name) not in names:
+                names[_skill_key(name)] = name
+
+        resolved = {k: _SKILL_ID_CACHE[k] for k in names if k in _SKILL_ID_CACHE}
+        pending = [names[k] for k in names if k not in resolved]
+        if not pending:
+            return resolved
+
+        def run(cur):
+            placeholders = ", ".join(["(%s)"] * len(pending))
+            cur.execute(
+                f"INSERT INTO SKILLS (skill_name) VALUES {placeholders} "
+                "ON DUPLICATE KEY UPDATE skill_id = skill_id",
+                pending,
+            )
+            in_list = ", ".join(["%s"] * len(pending))
+            cur.execute(f"SELECT skill_id, skill_name FROM SKILLS WHERE skill_name IN ({in_list})", pending)
+            return cur.fetchall()
+
+        if cursor is not None:
+            rows = run(cursor)
+        else:
+            with mysql_db.get_cursor() as cur:
+                rows = run(cur)
+
+        for row in rows:
+            key = _skill_key(row["skill_name"])
+            if cursor is None:
+                Skill._remember(key, row["skill_id"])
+            resolved[key] = row["skill_id"]
+        return resolved
+
     @staticmethod
     def get_all() -> List[Dict]:
         return mysql_db.fetch_all("SELECT * FROM SKILLS")
 
 
+class SkillAlias:
+    """Normalized spelling (see services.skill_canonical) -> canonical skill."""
+
+    @staticmethod
+    def get_all() -> List[Dict]:
+        return mysql_db.fetch_all("""
+            SELECT a.alias_key, a.skill_id, s.skill_name
+            FROM skill_aliases a
+            JOIN SKILLS s ON a.skill_id = s.skill_id
+        """)
+
+    @staticmethod
+    def bulk_add(rows: List[tuple]):
+        """rows: [(alias_key, skill_id), ...]; existing aliases keep their mapping."""
+        if not rows:
+            return
+        placeholders = ", ".join(["(%s, %s)"] * len(rows))
+        params = [v for row in rows for v in row]
+        with mysql_db.get_cursor() as cursor:
+            cursor.execute(
+                f"INSERT IGNORE INTO skill_aliases (alias_key, skill_id) VALUES {placeholders}",
+                params,
+            )
+
 
 class UserSkill:
     @staticmethod
     def create_or_update(user_id: int, skill_id: int, level: str):
-        row = mysql_db.fetch_one(
-            "SELECT user_skill_id FROM USER_SKILLS WHERE user_id = %s AND skill_id = %s",
-            (user_id, skill_id),
-        )
         with mysql_db.get_cursor() as cursor:
-            if row:
-                cursor.execute(
-                    "UPDATE USER_SKILLS SET level = %s, last_updated = NOW() WHERE user_skill_id = %s",
-                    (level, row["user_skill_id"]),
-                )
-            else:
-                cursor.execute(
-                    "INSERT INTO USER_SKILLS (user_id, skill_id, level, last_updated) VALUES (%s, %s, %s, NOW())",
-                    (user_id, skill_id, level),
-                )
+            cursor.execute(
+                "INSERT INTO USER_SKILLS (user_id, skill_id, level, last_updated) VALUES (%s, %s, %s, NOW()) "
+                "ON DUPLICATE KEY UPDATE level = VALUES(level), last_updated = NOW()",
+                (user_id, skill_id, level),
+            )
+
+    @staticmethod
+    def bulk_create_or_update(user_id: int, skill_names: List[str], level: str) -> int:
+        """
+        Upsert a user's skills in one transaction: one batch for SKILLS and one
+        INSERT ... ON DUPLICATE KEY UPDATE for USER_SKILLS (unique on user_id, skill_id).
+        """
+        with mysql_db.get_cursor() as cursor:
+            ids = Skill.bulk_get_or_create(skill_names, cursor=cursor)
+            skill_ids = sorted(set(ids.values()))
+            if not skill_ids:
+                return 0
+            placeholders = ", ".join(["(%s, %s, %s, NOW())"] * len(skill_ids))
+            params = []
+            for sid in skill_ids:
+                params.extend((user_id, sid, level))
+            cursor.execute(
+                f"INSERT INTO USER_SKILLS (user_id, skill_id, level, last_updated) VALUES {placeholders} "
+                "ON DUPLICATE KEY UPDATE level = VALUES(level), last_updated = NOW()",
+                params,
+            )
+        Skill.remember(ids)
+        return len(skill_ids)
 
     @staticmethod
     def get_by_user(user_id: int) -> List[Dict]:
@@ -184,6 +320,42 @@ class UserSkill:
 
 
 
+# Overview fields and section counts copied onto the roadmaps row whenever the
+# roadmap JSON is written, so listing roadmaps never has to parse the blob.
+ROADMAP_SUMMARY_COLUMNS = (
+    "overview_summary", "difficulty_level", "duration_total",
+    "phase_count", "topic_count", "resource_count", "job_count",
+)
+
+
+def roadmap_summary(roadmap_data: Optional[dict]) -> Dict[str, Any]:
+    data = roadmap_data if isinstance(roadmap_data, dict) else {}
+    overview = data.get("overview") if isinstance(data.get("overview"), dict) else {}
+    curriculum = data.get("curriculum") if isinstance(data.get("curriculum"), list) else []
+    jobs = data.get("related_jobs") if isinstance(data.get("related_jobs"), list) else []
+
+    phases = [p for p in curriculum if isinstance(p, dict)]
+    topics = [t for p in phases for t in (p.get("topics") or [])]
+    resources = sum(len(t.get("resources") or []) for t in topics if isinstance(t, dict))
+
+    def text(key, limit=None):
+        value = overview.get(key)
+        if value is None or value == "":
+            return None
+        value = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+        return value[:limit] if limit else value
+
+    return {
+        "overview_summary": text("overview_summary"),
+        "difficulty_level": text("difficulty_level", 100),
+        "duration_total": text("duration_total", 100),
+        "phase_count": len(phases),
+        "topic_count": len(topics),
+        "resource_count": resources,
+        "job_count": len(jobs),
+    }
+
+
 class Roadmap:
     @staticmethod
     def create(user_id: int, target_role: str,
@@ -211,18 +383,76 @@ class Roadmap:
     @staticmethod
     def get_by_id(roadmap_id: int, user_id: int) -> Dict:
         row = mysql_db.fetch_one("""
-            SELECT roadmap_id, user_id, target_role, start_date, end_date, completion_percentage
+            SELECT roadmap_id, user_id, target_role, start_date, end_date, completion_percentage, content_version
             FROM roadmaps WHERE roadmap_id=%s AND user_id=%s
         """, (roadmap_id, user_id))
         if not row:
             raise Exception("Roadmap not found")
         return row
 
+    @staticmethod
+    def list_summaries(user_id: int, limit: int = 50, offset: int = 0) -> List[Dict]:
+        return mysql_db.fetch_all(f"""
+            SELECT roadmap_id, user_id, target_role, start_date, end_date, completion_percentage,
+                   {", ".join(ROADMAP_SUMMARY_COLUMNS)}
+            FROM roadmaps WHERE user_id=%s
+            ORDER BY roadmap_id DESC LIMIT %s OFFSET %s
+        """, (user_id, limit, offset))
+
+    @staticmethod
+    def count_by_user(user_id: int) -> int:
+        row = mysql_db.fetch_one("SELECT COUNT(*) AS total FROM roadmaps WHERE user_id=%s", (user_id,))
+        return int(row["total"]) if row else 0
+
+    @staticmethod
+    def write_summary(cursor, roadmap_id: int, roadmap_data: Optional[dict]):
+        """Materialize roadmap_summary(roadmap_data) onto the roadmaps row using the caller's cursor."""
+        summary = roadmap_summary(roadmap_data)
+        cursor.execute(
+            f"UPDATE roadmaps SET {', '.join(f'{c}=%s' for c in ROADMAP_SUMMARY_COLUMNS)} WHERE roadmap_id=%s",
+            tuple(summary[c] for c in ROADMAP_SUMMARY_COLUMNS) + (roadmap_id,),
+        )
+
+    @staticmethod
+    def backfill_summaries(batch_size: int = 100) -> int:
+        """Fill summary columns for roadmaps created before they existed."""
+        done, last_id = 0, 0
+        while True:
+            rows = mysql_db.fetch_all("""
+                SELECT r.roadmap_id, s.description
+                FROM roadmaps r
+                LEFT JOIN (
+                    SELECT roadmap_id, MIN(step_id) AS step_id FROM roadmap_steps GROUP BY roadmap_id
+                ) first_step ON first_step.roadmap_id = r.roadmap_id
+                LEFT JOIN roadmap_steps s ON s.step_id = first_step.step_id
+                WHERE r.phase_count IS NULL AND r.roadmap_id > %s
+                ORDER BY r.roadmap_id LIMIT %s
+            """, (last_id, batch_size))
+            if not rows:
+                return done
+            with mysql_db.get_cursor() as cursor:
+                for row in rows:
+                    try:
+                        data = json.loads(row["description"]) if row.get("description") else {}
+                    except Exception:
+                        data = {}
+                    Roadmap.write_summary(cursor, row["roadmap_id"], data)
+            done += len(rows)
+            last_id = rows[-1]["roadmap_id"]
+
+    @staticmethod
+    def popular_target_roles(limit: int = 20) -> List[Dict]:
+        return mysql_db.fetch_all("""
+            SELECT target_role, COUNT(*) AS roadmaps FROM roadmaps
+            WHERE target_role IS NOT NULL AND target_role <> ''
+            GROUP BY target_role ORDER BY roadmaps DESC LIMIT %s
+        """, (limit,))
+
     @staticmethod
     def update_progress(roadmap_id: int, percent: float):
         with mysql_db.get_cursor() as cursor:
             cursor.execute(
-                "UPDATE roadmaps SET completion_percentage=%s WHERE roadmap_id=%s",
+                "UPDATE roadmaps SET completion_percentage=%s, content_version = content_version + 1 WHERE roadmap_id=%s",
                 (percent, roadmap_id)
             )
 
@@ -234,55 +464,416 @@ class Roadmap:
 
 
 
+def _split_extra(item: dict, known: tuple) -> Optional[str]:
+    extra = {k: v for k, v in item.items() if k not in known}
+    return json.dumps(extra, ensure_ascii=False) if extra else None
+
+
+def _load_extra(value: Optional[str]) -> Dict:
+    try:
+        return json.loads(value) if value else {}
+    except Exception:
+        return {}
+
+
+def _date_str(value) -> Optional[str]:
+    return value.strftime("%Y-%m-%d %H:%M:%S") if hasattr(value, "strftime") else value
+
+
+class RoadmapCurriculum:
+    """
+    Curriculum stored as rows: roadmap_phases, roadmap_topics and
+    roadmap_topic_resources keyed by (roadmap_id, phase_index, topic_index).
+    The roadmap_steps blob then keeps the other sections plus a
+    "curriculum_storage": "rows" marker; RoadmapStep reassembles the JSON.
+    """
+
+    PHASE_KEYS = ("phase_title", "duration_weeks", "topics")
+    TOPIC_KEYS = ("title", "resources", "completed", "completed_at")
+    RESOURCE_KEYS = ("title", "type", "url")
+
+    @staticmethod
+    def _int(value) -> Optional[int]:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _topic_row(roadmap_id: int, p: int, t: int, topic: Any, due) -> tuple:
+        if not isinstance(topic, dict):
+            topic = {"title": str(topic)}
+        completed = bool(topic.get("completed"))
+        completed_at = topic.get("completed_at") if completed else None
+        return (
+            roadmap_id, p, t, (topic.get("title") or "")[:255], completed,
+            completed_at or (datetime.now() if completed else None), due,
+            _split_extra(topic, RoadmapCurriculum.TOPIC_KEYS),
+        )
+
+    @staticmethod
+    def _same_shape(old: List, new: List) -> bool:
+        if not isinstance(old, list) or not isinstance(new, list) or len(old) != len(new):
+            return False
+        for po, pn in zip(old, new):
+            if not isinstance(po, dict) or not isinstance(pn, dict):
+                return False
+            if {k: v for k, v in po.items() if k != "topics"} != {k: v for k, v in pn.items() if k != "topics"}:
+                return False
+            to, tn = po.get("topics") or [], pn.get("topics") or []
+            if len(to) != len(tn):
+                return False
+            for a, b in zip(to, tn):
+                if not isinstance(a, dict) or not isinstance(b, dict) or a.get("resources") != b.get("resources"):
+                    return False
+        return True
+
+    @staticmethod
+    def write(cursor, roadmap_id: int, curriculum: List, previous: Optional[List] = None):
+        """
+        Store curriculum rows. When previous (the stored curriculum) has the
+        same phases, topics and resources, only changed topic rows are updated;
+        otherwise all rows for the roadmap are replaced with bulk inserts.
+        """
+        curriculum = curriculum if isinstance(curriculum, list) else []
+        if previous is not None and RoadmapCurriculum._same_shape(previous, curriculum):
+            for p, (po, pn) in enumerate(zip(previous, curriculum)):
+                for t, (to, tn) in enumerate(zip(po.get("topics") or [], pn.get("topics") or [])):
+                    if to == tn:
+                        continue
+                    completed = bool(tn.get("completed"))
+                    cursor.execute("""
+                        UPDATE roadmap_topics
+                        SET title=%s, completed=%s, extra_json=%s,
+                            completed_at = IF(%s, COALESCE(completed_at, NOW()), NULL)
+                        WHERE roadmap_id=%s AND phase_index=%s AND topic_index=%s
+                    """, ((tn.get("title") or "")[:255], completed,
+                          _split_extra(tn, RoadmapCurriculum.TOPIC_KEYS), completed, roadmap_id, p, t))
+            return
+
+        cursor.execute("SELECT start_date FROM roadmaps WHERE roadmap_id=%s", (roadmap_id,))
+        row = cursor.fetchone() or {}
+        start = row.get("start_date") or datetime.now().date()
+
+        phases, topics, resources = [], [], []
+        weeks = 0
+        for p, phase in enumerate(curriculum):
+            if not isinstance(phase, dict):
+                phase = {"phase_title": str(phase)}
+            duration = RoadmapCurriculum._int(phase.get("duration_weeks"))
+            weeks += duration or 0
+            due = start + timedelta(weeks=weeks) if duration else None
+            phases.append((
+                roadmap_id, p, (phase.get("phase_title") or "")[:255], duration, due,
+                _split_extra(phase, RoadmapCurriculum.PHASE_KEYS),
+            ))
+            for t, topic in enumerate(phase.get("topics") or []):
+                topics.append(RoadmapCurriculum._topic_row(roadmap_id, p, t, topic, due))
+                for r, res in enumerate(topic.get("resources") or [] if isinstance(topic, dict) else []):
+                    if not isinstance(res, dict):
+                        continue
+                    resources.append((
+                        roadmap_id, p, t, r, (res.get("title") or "")[:255], (res.get("type") or "")[:100],
+                        (res.get("url") or "")[:500], _split_extra(res, RoadmapCurriculum.RESOURCE_KEYS),
+                    ))
+
+        for table in ("roadmap_topic_resources", "roadmap_topics", "roadmap_phases"):
+            cursor.execute(f"DELETE FROM {table} WHERE roadmap_id=%s", (roadmap_id,))
+        if phases:
+            cursor.executemany("""
+                INSERT INTO roadmap_phases (roadmap_id, phase_index, phase_title, duration_weeks, due_date, extra_json)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, phases)
+        if topics:
+            cursor.executemany("""
+                INSERT INTO roadmap_topics
+                (roadmap_id, phase_index, topic_index, title, completed, completed_at, due_date, extra_json)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            """, topics)
+        if resources:
+            cursor.executemany("""
+                INSERT INTO roadmap_topic_resources
+                (roadmap_id, phase_index, topic_index, position, title, type, url, extra_json)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            """, resources)
+
+    @staticmethod
+    def load(cursor, roadmap_id: int) -> List[Dict]:
+        """Reassemble the curriculum JSON from rows."""
+        cursor.execute("""
+            SELECT phase_index, phase_title, duration_weeks, extra_json
+            FROM roadmap_phases WHERE roadmap_id=%s ORDER BY phase_index
+        """, (roadmap_id,))
+        phases = {}
+        for row in cursor.fetchall():
+            phases[row["phase_index"]] = {
+                "phase_title": row["phase_title"], "duration_weeks": row["duration_weeks"],
+                "topics": [], **_load_extra(row["extra_json"]),
+            }
+
+        cursor.execute("""
+            SELECT phase_index, topic_index, title, completed, completed_at, extra_json
+            FROM roadmap_topics WHERE roadmap_id=%s ORDER BY phase_index, topic_index
+        """, (roadmap_id,))
+        topics = {}
+        for row in cursor.fetchall():
+            topic = {"title": row["title"], "resources": [], "completed": bool(row["completed"])}
+            if row["completed_at"]:
+                topic["completed_at"] = _date_str(row["completed_at"])
+            topic.update(_load_extra(row["extra_json"]))
+            topics[(row["phase_index"], row["topic_index"])] = topic
+            if row["phase_index"] in phases:
+                phases[row["phase_index"]]["topics"].append(topic)
+
+        cursor.execute("""
+            SELECT phase_index, topic_index, title, type, url, extra_json
+            FROM roadmap_topic_resources WHERE roadmap_id=%s ORDER BY phase_index, topic_index, position
+        """, (roadmap_id,))
+        for row in cursor.fetchall():
+            topic = topics.get((row["phase_index"], row["topic_index"]))
+            if topic is not None:
+                topic["resources"].append({
+                    "title": row["title"], "type": row["type"], "url": row["url"], **_load_extra(row["extra_json"]),
+                })
+        return list(phases.values())
+
+    @staticmethod
+    def progress(roadmap_id: int) -> List[Dict]:
+        """Per-phase topic counts, straight from roadmap_topics."""
+        return mysql_db.fetch_all("""
+            SELECT p.phase_index, p.phase_title, p.due_date,
+                   COUNT(t.topic_id) AS topics, COALESCE(SUM(t.completed), 0) AS completed
+            FROM roadmap_phases p
+            LEFT JOIN roadmap_topics t ON t.roadmap_id = p.roadmap_id AND t.phase_index = p.phase_index
+            WHERE p.roadmap_id=%s
+            GROUP BY p.phase_index, p.phase_title, p.due_date
+            ORDER BY p.phase_index
+        """, (roadmap_id,))
+
+    @staticmethod
+    def distinct_topic_titles(limit: int = 20000) -> List[str]:
+        rows = mysql_db.fetch_all(
+            "SELECT title FROM roadmap_topics GROUP BY title ORDER BY COUNT(*) DESC LIMIT %s", (limit,)
+        )
+        return [r["title"] for r in rows if r.get("title")]
+
+    @staticmethod
+    def due_topics(user_id: int, start, end, include_completed: bool = False) -> List[Dict]:
+        """Topics across the user's roadmaps whose phase ends between start and end (inclusive)."""
+        return mysql_db.fetch_all(f"""
+            SELECT r.roadmap_id, r.target_role, t.phase_index, t.topic_index, t.title,
+                   t.due_date, t.completed
+            FROM roadmaps r
+            JOIN roadmap_topics t ON t.roadmap_id = r.roadmap_id
+            WHERE r.user_id=%s AND t.due_date BETWEEN %s AND %s
+            {"" if include_completed else "AND t.completed = FALSE"}
+            ORDER BY t.due_date, r.roadmap_id, t.phase_index, t.topic_index
+        """, (user_id, start, end))
+
+
+class RoadmapVersionConflict(Exception):
+    """The roadmap changed since the version the client based its update on."""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"Roadmap is at version {current_version}")
+        self.current_version = current_version
+
+
 class RoadmapStep:
+    @staticmethod
+    def _store(cursor, roadmap_id: int, roadmap_data: dict, previous: Optional[List] = None) -> str:
+        """Write curriculum rows if normalized storage is on; return the JSON for the description blob."""
+        if settings.ROADMAP_STORAGE != "normalized" or not isinstance(roadmap_data.get("curriculum"), list):
+            return json.dumps(roadmap_data, ensure_ascii=False)
+        RoadmapCurriculum.write(cursor, roadmap_id, roadmap_data["curriculum"], previous)
+        blob = {**roadmap_data, "curriculum": [], "curriculum_storage": "rows"}
+        return json.dumps(blob, ensure_ascii=False)
+
+    @staticmethod
+    def _assemble(cursor, roadmap_id: int, doc: Dict) -> Dict:
+        if doc.get("curriculum_storage") == "rows":
+            doc.pop("curriculum_storage")
+            doc["curriculum"] = RoadmapCurriculum.load(cursor, roadmap_id)
+        return doc
+
     @staticmethod
     def create_full_roadmap(roadmap_id: int, roadmap_data: dict):
-        """Store entire roadmap JSON (overview, skills, jobs, etc.) into description."""
+        """Store the roadmap: curriculum as rows (normalized storage), everything else as JSON in description."""
         try:
-            json_str = json.dumps(roadmap_data, ensure_ascii=False)
             with mysql_db.get_cursor() as cursor:
+                json_str = RoadmapStep._store(cursor, roadmap_id, roadmap_data)
                 cursor.execute("""
                     INSERT INTO roadmap_steps (roadmap_id, description, completed)
                     VALUES (%s, %s, 0)
                 """, (roadmap_id, json_str))
+                cursor.execute("UPDATE roadmaps SET content_updated_at=NOW() WHERE roadmap_id=%s", (roadmap_id,))
+                Roadmap.write_summary(cursor, roadmap_id, roadmap_data)
         except Exception as e:
             logger.error(f"[RoadmapStep.create_full_roadmap] {e}")
 
+    @staticmethod
+    def patch_content(roadmap_id: int, user_id: int, expected_version: Optional[int], apply_fn) -> Dict:
+        """
+        Read-modify-write of the roadmap JSON under a row lock. apply_fn(doc)
+        returns (new_doc, completion_percentage). Raises LookupError if the
+        roadmap does not belong to user_id and RoadmapVersionConflict if
+        expected_version is given and stale.
+        """
+        with mysql_db.get_cursor() as cursor:
+            cursor.execute(
+                "SELECT content_version FROM roadmaps WHERE roadmap_id=%s AND user_id=%s FOR UPDATE",
+                (roadmap_id, user_id)
+            )
+            row = cursor.fetchone()
+            if not row:
+                raise LookupError("Roadmap not found")
+            current = row["content_version"] or 0
+            if expected_version is not None and expected_version != current:
+                raise RoadmapVersionConflict(current)
+
+            cursor.execute(
+                "SELECT step_id, description FROM roadmap_steps WHERE roadmap_id=%s ORDER BY step_id ASC LIMIT 1",
+                (roadmap_id,)
+            )
+            step = cursor.fetchone()
+            if not step:
+                raise LookupError("Roadmap content not found")
+            doc = json.loads(step["description"]) if step.get("description") else {}
+            previous = None
+            if doc.get("curriculum_storage") == "rows":
+                doc = RoadmapStep._assemble(cursor, roadmap_id, doc)
+                previous = json.loads(json.dumps(doc["curriculum"]))
+
+            doc, percent = apply_fn(doc)
+            cursor.execute(
+                "UPDATE roadmap_steps SET description=%s WHERE step_id=%s",
+                (RoadmapStep._store(cursor, roadmap_id, doc, previous), step["step_id"])
+            )
+            cursor.execute(
+                "UPDATE roadmaps SET completion_percentage=%s, content_version=%s, content_updated_at=NOW() "
+                "WHERE roadmap_id=%s",
+                (percent, current + 1, roadmap_id)
+            )
+            Roadmap.write_summary(cursor, roadmap_id, doc)
+        return {"version": current + 1, "completion_percentage": percent}
+
     @staticmethod
     def get_by_roadmap(roadmap_id: int) -> Optional[Dict]:
-        """Return the full roadmap JSON (single row)."""
-        row = mysql_db.fetch_one(
-            "SELECT description FROM roadmap_steps WHERE roadmap_id=%s ORDER BY step_id ASC LIMIT 1",
-            (roadmap_id,)
-        )
-        if not row:
-            return {}
-        desc = row.get("description")
-        if isinstance(desc, str):
-            try:
-                return json.loads(desc)
-            except Exception:
-                logger.warning("[RoadmapStep.get_by_roadmap] Invalid JSON structure")
+        """Return the full roadmap JSON, reassembling the curriculum from rows when stored normalized."""
+        with mysql_db.get_cursor() as cursor:
+            cursor.execute(
+                "SELECT description FROM roadmap_steps WHERE roadmap_id=%s ORDER BY step_id ASC LIMIT 1",
+                (roadmap_id,)
+            )
+            row = cursor.fetchone()
+            if not row:
                 return {}
-        return desc or {}    
+            desc = row.get("description")
+            if isinstance(desc, str):
+                try:
+                    desc = json.loads(desc)
+                except Exception:
+                    logger.warning("[RoadmapStep.get_by_roadmap] Invalid JSON structure")
+                    return {}
+            if not isinstance(desc, dict):
+                return desc or {}
+            return RoadmapStep._assemble(cursor, roadmap_id, desc)
     
+    @staticmethod
+    def content_age_seconds(roadmap_id: int) -> Optional[int]:
+        """Seconds since the stored JSON was last written (None for rows that predate the column)."""
+        row = mysql_db.fetch_one(
+            "SELECT TIMESTAMPDIFF(SECOND, content_updated_at, NOW()) AS age_seconds FROM roadmaps WHERE roadmap_id=%s",
+            (roadmap_id,),
+        )
+        return None if not row or row["age_seconds"] is None else int(row["age_seconds"])
+
     @staticmethod
     def update_content(roadmap_id: int, roadmap_data: dict):
         """Update the full roadmap JSON blob."""
         try:
-            json_str = json.dumps(roadmap_data, ensure_ascii=False)
             with mysql_db.get_cursor() as cursor:
+                json_str = RoadmapStep._store(cursor, roadmap_id, roadmap_data)
                 cursor.execute("""
                     UPDATE roadmap_steps 
                     SET description = %s 
                     WHERE roadmap_id = %s
                 """, (json_str, roadmap_id))
+                cursor.execute(
+                    "UPDATE roadmaps SET content_version = content_version + 1, content_updated_at=NOW() "
+                    "WHERE roadmap_id=%s",
+                    (roadmap_id,)
+                )
+                Roadmap.write_summary(cursor, roadmap_id, roadmap_data)
         except Exception as e:
             logger.error(f"[RoadmapStep.update_content] {e}")
             raise
         
     
+
+class RoadmapTemplate:
+    """Shared per-role roadmap templates; see services.roadmap_templates."""
+
+    @staticmethod
+    def get(template_key: str) -> Optional[Dict]:
+        row = mysql_db.fetch_one(
+            "SELECT template_json, created_at, TIMESTAMPDIFF(SECOND, created_at, NOW()) AS age_seconds "
+            "FROM roadmap_templates WHERE template_key=%s",
+            (template_key,),
+        )
+        if not row or not row.get("template_json"):
+            return None
+        try:
+            row["template"] = json.loads(row.pop("template_json"))
+        except Exception:
+            return None
+        return row
+
+    @staticmethod
+    def upsert(template_key: str, target_role: str, career_level: str,
+               timeline_months: int, location: str, template: dict):
+        mysql_db.execute_query(
+            """INSERT INTO roadmap_templates
+               (template_key, target_role, career_level, timeline_months, location, template_json, created_at)
+               VALUES (%s, %s, %s, %s, %s, %s, NOW())
+               ON DUPLICATE KEY UPDATE template_json = VALUES(template_json), created_at = NOW()
+            """,
+            (template_key, (target_role or "")[:255], (career_level or "")[:100],
+             timeline_months, (location or "")[:255], json.dumps(template, ensure_ascii=False)),
+        )
+
+
 class Resource:
+    @staticmethod
+    def get_by_query_key(query_key: str, r_type: str) -> Optional[Dict]:
+        return mysql_db.fetch_one(
+            "SELECT url, fetched_at, TIMESTAMPDIFF(SECOND, fetched_at, NOW()) AS age_seconds "
+            "FROM resources WHERE query_key=%s AND type=%s LIMIT 1",
+            (query_key, r_type),
+        )
+
+    @staticmethod
+    def get_indexable(limit: int = 50000) -> List[Dict]:
+        """Cached lookups for services.resource_index (title holds the original query)."""
+        return mysql_db.fetch_all(
+            """SELECT title, type, url, duration_minutes FROM resources
+               WHERE url IS NOT NULL AND title IS NOT NULL
+               ORDER BY fetched_at DESC LIMIT %s""",
+            (limit,),
+        )
+
+    @staticmethod
+    def upsert_lookup(query_key: str, r_type: str, query: str, url: str):
+        """Cache a search result for (query_key, type); see services.resource_cache."""
+        provider = "YouTube" if "youtube.com" in (url or "") else None
+        mysql_db.execute_query(
+            """INSERT INTO resources (title, provider, type, url, query_key, fetched_at)
+               VALUES (%s, %s, %s, %s, %s, NOW())
+               ON DUPLICATE KEY UPDATE url = VALUES(url), provider = VALUES(provider), fetched_at = NOW()
+            """,
+            ((query or "")[:255], provider, r_type, (url or "")[:500], query_key),
+        )
+
     @staticmethod
     def get_by_url(url: str):
         return mysql_db.fetch_one(
@@ -346,4 +937,415 @@ class Job:
         )
         return mysql_db.fetch_one("SELECT job_id FROM jobs WHERE url=%s", (url,))[
             "job_id"
-        ]        
\ No newline at end of file
+        ]
+
+    @staticmethod
+    def _external_id(job: dict) -> str:
+        ext = job.get("external_id")
+        if ext:
+            return str(ext)[:255]
+        raw = "|".join(str(job.get(k) or "") for k in ("job_portal_link", "role", "company", "location"))
+        return "h:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def save_search_results(query_key: str, query: str, location: Optional[str], jobs: List[dict]) -> List[int]:
+        """
+        Upsert fetched postings into jobs, their extracted skills into
+        job_requirements and the result list into job_searches, in one
+        transaction. Returns the job ids in result order (also set as job["job_id"]).
+        """
+        with mysql_db.get_cursor() as cursor:
+            ids = []
+            for job in jobs:
+                cursor.execute("""
+                    INSERT INTO jobs (external_id, title, company, location, salary_range, url,
+                                      description, posted_label, fetched_at)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW())
+                    ON DUPLICATE KEY UPDATE
+                        job_id = LAST_INSERT_ID(job_id), title = VALUES(title), company = VALUES(company),
+                        location = VALUES(location), salary_range = VALUES(salary_range), url = VALUES(url),
+                        description = VALUES(description), posted_label = VALUES(posted_label), fetched_at = NOW()
+                """, (
+                    Job._external_id(job), (job.get("role") or "")[:255], (job.get("company") or "")[:255],
+                    (job.get("location") or "")[:255], (job.get("salary_range") or "")[:255],
+                    (job.get("job_portal_link") or "")[:500], job.get("description"),
+                    (job.get("posted_date") or "")[:100],
+                ))
+                job["job_id"] = cursor.lastrowid
+                ids.append(cursor.lastrowid)
+
+            skills = sorted({s for job in jobs for s in job.get("required_skills") or []})
+            skill_ids = Skill.bulk_get_or_create(skills, cursor=cursor) if skills else {}
+            if ids:
+                in_list = ", ".join(["%s"] * len(ids))
+                cursor.execute(f"DELETE FROM job_requirements WHERE job_id IN ({in_list})", ids)
+            pairs = [
+                (job["job_id"], skill_ids[_skill_key(s)])
+                for job in jobs for s in job.get("required_skills") or []
+                if _skill_key(s) in skill_ids
+            ]
+            if pairs:
+                cursor.execute(
+                    "INSERT IGNORE INTO job_requirements (job_id, skill_id) VALUES "
+                    + ", ".join(["(%s, %s)"] * len(pairs)),
+                    [v for pair in pairs for v in pair],
+                )
+
+            cursor.execute("""
+                INSERT INTO job_searches (query_key, query, location, job_ids, fetched_at)
+                VALUES (%s, %s, %s, %s, NOW())
+                ON DUPLICATE KEY UPDATE job_ids = VALUES(job_ids), fetched_at = NOW()
+            """, (query_key, (query or "")[:255], (location or "")[:255], json.dumps(ids)))
+        Skill.remember(skill_ids)
+        return ids
+
+    @staticmethod
+    def get_many(job_ids: List[int]) -> List[Dict]:
+        """Jobs in the given order, shaped like services_utils.fetch_real_jobs results."""
+        if not job_ids:
+            return []
+        in_list = ", ".join(["%s"] * len(job_ids))
+        rows = mysql_db.fetch_all(f"""
+            SELECT job_id, external_id, title, company, location, salary_range, url, description, posted_label
+            FROM jobs WHERE job_id IN ({in_list})
+        """, list(job_ids))
+        skills = mysql_db.fetch_all(f"""
+            SELECT jr.job_id, s.skill_name FROM job_requirements jr
+            JOIN SKILLS s ON s.skill_id = jr.skill_id
+            WHERE jr.job_id IN ({in_list}) ORDER BY jr.requirement_id
+        """, list(job_ids))
+        by_job: Dict[int, List[str]] = {}
+        for r in skills:
+            by_job.setdefault(r["job_id"], []).append(r["skill_name"])
+
+        by_id = {
+            r["job_id"]: {
+                "job_id": r["job_id"],
+                "external_id": r["external_id"],
+                "role": r["title"],
+                "company": r["company"],
+                "location": r["location"],
+                "salary_range": r["salary_range"],
+                "description": r["description"] or "",
+                "posted_date": r["posted_label"] or "",
+                "job_portal_link": r["url"] or "",
+                "required_skills": by_job.get(r["job_id"], []),
+            }
+            for r in rows
+        }
+        return [by_id[i] for i in job_ids if i in by_id]
+
+    @staticmethod
+    def get_recent(max_age_days: int, limit: int = 50000) -> List[Dict]:
+        """Postings fetched within max_age_days with their skills (and age in seconds), for services.job_index."""
+        rows = mysql_db.fetch_all("""
+            SELECT job_id, title, company, location, salary_range, url, description, posted_label,
+                   TIMESTAMPDIFF(SECOND, fetched_at, NOW()) AS age_seconds
+            FROM jobs
+            WHERE fetched_at >= NOW() - INTERVAL %s DAY
+            ORDER BY fetched_at DESC LIMIT %s
+        """, (max_age_days, limit))
+        skills = mysql_db.fetch_all("""
+            SELECT jr.job_id, s.skill_name FROM job_requirements jr
+            JOIN jobs j ON j.job_id = jr.job_id
+            JOIN SKILLS s ON s.skill_id = jr.skill_id
+            WHERE j.fetched_at >= NOW() - INTERVAL %s DAY
+        """, (max_age_days,))
+        by_job: Dict[int, List[str]] = {}
+        for r in skills:
+            by_job.setdefault(r["job_id"], []).append(r["skill_name"])
+        return [{
+            "job_id": r["job_id"],
+            "role": r["title"],
+            "company": r["company"],
+            "location": r["location"],
+            "salary_range": r["salary_range"],
+            "description": r["description"] or "",
+            "posted_date": r["posted_label"] or "",
+            "job_portal_link": r["url"] or "",
+            "required_skills": by_job.get(r["job_id"], []),
+            "age_seconds": r["age_seconds"],
+        } for r in rows]
+
+    @staticmethod
+    def load_search(query_key: str) -> Optional[Dict]:
+        """Cached search: {"jobs": [...], "fetched_at": datetime, "age_seconds": int} or None."""
+        row = mysql_db.fetch_one(
+            "SELECT job_ids, fetched_at, TIMESTAMPDIFF(SECOND, fetched_at, NOW()) AS age_seconds "
+            "FROM job_searches WHERE query_key=%s",
+            (query_key,),
+        )
+        if not row or not row.get("job_ids"):
+            return None
+        try:
+            ids = [int(i) for i in json.loads(row["job_ids"])]
+        except Exception:
+            return None
+        return {"jobs": Job.get_many(ids), "fetched_at": row["fetched_at"], "age_seconds": row["age_seconds"]}        
+
+class MockInterviewConflict(Exception):
+    """The turn was already completed by another request."""
+
+
+def _json_value(value, default):
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode("utf-8")
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+            if isinstance(value, str):
+                value = json.loads(value)
+        except Exception:
+            return default
+    return value if value is not None else default
+
+
+class MockInterview:
+    """
+    Sessions are a small header row in mock_interview_sessions (settings in
+    state_json, progress in current_round / remaining_seconds / status) plus
+    one mock_interview_turns row per question, filled in as it is answered
+    and evaluated. A turn never rewrites the rest of the session.
+    """
+
+    HEADER_COLUMNS = (
+        "session_id, user_id, target_role, difficulty, num_interviewers, duration_minutes, "
+        "status, current_round, max_rounds, remaining_seconds, state_json, created_at, updated_at, "
+        "history_summary, summary_through, history_tokens_folded"
+    )
+
+    @staticmethod
+    def _insert_turn(cursor, session_id: int, turn_index: int, turn: Dict):
+        cursor.execute("""
+            INSERT INTO mock_interview_turns (session_id, turn_index, interviewer_name, question, asked_at)
+            VALUES (%s, %s, %s, %s, NOW())
+        """, (session_id, turn_index, (turn.get("interviewer_name") or "Interviewer")[:255], turn.get("question") or ""))
+
+    @staticmethod
+    def create(user_id: int, header: Dict, first_turn: Dict, max_rounds: int, remaining_seconds: int) -> int:
+        with mysql_db.get_cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO mock_interview_sessions
+                (user_id, target_role, difficulty, num_interviewers, duration_minutes, state_json, status,
+                 current_round, max_rounds, remaining_seconds)
+                VALUES (%s, %s, %s, %s, %s, %s, 'active', 1, %s, %s)
+            """, (
+                user_id, header["target_role"], header["difficulty"], header["num_interviewers"],
+                header["duration_minutes"], json.dumps(header, ensure_ascii=False), max_rounds, remaining_seconds,
+            ))
+            session_id = cursor.lastrowid
+            if not session_id:
+                raise RuntimeError("Could not get session_id from cursor.lastrowid")
+            MockInterview._insert_turn(cursor, session_id, 0, first_turn)
+        return session_id
+
+    @staticmethod
+    def get_header(session_id: int, user_id: int) -> Optional[Dict]:
+        row = mysql_db.fetch_one(
+            f"SELECT {MockInterview.HEADER_COLUMNS} FROM mock_interview_sessions WHERE session_id=%s AND user_id=%s",
+            (session_id, user_id),
+        )
+        if row:
+            row["state_json"] = _json_value(row.get("state_json"), {})
+        return row
+
+    @staticmethod
+    def get_turns(session_id: int, since_index: int = 0) -> List[Dict]:
+        rows = mysql_db.fetch_all("""
+            SELECT turn_index, interviewer_name, question, answer, feedback, skipped,
+                   elapsed_seconds, penalty_seconds,
+                   TIMESTAMPDIFF(SECOND, answered_at, NOW()) AS answered_age_seconds
+            FROM mock_interview_turns
+            WHERE session_id=%s AND turn_index >= %s
+            ORDER BY turn_index
+        """, (session_id, since_index))
+        for r in rows:
+            r["answer"] = r.get("answer") or ""
+            r["feedback"] = _json_value(r.get("feedback"), {})
+        return rows
+
+    @staticmethod
+    def save_answer(session_id: int, turn_index: int, answer: str, skipped: bool,
+                    elapsed_seconds: int) -> Optional[int]:
+        """
+        Record the answer before evaluation. Returns the seconds that will
+        remain once elapsed_seconds is charged, or None if the session is no
+        longer waiting for an answer to turn_index. The clock itself is only
+        charged by complete_turn, whose turn check lets one submit through, so
+        a duplicate submit racing this one cannot charge it twice.
+        """
+        with mysql_db.get_cursor() as cursor:
+            cursor.execute(
+                "SELECT current_round, status FROM mock_interview_sessions WHERE session_id=%s FOR UPDATE",
+                (session_id,),
+            )
+            session = cursor.fetchone()
+            if not session or session["status"] != "active" or session["current_round"] != turn_index + 1:
+                return None
+            cursor.execute(
+                "SELECT feedback FROM mock_interview_turns WHERE session_id=%s AND turn_index=%s FOR UPDATE",
+                (session_id, turn_index),
+            )
+            row = cursor.fetchone()
+            if not row or row["feedback"] is not None:
+                return None
+            cursor.execute("""
+                UPDATE mock_interview_turns
+                SET answer=%s, skipped=%s, elapsed_seconds=%s, answered_at=NOW()
+                WHERE session_id=%s AND turn_index=%s
+            """, (answer, bool(skipped), elapsed_seconds, session_id, turn_index))
+            cursor.execute("SELECT remaining_seconds FROM mock_interview_sessions WHERE session_id=%s", (session_id,))
+            return max(0, int(cursor.fetchone()["remaining_seconds"] or 0) - max(0, elapsed_seconds))
+
+    @staticmethod
+    def complete_turn(session_id: int, turn_index: int, feedback: Optional[Dict], penalty_seconds: int,
+                      remaining_seconds: Optional[int], next_turn: Optional[Dict],
+                      history_tokens: Dict[str, int] = None, elapsed_seconds: int = 0):
+        """
+        Store feedback for turn_index and either append next_turn or mark the
+        session completed, in one transaction. Raises MockInterviewConflict if
+        the session has already moved past this turn. history_tokens
+        ({"full", "sent"}) is added to the session's prompt history counters.
+
+        feedback=None advances the session with the evaluation still pending
+        (see save_feedback); remaining_seconds=None charges elapsed_seconds to
+        the stored clock instead of setting it.
+        """
+        tokens = history_tokens or {}
+        with mysql_db.get_cursor() as cursor:
+            cursor.execute(
+                "SELECT current_round, status FROM mock_interview_sessions WHERE session_id=%s FOR UPDATE",
+                (session_id,),
+            )
+            row = cursor.fetchone()
+            if not row or row["status"] != "active" or row["current_round"] != turn_index + 1:
+                raise MockInterviewConflict(f"Session {session_id} is no longer at turn {turn_index}")
+
+            if feedback is not None:
+                cursor.execute("""
+                    UPDATE mock_interview_turns SET feedback=%s, penalty_seconds=%s
+                    WHERE session_id=%s AND turn_index=%s
+                """, (json.dumps(feedback, ensure_ascii=False), penalty_seconds, session_id, turn_index))
+            if next_turn:
+                MockInterview._insert_turn(cursor, session_id, turn_index + 1, next_turn)
+            cursor.execute("""
+                UPDATE mock_interview_sessions
+                SET current_round=%s, remaining_seconds=COALESCE(%s, GREATEST(0, remaining_seconds - %s)),
+                    status=%s, updated_at=NOW(),
+                    history_tokens_full = history_tokens_full + %s,
+                    history_tokens_sent = history_tokens_sent + %s
+                WHERE session_id=%s
+            """, (
+                turn_index + 2 if next_turn else turn_index + 1, remaining_seconds, max(0, elapsed_seconds),
+                "active" if next_turn else "completed",
+                tokens.get("full", 0), tokens.get("sent", 0), session_id,
+            ))
+
+    @staticmethod
+    def save_feedback(session_id: int, turn_index: int, feedback: Dict, penalty_seconds: int) -> bool:
+        """
+        Late evaluation of a turn the session has already moved past: store
+        the feedback and take the penalty off the session clock. False if the
+        turn already had feedback.
+        """
+        with mysql_db.get_cursor() as cursor:
+            cursor.execute("""
+                UPDATE mock_interview_turns SET feedback=%s, penalty_seconds=%s
+                WHERE session_id=%s AND turn_index=%s AND feedback IS NULL
+            """, (json.dumps(feedback, ensure_ascii=False), penalty_seconds, session_id, turn_index))
+            if cursor.rowcount == 0:
+                return False
+            if penalty_seconds > 0:
+                cursor.execute("""
+                    UPDATE mock_interview_sessions
+                    SET remaining_seconds = GREATEST(0, remaining_seconds - %s), updated_at=NOW()
+                    WHERE session_id=%s
+                """, (penalty_seconds, session_id))
+        return True
+
+    @staticmethod
+    def save_summary(session_id: int, summary: str, through: int, expected_through: Optional[int],
+                     folded_tokens: int) -> bool:
+        """Replace the rolling history summary unless another update got there first."""
+        with mysql_db.get_cursor() as cursor:
+            cursor.execute("""
+                UPDATE mock_interview_sessions
+                SET history_summary=%s, summary_through=%s,
+                    history_tokens_folded = history_tokens_folded + %s, updated_at=updated_at
+                WHERE session_id=%s AND summary_through <=> %s
+            """, (summary, through, folded_tokens, session_id, expected_through))
+            return cursor.rowcount > 0
+
+    @staticmethod
+    def get_report(session_id: int) -> Optional[Dict]:
+        row = mysql_db.fetch_one("SELECT report_json FROM mock_interview_sessions WHERE session_id=%s", (session_id,))
+        return _json_value(row.get("report_json"), None) if row else None
+
+    @staticmethod
+    def save_report(session_id: int, report: Dict):
+        mysql_db.execute_query("""
+            UPDATE mock_interview_sessions
+            SET report_json=%s, status='completed', updated_at=NOW()
+            WHERE session_id=%s
+        """, (json.dumps(report, ensure_ascii=False), session_id))
+
+    @staticmethod
+    def list_by_user(user_id: int, limit: int = 20) -> List[Dict]:
+        return mysql_db.fetch_all("""
+            SELECT session_id, target_role, difficulty, num_interviewers, duration_minutes, status, updated_at,
+                   history_tokens_full, history_tokens_sent,
+                   JSON_UNQUOTE(JSON_EXTRACT(report_json, '$.summary.overall_impression')) AS overall_impression,
+                   JSON_UNQUOTE(JSON_EXTRACT(report_json, '$.summary.hire_recommendation')) AS hire_recommendation
+            FROM mock_interview_sessions
+            WHERE user_id=%s
+            ORDER BY updated_at DESC LIMIT %s
+        """, (user_id, limit))
+
+    @staticmethod
+    def delete(session_id: int, user_id: int) -> bool:
+        with mysql_db.get_cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM mock_interview_sessions WHERE session_id=%s AND user_id=%s", (session_id, user_id)
+            )
+            return cursor.rowcount > 0
+
+    @staticmethod
+    def backfill_turns(batch_size: int = 50) -> int:
+        """Move questions and final_report out of state_json for sessions stored before turn rows."""
+        done = 0
+        while True:
+            rows = mysql_db.fetch_all("""
+                SELECT session_id, state_json FROM mock_interview_sessions
+                WHERE JSON_CONTAINS_PATH(state_json, 'one', '$.questions')
+                ORDER BY session_id LIMIT %s
+            """, (batch_size,))
+            if not rows:
+                return done
+            with mysql_db.get_cursor() as cursor:
+                for row in rows:
+                    state = _json_value(row["state_json"], {})
+                    questions = state.pop("questions", None) or []
+                    report = state.pop("final_report", None)
+                    current_round = state.pop("round", None) or max(1, len(questions))
+                    max_rounds = state.pop("max_rounds", None) or 5
+                    remaining = state.pop("remaining_seconds", None) or 0
+                    for i, q in enumerate(questions):
+                        cursor.execute("""
+                            INSERT IGNORE INTO mock_interview_turns
+                            (session_id, turn_index, interviewer_name, question, answer, feedback)
+                            VALUES (%s, %s, %s, %s, %s, %s)
+                        """, (
+                            row["session_id"], i, (q.get("interviewer_name") or "Interviewer")[:255],
+                            q.get("question") or "", q.get("answer") or None,
+                            json.dumps(q["feedback"], ensure_ascii=False) if q.get("feedback") else None,
+                        ))
+                    cursor.execute("""
+                        UPDATE mock_interview_sessions
+                        SET state_json=%s, current_round=%s, max_rounds=%s, remaining_seconds=%s,
+                            report_json=COALESCE(report_json, %s), updated_at=updated_at
+                        WHERE session_id=%s
+                    """, (
+                        json.dumps(state, ensure_ascii=False), current_round, max_rounds, remaining,
+                        json.dumps(report, ensure_ascii=False) if report else None, row["session_id"],
+                    ))
+            done += len(rows)
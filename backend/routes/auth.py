@@ -69,7 +69,10 @@ def create_access_token(user_id: int):
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     if not credentials:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    token = credentials.credentials
+    return user_from_token(credentials.credentials)
+
+def user_from_token(token: str):
+    """Resolve a bearer token to its user; also used where no Authorization header exists (WebSockets)."""
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
         uid = payload.get("sub")
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Optional, Dict
+import logging
+
+from routes.auth import get_current_user
+from models import User, UserSkill
+from services.job_index import job_index
+from services.embeddings import embedding_service, similar_jobs, skill_gap
+
+logger = logging.getLogger("routes.jobs")
+router = APIRouter(tags=["Jobs"])
+
+
+@router.get("/match")
+def match_jobs(
+    k: int = Query(10, ge=1, le=50),
+    role: Optional[str] = Query(None),
+    location: Optional[str] = Query(None),
+    current_user: Dict = Depends(get_current_user),
+):
+    """Top-k stored job postings for the user's skills (local index, no live search)."""
+    user_id = current_user["user_id"]
+    try:
+        skills = [s["skill_name"] for s in UserSkill.get_by_user(user_id)]
+        if role is None:
+            role = (User.get_by_id(user_id) or {}).get("target_role")
+        jobs = job_index.match(skills, k=k, role=role, location=location)
+        return {"jobs": jobs, "indexed": len(job_index)}
+    except Exception as e:
+        logger.exception(f"[match_jobs] ❌ {e}")
+        raise HTTPException(status_code=500, detail=f"Job matching failed: {e}")
+
+
+def _require_embeddings():
+    if not embedding_service.enabled:
+        raise HTTPException(status_code=503, detail="Semantic matching is not available")
+
+
+@router.get("/{job_id}/similar")
+def jobs_like_this(
+    job_id: int,
+    k: int = Query(10, ge=1, le=50),
+    current_user: Dict = Depends(get_current_user),
+):
+    """Stored postings semantically closest to this one."""
+    _require_embeddings()
+    if not job_index.get(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"jobs": similar_jobs(job_id, k=k)}
+
+
+@router.get("/{job_id}/gap")
+def job_skill_gap(job_id: int, current_user: Dict = Depends(get_current_user)):
+    """The job's required skills split into covered (exactly or by a close skill) and missing."""
+    _require_embeddings()
+    job = job_index.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    skills = [s["skill_name"] for s in UserSkill.get_by_user(current_user["user_id"])]
+    return {"job_id": job_id, **skill_gap(skills, job.get("required_skills") or [])}
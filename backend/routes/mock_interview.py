@@ -1,24 +1,38 @@
-import json
-import logging
+import re
 import time
+import asyncio
+import logging
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from database import mysql_db
-from routes.auth import get_current_user
+from config import settings
+from models import MockInterview, MockInterviewConflict
+from routes.auth import get_current_user, user_from_token
 from services.mock_interview_llm import (
     generate_interview_start,
     process_interview_answer,
     generate_interview_report,
 )
-from services.tts import google_tts
+from services.interview_memory import interview_memory
+from services.interview_live import live_interviews
+from services.interview_prefetch import (
+    interview_prefetch,
+    answer_vars,
+    interviewer_for_turn,
+    panel_vars,
+)
+from services.tts import google_tts, google_tts_stream, tts_cache, tts_key, TTS_CHUNK_CHARS
 
 logger = logging.getLogger("routes.mock_interview")
 
 router = APIRouter(tags=["mock_interview"])
 
+# A live socket must authenticate with its first message within this long.
+WS_AUTH_TIMEOUT_SECONDS = 10
+
 
 class StartMockInterviewRequest(BaseModel):
     target_role: str = Field(..., example="Software Engineer")
@@ -44,6 +58,7 @@ class AnswerRequest(BaseModel):
     interviewer_name: Optional[str] = None
     elapsed_seconds: Optional[int] = 0
     skipped: bool = False  
+    turn_index: Optional[int] = None
 
 
 class AnswerResponse(BaseModel):
@@ -55,6 +70,17 @@ class AnswerResponse(BaseModel):
     remaining_seconds: int
     penalty_seconds: int = 0
     penalty_reason: str = ""
+    turn_index: Optional[int] = None
+    feedback_pending: bool = False
+
+
+class FeedbackResponse(BaseModel):
+    session_id: int
+    turn_index: int
+    pending: bool
+    feedback: Dict[str, Any] = {}
+    penalty_seconds: int = 0
+    penalty_reason: str = ""
 
 
 class TTSRequest(BaseModel):
@@ -63,57 +89,90 @@ class TTSRequest(BaseModel):
 
 
 def load_mock_session(session_id: int, user_id: int) -> Dict[str, Any]:
-    row = mysql_db.fetch_one(
-        "SELECT * FROM mock_interview_sessions WHERE session_id=%s AND user_id=%s",
-        (session_id, user_id),
-    )
+    """Session header only (settings and progress); turns are read separately."""
+    row = MockInterview.get_header(session_id, user_id)
     if not row:
         raise HTTPException(status_code=404, detail="Session not found")
+    return row
 
-    state = row.get("state_json") or {}
 
-    
-    if isinstance(state, str):
-        try:
-            state = json.loads(state)
-            if isinstance(state, str):
-                state = json.loads(state)
-        except Exception:
-            state = {}
-
-    row["state_json"] = state
-    return row
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+_TTS_KEY_RE = re.compile(r"^[0-9a-f]{64}$")
 
 
-def save_mock_session(session_id: int, state: dict, status: str = "active") -> None:
-    json_str = json.dumps(state, ensure_ascii=False)
-    mysql_db.execute_query(
-        """
-        UPDATE mock_interview_sessions
-        SET state_json=%s, status=%s, updated_at=NOW()
-        WHERE session_id=%s
-        """,
-        (json_str, status, session_id),
-    )
+def _audio_headers(key: str) -> Dict[str, str]:
+    # Content-addressed: the bytes behind a key never change.
+    return {
+        "ETag": f'"{key}"',
+        "Cache-Control": "private, max-age=31536000, immutable",
+        "Content-Location": f"/api/mock-interview/tts/audio/{key}",
+        "Accept-Ranges": "bytes",
+    }
 
 
+def _audio_response(audio: bytes, request: Request, headers: Dict[str, str]) -> Response:
+    """Full or single-range (206) MP3 response; 304 when the client already has it."""
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    total = len(audio)
+    m = _RANGE_RE.match(request.headers.get("range", "").strip())
+    if not m or not (m.group(1) or m.group(2)):
+        return Response(content=audio, media_type="audio/mpeg", headers=headers)
+    if m.group(1):
+        start = int(m.group(1))
+        if m.group(2) and int(m.group(2)) < start:  # invalid range: ignored (RFC 9110)
+            return Response(content=audio, media_type="audio/mpeg", headers=headers)
+        end = min(int(m.group(2)) if m.group(2) else total - 1, total - 1)
+    else:
+        start, end = max(0, total - int(m.group(2))), total - 1
+    if start > end:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{total}"})
+    return Response(
+        content=audio[start:end + 1],
+        status_code=206,
+        media_type="audio/mpeg",
+        headers={**headers, "Content-Range": f"bytes {start}-{end}/{total}"},
+    )
 
-@router.post("/tts")
-async def generate_question_audio(payload: TTSRequest):
 
+@router.post("/tts")
+async def generate_question_audio(payload: TTSRequest, request: Request):
+    """
+    MP3 for payload.text, served from the audio cache when this text was
+    synthesized before. A long text that is not cached yet is streamed as
+    its sentences are synthesized (no ranges on that response); later
+    requests get the cached file, also at GET /tts/audio/{key}.
+    """
     if not payload.text:
         return Response(content=b"", media_type="audio/mpeg")
 
+    key = tts_key(payload.text)
+    headers = _audio_headers(key)
     try:
+        if len(payload.text.strip()) > TTS_CHUNK_CHARS and not await asyncio.to_thread(tts_cache.contains, key):
+            return StreamingResponse(
+                google_tts_stream(payload.text), media_type="audio/mpeg", headers={"Cache-Control": "no-store"},
+            )
         audio_bytes = await google_tts(payload.text)
         if not audio_bytes:
             return Response(status_code=204)
-        return Response(content=audio_bytes, media_type="audio/mpeg")
+        return _audio_response(audio_bytes, request, headers)
     except Exception as e:
         logger.error(f"[MockInterview] TTS Endpoint Error: {e}")
         return Response(status_code=500)
 
 
+@router.get("/tts/audio/{key}")
+async def get_cached_audio(key: str, request: Request):
+    if not _TTS_KEY_RE.match(key):
+        raise HTTPException(status_code=404, detail="Audio not found")
+    audio_bytes = await asyncio.to_thread(tts_cache.read, key)
+    if audio_bytes is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    return _audio_response(audio_bytes, request, _audio_headers(key))
+
+
 
 @router.post("/start", response_model=StartMockInterviewResponse)
 async def start_mock_interview(
@@ -152,7 +211,7 @@ async def start_mock_interview(
     total_seconds = max(60, duration_minutes * 60)
 
     
-    state: Dict[str, Any] = {
+    header: Dict[str, Any] = {
         "target_role": payload.target_role,
         "career_level": payload.career_level,
         "difficulty": payload.difficulty,
@@ -160,48 +219,28 @@ async def start_mock_interview(
         "duration_minutes": duration_minutes,
         "interviewers": interviewers,
         "started_at": started_at,
-        "round": 1,
-        "max_rounds": max(3, duration_minutes // 3),
-        "remaining_seconds": total_seconds,
-        "questions": [
-            {
-                "interviewer_name": interviewers[0]["name"]
-                if interviewers
-                else "Interviewer",
-                "question": first_question,
-                "answer": "",
-                "feedback": {},
-            }
-        ],
         "session_brief": session_brief,
     }
+    first_turn = {
+        "turn_index": 0,
+        "interviewer_name": interviewers[0]["name"] if interviewers else "Interviewer",
+        "question": first_question,
+    }
+    max_rounds = max(3, duration_minutes // 3)
 
     
     try:
-        json_state = json.dumps(state, ensure_ascii=False)
-        with mysql_db.get_cursor() as cursor:
-            cursor.execute(
-                """
-                INSERT INTO mock_interview_sessions
-                (user_id, target_role, difficulty, num_interviewers, duration_minutes, state_json, status)
-                VALUES (%s, %s, %s, %s, %s, %s, 'active')
-                """,
-                (
-                    user_id,
-                    payload.target_role,
-                    payload.difficulty,
-                    payload.num_interviewers,
-                    duration_minutes,
-                    json_state,
-                ),
-            )
-            session_id = cursor.lastrowid
-            if not session_id:
-                raise RuntimeError("Could not get session_id from cursor.lastrowid")
+        session_id = MockInterview.create(
+            user_id, header, first_turn,
+            max_rounds=max_rounds,
+            remaining_seconds=total_seconds,
+        )
     except Exception as e:
         logger.error(f"[MockInterview] DB Insert failed: {e}")
         raise HTTPException(status_code=500, detail="Database Error")
 
+    interview_prefetch.prefetch_after(session_id, {"state_json": header}, first_turn, [], max_rounds)
+
     return StartMockInterviewResponse(
         session_id=session_id,
         session_brief=session_brief,
@@ -221,70 +260,50 @@ async def answer_mock_interview(
     user_id = current_user["user_id"]
     row = load_mock_session(session_id, user_id)
     state = row["state_json"]
+    round_idx = int(row.get("current_round") or 1)
+    max_rounds = int(row.get("max_rounds") or 5)
 
     
     if row.get("status") == "completed":
-        remaining = int(state.get("remaining_seconds", 0))
         return AnswerResponse(
             session_id=session_id,
             feedback={"summary": "Interview already completed."},
             next_question=None,
             should_continue=False,
-            rounds_completed=int(state.get("round", 0)),
-            remaining_seconds=remaining,
+            rounds_completed=round_idx,
+            remaining_seconds=int(row.get("remaining_seconds") or 0),
             penalty_seconds=0,
             penalty_reason="",
         )
 
-    questions = state.get("questions", [])
-    if not questions:
-        questions = []
-        state["questions"] = questions
-
-    
-    if questions:
-        questions[-1]["answer"] = payload.answer
+    turn_index = round_idx - 1
+    if payload.turn_index is not None and payload.turn_index != turn_index:
+        raise HTTPException(status_code=409, detail="This question was already answered")
+    turns = MockInterview.get_turns(session_id, since_index=interview_memory.first_needed_turn(row))
+    current = turns[-1] if turns and turns[-1]["turn_index"] == turn_index else None
+    if current is None:
+        raise HTTPException(status_code=409, detail="Session has no open question")
 
     
     elapsed = payload.elapsed_seconds or 0
-    remaining = int(
-        state.get("remaining_seconds", state.get("duration_minutes", 20) * 60)
-    )
-    remaining = max(0, remaining - max(0, elapsed))
-    state["remaining_seconds"] = remaining
-
-    round_idx = int(state.get("round", 1))
-    max_rounds = int(state.get("max_rounds", 5))
-
-    
-    save_mock_session(session_id, state, status="active")
-
-    
-    current_q_text = questions[-1]["question"] if questions else "Intro"
-    interviewer_name = (
-        questions[-1].get("interviewer_name", "Interviewer")
-        if questions
-        else "Interviewer"
+    remaining = MockInterview.save_answer(session_id, turn_index, payload.answer, payload.skipped, elapsed)
+    if remaining is None:
+        raise HTTPException(status_code=409, detail="This question was already answered")
+    current["answer"] = payload.answer
+    current["skipped"] = payload.skipped
+
+    previous = turns[:-1]
+    history_vars, history_tokens = interview_memory.build(row, previous)
+    vars_for_prompt = answer_vars(
+        state, history_vars, current, payload.answer, payload.skipped, max_rounds, remaining,
+        interviewer_name=payload.interviewer_name,
     )
 
-    vars_for_prompt = {
-        "target_role": state.get("target_role"),
-        "career_level": state.get("career_level"),
-        "difficulty": state.get("difficulty"),
-        "num_interviewers": str(state.get("num_interviewers")),
-        "interviewers_json": json.dumps(
-            state.get("interviewers", []), ensure_ascii=False
-        ),
-        "history_json": json.dumps(questions, ensure_ascii=False),
-        "interviewer_name": payload.interviewer_name or interviewer_name,
-        "question": current_q_text,
-        "answer": payload.answer,
-        "round": round_idx,
-        "max_rounds": max_rounds,
-        "remaining_seconds": remaining,
-        "duration_minutes": state.get("duration_minutes", 20),
-        "skipped": payload.skipped,
-    }
+    if settings.INTERVIEW_PREFETCH_ENABLED:
+        return await _answer_speculative(
+            session_id, row, current, previous, payload, vars_for_prompt, history_vars,
+            history_tokens, remaining, max_rounds,
+        )
 
     
     llm_result = await process_interview_answer(vars_for_prompt)
@@ -299,57 +318,185 @@ async def answer_mock_interview(
     
     if penalty_seconds > 0:
         remaining = max(0, remaining - penalty_seconds)
-        state["remaining_seconds"] = remaining
-
-    
-    if questions:
-        questions[-1]["feedback"] = feedback
 
     
     should_continue = llm_continue and remaining > 0 and round_idx < max_rounds
 
+    next_turn = None
     if should_continue and next_question:
-        
-        state["round"] = round_idx + 1
+        next_turn = {
+            "interviewer_name": interviewer_for_turn(state, turn_index + 1),
+            "question": next_question,
+        }
 
-        next_interviewer_idx = (
-            (round_idx) % state.get("num_interviewers", 1)
-            if state.get("num_interviewers", 1) > 0
-            else 0
-        )
-        panel = state.get("interviewers", [])
-        next_interviewer = (
-            panel[next_interviewer_idx]
-            if 0 <= next_interviewer_idx < len(panel)
-            else {"name": "Interviewer"}
+    try:
+        MockInterview.complete_turn(
+            session_id, turn_index, feedback, penalty_seconds, remaining, next_turn, history_tokens
         )
+    except MockInterviewConflict:
+        raise HTTPException(status_code=409, detail="This question was already answered")
 
-        questions.append(
-            {
-                "interviewer_name": next_interviewer.get("name", "Interviewer"),
-                "question": next_question,
-                "answer": "",
-                "feedback": {},
-            }
-        )
-        save_mock_session(session_id, state, status="active")
-    else:
-        
-        save_mock_session(session_id, state, status="completed")
+    current["feedback"] = feedback
+    interview_memory.schedule_update(session_id, row, previous + [current])
 
     return AnswerResponse(
         session_id=session_id,
         feedback=feedback,
-        next_question=next_question if should_continue else None,
-        should_continue=should_continue,
-        rounds_completed=int(state.get("round", round_idx)),
+        next_question=next_question if next_turn else None,
+        should_continue=next_turn is not None,
+        rounds_completed=round_idx + 1 if next_turn else round_idx,
         remaining_seconds=remaining,
         penalty_seconds=penalty_seconds,
         penalty_reason=penalty_reason,
+        turn_index=turn_index,
+    )
+
+
+async def _answer_speculative(
+    session_id: int,
+    row: Dict[str, Any],
+    current: Dict[str, Any],
+    previous: List[Dict[str, Any]],
+    payload: AnswerRequest,
+    vars_for_prompt: Dict[str, Any],
+    history_vars: Dict[str, str],
+    history_tokens: Dict[str, int],
+    remaining: int,
+    max_rounds: int,
+) -> AnswerResponse:
+    """
+    Answer path with INTERVIEW_PREFETCH_ENABLED: the next question comes from
+    the prefetch started when this one was asked (generated inline on a
+    miss), the session advances right away and the evaluation runs in the
+    background. Whether to continue follows the clock and round limit only;
+    a penalty is charged when the feedback lands.
+    """
+    turn_index = current["turn_index"]
+    round_idx = turn_index + 1
+    next_turn = await interview_prefetch.next_turn(
+        session_id, row["state_json"], history_vars, current, payload.answer, payload.skipped, max_rounds, remaining,
+    )
+
+    try:
+        MockInterview.complete_turn(
+            session_id, turn_index, None, 0, None, next_turn, history_tokens,
+            elapsed_seconds=payload.elapsed_seconds or 0,
+        )
+    except MockInterviewConflict:
+        raise HTTPException(status_code=409, detail="This question was already answered")
+
+    interview_prefetch.evaluate(session_id, row, current, previous, vars_for_prompt)
+    if next_turn:
+        interview_prefetch.prefetch_after(session_id, row, next_turn, previous + [current], max_rounds)
+
+    return AnswerResponse(
+        session_id=session_id,
+        feedback={},
+        next_question=next_turn["question"] if next_turn else None,
+        should_continue=next_turn is not None,
+        rounds_completed=round_idx + 1 if next_turn else round_idx,
+        remaining_seconds=remaining,
+        turn_index=turn_index,
+        feedback_pending=True,
+    )
+
+
+@router.get("/{session_id}/feedback/{turn_index}", response_model=FeedbackResponse)
+async def get_turn_feedback(
+    session_id: int,
+    turn_index: int,
+    response: Response,
+    current_user=Depends(get_current_user),
+):
+    """
+    Feedback for an answered turn. Waits up to INTERVIEW_FEEDBACK_WAIT_SECONDS
+    for an evaluation running in this process, rerunning it here if it was
+    lost with another worker; 202 with pending=true means poll again.
+    """
+    row = load_mock_session(session_id, current_user["user_id"])
+
+    turns = MockInterview.get_turns(session_id)
+    turn = next((t for t in turns if t["turn_index"] == turn_index), None)
+    if not turn:
+        raise HTTPException(status_code=404, detail="Turn not found")
+    if turn["feedback"]:
+        result = {"feedback": turn["feedback"], "penalty_seconds": int(turn.get("penalty_seconds") or 0)}
+    else:
+        interview_prefetch.recover(session_id, row, [t for t in turns if t["turn_index"] <= turn_index])
+        result = await interview_prefetch.wait_feedback(
+            session_id, turn_index, settings.INTERVIEW_FEEDBACK_WAIT_SECONDS
+        )
+        if result is None:
+            response.status_code = 202
+            return FeedbackResponse(session_id=session_id, turn_index=turn_index, pending=True)
+
+    feedback = result["feedback"]
+    return FeedbackResponse(
+        session_id=session_id,
+        turn_index=turn_index,
+        pending=False,
+        feedback=feedback,
+        penalty_seconds=result["penalty_seconds"],
+        penalty_reason=str(feedback.get("penalty_reason") or ""),
     )
 
 
 
+@router.websocket("/{session_id}/ws")
+async def mock_interview_socket(
+    websocket: WebSocket,
+    session_id: int,
+    last_seq: int = 0,
+    audio: bool = False,
+):
+    """
+    Live transport for one session (see services.interview_live). Browsers
+    cannot set headers on a WebSocket, and a token in the URL would land in
+    access logs, so the first message must be {"type": "auth", "token"}
+    (closed with 4401 otherwise). Reconnect with ?last_seq= to receive
+    missed events; ?audio=true pushes MP3 chunks for each new question.
+
+    Client -> server: {"type": "answer", "turn_index", "answer", "skipped",
+    "elapsed_seconds"} and {"type": "ping"}. Server -> client: "state" on
+    connect (and again whenever the session was advanced elsewhere), then
+    answer_received, question, feedback_delta, feedback, completed,
+    audio / audio_end and error events.
+    """
+    await websocket.accept()
+    try:
+        message = await asyncio.wait_for(websocket.receive_json(), timeout=WS_AUTH_TIMEOUT_SECONDS)
+        if not isinstance(message, dict) or message.get("type") != "auth":
+            raise HTTPException(status_code=401, detail="Expected an auth message")
+        user = await asyncio.to_thread(user_from_token, str(message.get("token") or ""))
+    except (HTTPException, ValueError, asyncio.TimeoutError):
+        await websocket.close(code=4401)
+        return
+    except WebSocketDisconnect:
+        return
+    live = await live_interviews.open(session_id, user["user_id"])
+    if live is None:
+        await websocket.close(code=4404)
+        return
+
+    await live.attach(websocket, last_seq=last_seq, audio=audio)
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except ValueError:
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON objects"})
+                continue
+            if not isinstance(message, dict):
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON objects"})
+                continue
+            await live.handle(websocket, message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        live.detach(websocket)
+
+
+
 @router.get("/{session_id}/report")
 async def get_mock_interview_report(
     session_id: int,
@@ -360,25 +507,30 @@ async def get_mock_interview_report(
     state = row["state_json"]
 
     
-    if state.get("final_report"):
-        return {"report": state["final_report"]}
-
-    questions = state.get("questions", [])
-
-    vars_for_prompt = {
-        "target_role": state.get("target_role"),
-        "career_level": state.get("career_level"),
-        "difficulty": state.get("difficulty"),
-        "num_interviewers": str(state.get("num_interviewers")),
-        "interviewers_json": json.dumps(
-            state.get("interviewers", []), ensure_ascii=False
-        ),
-    }
+    existing = MockInterview.get_report(session_id)
+    if existing:
+        return {"report": existing}
+
+    # The last answers may still be under evaluation, here or (lost) elsewhere.
+    turns = MockInterview.get_turns(session_id)
+    pending = interview_prefetch.recover(session_id, row, turns)
+    if pending:
+        await asyncio.wait(pending, timeout=settings.INTERVIEW_FEEDBACK_WAIT_SECONDS)
+        turns = MockInterview.get_turns(session_id)
+    questions = [
+        {k: t[k] for k in ("interviewer_name", "question", "answer", "feedback")}
+        for t in turns
+    ]
+    # Stored reports are final, so one built without every evaluation is only returned.
+    feedback_pending = any(t.get("answered_age_seconds") is not None and not t["feedback"] for t in turns)
+
+    vars_for_prompt = panel_vars(state)
 
     try:
         report = await generate_interview_report(questions, vars_for_prompt)
-        state["final_report"] = report
-        save_mock_session(session_id, state, status="completed")
+        if feedback_pending:
+            return {"report": report, "feedback_pending": True}
+        MockInterview.save_report(session_id, report)
         return {"report": report}
     except Exception as e:
         logger.error(f"[MockInterview] Report generation failed: {e}")
@@ -389,26 +541,10 @@ async def get_mock_interview_report(
 @router.get("/history")
 async def get_mock_interview_history(current_user=Depends(get_current_user)):
     user_id = current_user["user_id"]
-    rows = mysql_db.fetch_all(
-        "SELECT * FROM mock_interview_sessions WHERE user_id=%s "
-        "ORDER BY updated_at DESC LIMIT 20",
-        (user_id,),
-    )
+    rows = MockInterview.list_by_user(user_id, limit=20)
 
     history: List[Dict[str, Any]] = []
     for r in rows:
-        state = r.get("state_json")
-        if isinstance(state, str):
-            try:
-                state = json.loads(state)
-                if isinstance(state, str):
-                    state = json.loads(state)
-            except Exception:
-                state = {}
-        state = state or {}
-        report = state.get("final_report") or {}
-        summary = report.get("summary", {})
-
         history.append(
             {
                 "session_id": r["session_id"],
@@ -418,10 +554,9 @@ async def get_mock_interview_history(current_user=Depends(get_current_user)):
                 "duration_minutes": r["duration_minutes"],
                 "status": r["status"],
                 "updated_at": str(r["updated_at"]),
-                "summary": summary.get(
-                    "overall_impression", "No summary available."
-                ),
-                "hire_recommendation": summary.get("hire_recommendation", ""),
+                "summary": r.get("overall_impression") or "No summary available.",
+                "hire_recommendation": r.get("hire_recommendation") or "",
+                "history_tokens_saved": max(0, (r.get("history_tokens_full") or 0) - (r.get("history_tokens_sent") or 0)),
             }
         )
 
@@ -435,20 +570,11 @@ async def delete_mock_session(
 ):
     user_id = current_user["user_id"]
     try:
-        row = mysql_db.fetch_one(
-            "SELECT session_id FROM mock_interview_sessions "
-            "WHERE session_id=%s AND user_id=%s",
-            (session_id, user_id),
-        )
-        if not row:
+        if not MockInterview.delete(session_id, user_id):
             raise HTTPException(
                 status_code=404, detail="Session not found or unauthorized"
             )
 
-        mysql_db.execute_query(
-            "DELETE FROM mock_interview_sessions WHERE session_id=%s AND user_id=%s",
-            (session_id, user_id),
-        )
         logger.info(f"[MockInterview] Deleted session {session_id} for user {user_id}")
         return {"status": "deleted"}
     except HTTPException:
@@ -1,13 +1,19 @@
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
-import logging, json
+import logging, json, asyncio
 
 from database import get_db
 from routes.auth import get_current_user
-from models import Roadmap, RoadmapStep, Resume, User
+from models import Roadmap, RoadmapStep, RoadmapCurriculum, RoadmapVersionConflict, Resume, User
 from services.roadmap_generate import generate_roadmap
+from services.services_utils import make_etag, etag_matches, not_modified, PRIVATE_REVALIDATE
+from services.roadmap_patch import (
+    RoadmapPatchError, apply_json_patch, apply_completion_deltas, calculate_completion,
+)
+from services.roadmap_stream import start_generation, get_active_generation, replay_persisted, fail_if_stale, sse_event
 
 router = APIRouter(tags=["Roadmap"])
 logger = logging.getLogger("routes.roadmap")
@@ -28,36 +34,54 @@ class UpdateRoadmapContentRequest(BaseModel):
     completion_percentage: float
 
 
+class TopicCompletion(BaseModel):
+    phase: int = Field(..., ge=0)
+    topic: int = Field(..., ge=0)
+    completed: bool
+
+
+class SkillCompletion(BaseModel):
+    category: str = Field(..., pattern="^(skills_to_focus|skills_to_improve)$")
+    index: int = Field(..., ge=0)
+    completed: bool
+
+
+class PatchRoadmapContentRequest(BaseModel):
+    version: Optional[int] = None
+    operations: List[Dict[str, Any]] = []
+    topics: List[TopicCompletion] = []
+    skills: List[SkillCompletion] = []
+
+
+def _resolve_generation_inputs(payload: GenerateRoadmapRequest, user_id: int):
+    """Pick the parsed resume (requested or latest) and location for a generation request."""
+    parsed_resume = None
+    if payload.resume_id:
+        resume_record = Resume.get_by_id(payload.resume_id)
+        if resume_record and resume_record["user_id"] == user_id:
+            parsed_resume = resume_record.get("parsed_json")
+            if isinstance(parsed_resume, str):
+                parsed_resume = json.loads(parsed_resume)
+        else:
+            logger.warning(f"User {user_id} requested invalid resume {payload.resume_id}")
+
+    if not parsed_resume:
+        latest_resume = Resume.get_latest(user_id)
+        parsed_resume = latest_resume.get("parsed_json") if latest_resume else None
+
+    final_location = payload.location
+    if not final_location:
+        full_user = User.get_by_id(user_id)
+        final_location = full_user.get("location")
+    return parsed_resume, final_location
+
+
 @router.post("/generate")
 async def generate_user_roadmap(payload: GenerateRoadmapRequest, current_user: dict = Depends(get_current_user)):
     user_id = current_user["user_id"]
     
     try:
-        
-        parsed_resume = None
-        if payload.resume_id:
-            
-            resume_record = Resume.get_by_id(payload.resume_id)
-            if resume_record and resume_record["user_id"] == user_id:
-                parsed_resume = resume_record.get("parsed_json")
-                
-                if isinstance(parsed_resume, str):
-                    parsed_resume = json.loads(parsed_resume)
-            else:
-                logger.warning(f"User {user_id} requested invalid resume {payload.resume_id}")
-        
-        
-        if not parsed_resume:
-            latest_resume = Resume.get_latest(user_id)
-            parsed_resume = latest_resume.get("parsed_json") if latest_resume else None
-
-        
-        final_location = payload.location
-        if not final_location:
-            
-            full_user = User.get_by_id(user_id)
-            final_location = full_user.get("location")
-        
+        parsed_resume, final_location = _resolve_generation_inputs(payload, user_id)
         
         roadmap_data = await generate_roadmap(
             user_id=user_id,
@@ -82,37 +106,142 @@ async def generate_user_roadmap(payload: GenerateRoadmapRequest, current_user: d
         logger.exception(f"[generate_user_roadmap] {e}")
         raise HTTPException(status_code=500, detail=f"Roadmap generation failed: {str(e)}")
 
+
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+@router.post("/generate/stream")
+async def generate_user_roadmap_stream(payload: GenerateRoadmapRequest, current_user: dict = Depends(get_current_user)):
+    """
+    Server-sent events variant of /generate: emits a `roadmap` event with the
+    new id, one `section` event per roadmap section as it completes, then
+    `complete` (or `error`). Generation keeps running if the client drops;
+    reconnect with GET /{roadmap_id}/stream.
+    """
+    user_id = current_user["user_id"]
+    try:
+        parsed_resume, final_location = _resolve_generation_inputs(payload, user_id)
+        start_date = datetime.now().date()
+        end_date = (datetime.now() + timedelta(days=payload.timeline_months * 30)).date()
+        roadmap_id = Roadmap.create(user_id, payload.target_role, start_date, end_date, 0.0)
+        RoadmapStep.create_full_roadmap(roadmap_id, {"generation_status": "generating"})
+    except Exception as e:
+        logger.exception(f"[generate_user_roadmap_stream] {e}")
+        raise HTTPException(status_code=500, detail=f"Roadmap generation failed: {str(e)}")
+
+    gen = start_generation(
+        roadmap_id,
+        user_id,
+        target_role=payload.target_role,
+        timeline_months=payload.timeline_months,
+        parsed_resume=parsed_resume,
+        model_pref=payload.model_pref,
+        career_level=payload.career_level,
+        location=final_location,
+    )
+
+    async def events():
+        yield sse_event("roadmap", {"roadmap_id": roadmap_id, "generation_status": "generating"})
+        async for payload_str in gen.stream():
+            yield payload_str
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
+@router.get("/{roadmap_id}/stream")
+async def resume_roadmap_stream(
+    roadmap_id: int,
+    last_event_id: Optional[str] = Header(None),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Reconnect to a roadmap's event stream: sends the finished sections the
+    client's Last-Event-ID does not cover, then follows live ones.
+    """
+    try:
+        await asyncio.to_thread(Roadmap.get_by_id, roadmap_id, current_user["user_id"])
+    except Exception:
+        raise HTTPException(status_code=404, detail="Roadmap not found")
+
+    gen = get_active_generation(roadmap_id)
+    if gen:
+        return StreamingResponse(gen.stream(last_event_id), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+    document = await asyncio.to_thread(RoadmapStep.get_by_roadmap, roadmap_id)
+    document = await asyncio.to_thread(fail_if_stale, roadmap_id, document)
+    return StreamingResponse(
+        replay_persisted(roadmap_id, document, last_event_id), media_type="text/event-stream", headers=_SSE_HEADERS
+    )
+
 @router.get("/list")
-def list_user_roadmaps(current_user: dict = Depends(get_current_user)):
+def list_user_roadmaps(
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: dict = Depends(get_current_user),
+):
+    """Roadmap cards from the summary columns on roadmaps; the roadmap JSON itself is not read."""
     try:
-        roadmaps = Roadmap.get_by_user(current_user["user_id"])
-        enriched = []
-
-        for r in roadmaps:
-            steps = RoadmapStep.get_by_roadmap(r["roadmap_id"])
-            overview = {}
-            if steps and isinstance(steps, dict):
-                overview = steps.get("overview", {})
-            enriched.append({
-                **r,
-                "overview_summary": overview.get("overview_summary"),
-                "difficulty_level": overview.get("difficulty_level"),
-                "duration_total": overview.get("duration_total"),
-            })
-
-        return {"roadmaps": enriched}
+        user_id = current_user["user_id"]
+        roadmaps = Roadmap.list_summaries(user_id, limit, offset)
+        total = Roadmap.count_by_user(user_id) if offset or len(roadmaps) == limit else offset + len(roadmaps)
+        return {"roadmaps": roadmaps, "total": total, "limit": limit, "offset": offset}
     except Exception as e:
         logger.error(f"[list_user_roadmaps] {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch roadmaps")
 
+@router.get("/due")
+def list_due_topics(
+    days: int = Query(7, ge=1, le=90),
+    include_completed: bool = False,
+    current_user: dict = Depends(get_current_user),
+):
+    """Topics across the user's roadmaps whose phase is due within the next `days` days."""
+    try:
+        today = datetime.now().date()
+        topics = RoadmapCurriculum.due_topics(
+            current_user["user_id"], today, today + timedelta(days=days), include_completed
+        )
+        return {"from": today, "to": today + timedelta(days=days), "topics": topics}
+    except Exception as e:
+        logger.error(f"[list_due_topics] {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch due topics")
+
+
+@router.get("/{roadmap_id}/progress")
+def get_roadmap_phase_progress(roadmap_id: int, current_user: dict = Depends(get_current_user)):
+    try:
+        Roadmap.get_by_id(roadmap_id, current_user["user_id"])
+    except Exception:
+        raise HTTPException(status_code=404, detail="Roadmap not found")
+    try:
+        return {"roadmap_id": roadmap_id, "phases": RoadmapCurriculum.progress(roadmap_id)}
+    except Exception as e:
+        logger.error(f"[get_roadmap_phase_progress] {e}")
+        raise HTTPException(status_code=500, detail="Failed to load roadmap progress")
+
+
 @router.get("/{roadmap_id}")
-def get_roadmap_detail(roadmap_id: int, current_user: dict = Depends(get_current_user)):
+def get_roadmap_detail(
+    roadmap_id: int, request: Request, response: Response, current_user: dict = Depends(get_current_user)
+):
     try:
         roadmap_meta = Roadmap.get_by_id(roadmap_id, current_user["user_id"])
+    except Exception:
+        raise HTTPException(status_code=404, detail="Roadmap not found")
+
+    # content_version is bumped by every write to the roadmap JSON or its progress,
+    # so a matching validator means the stored document is unchanged.
+    etag = make_etag("roadmap", roadmap_id, roadmap_meta.get("content_version"))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    try:
         roadmap_json = RoadmapStep.get_by_roadmap(roadmap_id)
 
         
         roadmap = {**roadmap_json, **roadmap_meta}
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = PRIVATE_REVALIDATE
         return roadmap
     except Exception as e:
         logger.error(f"[get_roadmap_detail] {e}")
@@ -152,4 +281,46 @@ def update_roadmap_content(
         return {"message": "Roadmap updated successfully"}
     except Exception as e:
         logger.error(f"[update_roadmap_content] {e}")
-        raise HTTPException(status_code=500, detail="Failed to update roadmap")    
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to update roadmap")
+
+
+@router.patch("/{roadmap_id}/content")
+def patch_roadmap_content(
+    roadmap_id: int,
+    payload: PatchRoadmapContentRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Apply RFC 6902 operations and/or topic and skill completion deltas to the
+    stored roadmap. If version is given the update is rejected with 409 when
+    the roadmap has changed since; completion_percentage is recomputed here.
+    """
+    if not (payload.operations or payload.topics or payload.skills):
+        raise HTTPException(status_code=400, detail="No changes given")
+
+    def apply(doc):
+        doc = apply_json_patch(doc, payload.operations)
+        doc = apply_completion_deltas(
+            doc,
+            [t.model_dump() for t in payload.topics],
+            [s.model_dump() for s in payload.skills],
+        )
+        percent = calculate_completion(doc)
+        doc["completion_percentage"] = percent
+        return doc, percent
+
+    try:
+        return RoadmapStep.patch_content(roadmap_id, current_user["user_id"], payload.version, apply)
+    except RoadmapVersionConflict as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Roadmap was modified", "version": e.current_version},
+        )
+    except RoadmapPatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Roadmap not found")
+    except Exception as e:
+        logger.error(f"[patch_roadmap_content] {e}")
+        raise HTTPException(status_code=500, detail="Failed to update roadmap")
+
@@ -6,6 +6,7 @@ import logging
 from routes.auth import get_current_user
 from models import Skill, UserSkill
 from services.llm_manager import run_llm
+from services.embeddings import embedding_service, similar_skills
 
 logger = logging.getLogger("routes.skills")
 router = APIRouter(tags=["Skills"])
@@ -26,6 +27,18 @@ async def list_skills(current_user: Dict = Depends(get_current_user)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch skills: {e}")
 
+@router.get("/similar")
+def list_similar_skills(
+    name: str = Query(..., min_length=1, max_length=100),
+    k: int = Query(10, ge=1, le=50),
+    current_user: Dict = Depends(get_current_user),
+):
+    """Skills semantically close to name, from local embeddings (no LLM call)."""
+    if not embedding_service.enabled:
+        raise HTTPException(status_code=503, detail="Semantic matching is not available")
+    return {"skill": name, "similar": similar_skills(name, k=k)}
+
+
 @router.get("/recommend")
 async def recommend_skills(
     role: str = Query(...),
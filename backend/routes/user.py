@@ -3,14 +3,17 @@ import json
 from typing import Optional, Dict
 
 from fastapi import (
-    APIRouter, HTTPException, Depends, UploadFile, File, Query
+    APIRouter, HTTPException, Depends, UploadFile, File, Query, Request, Response
 )
 from pydantic import BaseModel
 
 from routes.auth import get_current_user
 from models import Resume, User
 from services.skill_extractions import process_resume, save_extracted_skills
-from services.services_utils import is_model_on_cooldown
+from services.services_utils import (
+    is_model_on_cooldown, spool_upload, make_etag, etag_matches, not_modified, PRIVATE_REVALIDATE,
+)
+from config import settings
 from tasks import parse_resume_task
 
 logger = logging.getLogger("routes.user")
@@ -71,33 +74,41 @@ async def upload_resume(
     model_pref: Optional[str] = Query("auto"),
     current_user: Dict = Depends(get_current_user),
 ):
-    """Upload resume, parse via LLM, and store in DB (no tempfiles)."""
+    """Upload resume (streamed, size-capped), parse via LLM, and store in DB."""
     user_id = current_user["user_id"]
+    upload = None
     try:
-        content = await file.read()
-        if not content:
+        upload = await spool_upload(file, settings.MAX_RESUME_UPLOAD_BYTES)
+        if not upload.size:
             raise HTTPException(status_code=400, detail="Empty file upload")
 
         parsed = await process_resume(
             user_id=user_id,
-            file_bytes=content,
-            filename=file.filename,
+            file_obj=upload.rewind(),
+            filename=upload.filename,
             model_pref=model_pref,
         )
 
         Resume.create_binary(
             user_id=user_id,
-            filename=file.filename,
-            file_bytes=content,
-            mime_type=file.content_type or "application/pdf",
+            filename=upload.filename,
+            file_bytes=upload.rewind(),
+            mime_type=upload.content_type,
             parsed_json=parsed,
+            file_size=upload.size,
+            file_sha256=upload.sha256,
         )
 
-        logger.info(f"[upload_resume] ✅ Parsed resume for user {user_id}")
+        logger.info(f"[upload_resume] ✅ Parsed resume for user {user_id} ({upload.size} bytes)")
         return {"message": "Resume parsed successfully", "parsed_json": parsed}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(f"[upload_resume] ❌ {e}")
         raise HTTPException(status_code=500, detail=f"Resume parsing failed: {e}")
+    finally:
+        if upload:
+            upload.close()
 
 
 
@@ -115,9 +126,10 @@ async def upload_linkedin(
         raise HTTPException(status_code=400, detail="Empty LinkedIn data")
 
     try:
+        text_bytes = text.encode("utf-8")
         parsed = await process_resume(
             user_id=user_id,
-            file_bytes=text.encode("utf-8"),
+            file_bytes=text_bytes,
             filename="linkedin.txt",
             model_pref=model_pref,
         )
@@ -128,7 +140,7 @@ async def upload_linkedin(
         Resume.create_binary(
             user_id=user_id,
             filename="linkedin.txt",
-            file_bytes=text.encode(),
+            file_bytes=text_bytes,
             mime_type="text/plain",
             parsed_json=parsed,
         )
@@ -147,11 +159,24 @@ async def resume_history(current_user: Dict = Depends(get_current_user)):
 
 
 @router.get("/resume/load/{resume_id}")
-async def load_resume(resume_id: int, current_user: Dict = Depends(get_current_user)):
+async def load_resume(
+    resume_id: int, request: Request, response: Response, current_user: Dict = Depends(get_current_user)
+):
     """Load parsed JSON for a specific resume from DB (fix for 'View Resume')."""
-    rec = Resume.get_by_id(resume_id)
-    if not rec or rec["user_id"] != current_user["user_id"]:
+    meta = Resume.get_version(resume_id)
+    if not meta or meta["user_id"] != current_user["user_id"]:
+        raise HTTPException(status_code=404, detail="Not found or unauthorized")
+
+    # Stored resumes are never modified, so id + file hash + upload time identify the content.
+    etag = make_etag("resume", resume_id, meta.get("file_sha256"), meta.get("uploaded_at"))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    rec = Resume.get_parsed(resume_id)
+    if not rec:
         raise HTTPException(status_code=404, detail="Not found or unauthorized")
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = PRIVATE_REVALIDATE
 
     parsed_data = rec.get("parsed_json", {})
 
@@ -0,0 +1,175 @@
+# backend/services/audio_cache.py
+
+import os
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger("services.audio_cache")
+logger.setLevel(logging.INFO)
+
+
+class AudioCache:
+    """
+    Content-addressed synthesized audio on local disk: one file per
+    (text, voice, language, format) hash, so the same sentence is
+    synthesized once no matter who asks. Total size is bounded by LRU
+    eviction; recency is kept in file mtimes, so it survives restarts and
+    the index is rebuilt by scanning the directory (load(), at startup or on
+    first use). File I/O happens outside the index lock. Files are
+    written to a temp name and renamed, and a file another worker evicted
+    simply reads as a miss. Concurrent misses for one key share one
+    synthesis.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # key -> size, least recently used first
+        self._bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+    @staticmethod
+    def key(text: str, voice: str, language: str, fmt: str) -> str:
+        payload = json.dumps([text, voice, language, fmt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def metrics(self) -> Dict[str, Any]:
+        s: Dict[str, Any] = dict(self.stats)
+        lookups = s["hits"] + s["misses"] + s["coalesced"]
+        s["entries"] = len(self._index)
+        s["bytes"] = self._bytes
+        s["hit_ratio"] = round((s["hits"] + s["coalesced"]) / lookups, 3) if lookups else 0.0
+        return s
+
+    def load(self):
+        """Build the index from the files on disk (blocking; once per process)."""
+        if self._loaded:
+            return
+        found = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if ".tmp" in name:
+                    continue
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                found.append((st.st_mtime, name, st.st_size))
+        with self._lock:
+            if self._loaded:
+                return
+            for _, name, size in sorted(found):
+                if name not in self._index:  # put() may have run during the scan
+                    self._index[name] = size
+                    self._bytes += size
+            self._loaded = True
+        if found:
+            logger.info(f"[AudioCache] {len(found)} files, {self._bytes} bytes in {self.directory}")
+
+    def _drop(self, key: str):
+        self._bytes -= self._index.pop(key, 0)
+
+    def _evict(self) -> List[str]:
+        """Drop least recently used keys over max_bytes; the caller deletes their files after unlocking."""
+        evicted = []
+        while self._bytes > self.max_bytes and len(self._index) > 1:
+            key, _ = next(iter(self._index.items()))
+            self._drop(key)
+            self.stats["evictions"] += 1
+            evicted.append(key)
+        return evicted
+
+    def contains(self, key: str) -> bool:
+        self.load()
+        with self._lock:
+            if key in self._index:
+                return True
+        return os.path.exists(self.path(key))
+
+    def read(self, key: str) -> Optional[bytes]:
+        """Cached audio for key (refreshing its recency), or None."""
+        self.load()
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                self._drop(key)
+            return None
+        with self._lock:
+            if key not in self._index:  # written by another worker
+                self._index[key] = len(data)
+                self._bytes += len(data)
+            self._index.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes):
+        if not data:
+            return
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.load()
+        with self._lock:
+            self._drop(key)
+            self._index[key] = len(data)
+            self._bytes += len(data)
+            evicted = self._evict()
+        for key in evicted:
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+
+    async def get_or_create(self, key: str, produce: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Cached audio for key, or produce() it once (shared by concurrent callers) and store it."""
+        data = await asyncio.to_thread(self.read, key)
+        if data is not None:
+            self.stats["hits"] += 1
+            return data
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            data = await produce()
+            if data:
+                try:
+                    await asyncio.to_thread(self.put, key, data)
+                except OSError as e:
+                    logger.warning(f"[AudioCache] Could not store {key}: {e}")
+            future.set_result(data)
+            return data
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved here; waiters re-raise it
+            raise
+        finally:
+            self._inflight.pop(key, None)
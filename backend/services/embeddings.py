@@ -0,0 +1,352 @@
+# backend/services/embeddings.py
+
+import os
+import re
+import json
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import settings
+from models import RoadmapCurriculum, Skill
+from services.skill_canonical import skill_index, normalize_skill_key
+from services.job_index import job_index
+
+logger = logging.getLogger("services.embeddings")
+logger.setLevel(logging.INFO)
+
+try:
+    from sentence_transformers import SentenceTransformer
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    SentenceTransformer = None
+    EMBEDDINGS_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:  # Windows: flushes from several processes are not serialized
+    fcntl = None
+
+_SEARCH_CHUNK_ROWS = 65536
+_FLUSH_EVERY = 256
+
+
+@contextmanager
+def _file_lock(path: str):
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class EmbeddingStore:
+    """
+    Append-only vectors for one namespace ("skills", "jobs", "topics"):
+    a float16 .npy matrix opened memory-mapped plus a JSON list of row keys.
+    New vectors stay in memory until flush() rewrites the file (tmp file +
+    os.replace, so readers in other workers never see a partial matrix).
+    Reloading keeps unflushed vectors on top of what other processes wrote,
+    and flush() re-reads the file under a file lock and only appends keys it
+    lacks, so concurrent writers (API workers, the Celery task) never drop
+    each other's rows.
+    """
+
+    def __init__(self, directory: str, namespace: str, dim: int):
+        self.dim = dim
+        self.matrix_path = os.path.join(directory, f"{namespace}.npy")
+        self.keys_path = os.path.join(directory, f"{namespace}.keys.json")
+        self._keys: List[str] = []
+        self._pos: Dict[str, int] = {}
+        self._matrix = np.zeros((0, dim), dtype=np.float16)
+        self._pending: List[np.ndarray] = []
+        self._mtime = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def load(self):
+        """Read the stored matrix, keeping pending vectors whose keys it lacks."""
+        if not (os.path.exists(self.matrix_path) and os.path.exists(self.keys_path)):
+            return
+        try:
+            mtime = os.path.getmtime(self.matrix_path)
+            matrix = np.load(self.matrix_path, mmap_mode="r")
+            with open(self.keys_path, encoding="utf-8") as f:
+                keys = json.load(f)
+        except Exception as e:
+            logger.warning(f"[EmbeddingStore] {self.matrix_path} unreadable, starting empty: {e}")
+            return
+        if matrix.ndim != 2 or matrix.shape[1] != self.dim or matrix.shape[0] != len(keys):
+            logger.warning(f"[EmbeddingStore] {self.matrix_path} does not match its keys, starting empty")
+            return
+        with self._lock:
+            n_old = self._matrix.shape[0]
+            pending = list(zip(self._keys[n_old:], self._pending))
+            self._matrix, self._keys, self._pending = matrix, list(keys), []
+            self._pos = {k: i for i, k in enumerate(keys)}
+            self._mtime = mtime
+            for key, vec in pending:
+                if key not in self._pos:
+                    self._pos[key] = len(self._keys)
+                    self._keys.append(key)
+                    self._pending.append(vec)
+
+    def maybe_reload(self):
+        """Pick up a matrix flushed by another process."""
+        try:
+            changed = os.path.getmtime(self.matrix_path) > self._mtime
+        except OSError:
+            return
+        if changed:
+            self.load()
+
+    def _row(self, i: int) -> np.ndarray:
+        n = self._matrix.shape[0]
+        return self._matrix[i] if i < n else self._pending[i - n]
+
+    def get(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        with self._lock:
+            return {k: np.asarray(self._row(self._pos[k]), dtype=np.float32) for k in keys if k in self._pos}
+
+    def add(self, keys: Sequence[str], vectors: np.ndarray):
+        with self._lock:
+            for key, vec in zip(keys, vectors):
+                if key in self._pos:
+                    continue
+                self._pos[key] = len(self._keys)
+                self._keys.append(key)
+                self._pending.append(np.asarray(vec, dtype=np.float16))
+
+    def flush(self):
+        if not self._pending:
+            return
+        os.makedirs(os.path.dirname(self.matrix_path), exist_ok=True)
+        with _file_lock(self.matrix_path + ".lock"):
+            self.load()  # merge rows other processes flushed since we last read the file
+            self._write()
+
+    def _write(self):
+        with self._lock:
+            if not self._pending:
+                return
+            tmp = self.matrix_path + ".tmp.npy"
+            n_old = self._matrix.shape[0]
+            out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float16, shape=(len(self._keys), self.dim))
+            out[:n_old] = self._matrix
+            out[n_old:] = np.stack(self._pending)
+            out.flush()
+            del out
+            with open(self.keys_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(self._keys, f)
+            os.replace(tmp, self.matrix_path)
+            os.replace(self.keys_path + ".tmp", self.keys_path)
+            self._matrix = np.load(self.matrix_path, mmap_mode="r")
+            self._mtime = os.path.getmtime(self.matrix_path)
+            self._pending = []
+
+    def search(self, query: np.ndarray, k: int = 10, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """k nearest keys by cosine similarity (vectors are stored normalized)."""
+        query = np.asarray(query, dtype=np.float32)
+        skip = set(exclude)
+        with self._lock:
+            keys = list(self._keys)
+            parts = [self._matrix[i:i + _SEARCH_CHUNK_ROWS] for i in range(0, self._matrix.shape[0], _SEARCH_CHUNK_ROWS)]
+            if self._pending:
+                parts.append(np.stack(self._pending))
+        if not keys:
+            return []
+        scores = np.concatenate([p.astype(np.float32) @ query for p in parts])
+        want = min(len(scores), k + len(skip))
+        top = np.argpartition(-scores, want - 1)[:want]
+        ranked = sorted(top.tolist(), key=lambda i: -scores[i])
+        return [(keys[i], round(float(scores[i]), 4)) for i in ranked if keys[i] not in skip][:k]
+
+
+class EmbeddingService:
+    """
+    CPU sentence embeddings (sentence-transformers) with one EmbeddingStore
+    per namespace, so each skill, job and roadmap topic is encoded once and
+    similarity queries are a matrix-vector product. The model loads on first
+    use; without sentence-transformers the service reports enabled = False.
+    """
+
+    NAMESPACES = ("skills", "jobs", "topics")
+
+    def __init__(self, model_name: str, directory: str, batch_size: int):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.directory = os.path.join(directory, re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name))
+        self.enabled = EMBEDDINGS_AVAILABLE and settings.EMBEDDINGS_ENABLED
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._stores: Dict[str, EmbeddingStore] = {}
+
+    def _load_model(self):
+        with self._model_lock:
+            if self._model is None:
+                self._model = SentenceTransformer(self.model_name, device="cpu")
+                dim = self._model.get_sentence_embedding_dimension()
+                for ns in self.NAMESPACES:
+                    store = EmbeddingStore(self.directory, ns, dim)
+                    store.load()
+                    self._stores[ns] = store
+                logger.info(f"[EmbeddingService] Loaded {self.model_name} (dim={dim})")
+        return self._model
+
+    def store(self, namespace: str) -> EmbeddingStore:
+        self._load_model()
+        store = self._stores[namespace]
+        store.maybe_reload()
+        return store
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        model = self._load_model()
+        return model.encode(
+            texts, batch_size=self.batch_size, normalize_embeddings=True,
+            convert_to_numpy=True, show_progress_bar=False,
+        ).astype(np.float32)
+
+    def embed(self, namespace: str, items: Dict[str, str]) -> Dict[str, np.ndarray]:
+        """Vectors for {key: text}; keys not stored yet are encoded in one batch and appended."""
+        store = self.store(namespace)
+        found = store.get(items)
+        missing = [k for k in items if k not in found]
+        if missing:
+            vectors = self.encode([items[k] for k in missing])
+            store.add(missing, vectors)
+            found.update(zip(missing, vectors))
+            if store.pending >= _FLUSH_EVERY:
+                store.flush()
+        return found
+
+    def nearest(self, namespace: str, text: str, k: int = 10, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        return self.store(namespace).search(self.encode([text])[0], k, exclude)
+
+    def flush(self):
+        for store in self._stores.values():
+            try:
+                store.flush()
+            except Exception as e:
+                logger.warning(f"[EmbeddingService] Flush of {store.matrix_path} failed: {e}")
+
+    async def aembed(self, namespace: str, items: Dict[str, str]) -> Dict[str, np.ndarray]:
+        return await asyncio.to_thread(self.embed, namespace, items)
+
+
+embedding_service = EmbeddingService(
+    model_name=settings.EMBEDDING_MODEL,
+    directory=settings.EMBEDDING_DIR,
+    batch_size=settings.EMBEDDING_BATCH_SIZE,
+)
+
+
+def _job_text(job: Dict) -> str:
+    skills = ", ".join(job.get("required_skills") or [])
+    return f"{job.get('role') or ''}. {job.get('description') or ''} Skills: {skills}"[:2000]
+
+
+def _skill_items(names: Iterable[str]) -> Dict[str, str]:
+    items = {}
+    for name in names:
+        key = skill_index.canonical_key(str(name or ""))
+        if key:
+            items.setdefault(key, skill_index.lookup(key) or str(name).strip())
+    return items
+
+
+def similar_skills(name: str, k: int = 10) -> List[Dict]:
+    """
+    Stored skills closest to name (synonyms, neighbouring tools). Free text
+    that is not a stored skill is encoded for the query only, never added to
+    the shared store (skills get there through precompute_embeddings).
+    """
+    items = _skill_items([name])
+    if not items:
+        return []
+    key, text = next(iter(items.items()))
+    store = embedding_service.store("skills")
+    vector = store.get([key]).get(key)
+    if vector is not None:
+        hits = store.search(vector, k, exclude=[key])
+    else:
+        hits = embedding_service.nearest("skills", text, k, exclude=[key])
+    return [{"skill": skill_index.lookup(hit) or hit, "similarity": score} for hit, score in hits]
+
+
+def similar_jobs(job_id: int, k: int = 10) -> List[Dict]:
+    """Indexed postings whose text is closest to job_id's."""
+    job = job_index.get(job_id)
+    if not job:
+        return []
+    vector = embedding_service.embed("jobs", {str(job_id): _job_text(job)})[str(job_id)]
+    results = []
+    for hit, score in embedding_service.store("jobs").search(vector, k * 2, exclude=[str(job_id)]):
+        other = job_index.get(int(hit))
+        if other:
+            results.append({**other, "similarity": score})
+        if len(results) >= k:
+            break
+    return results
+
+
+def skill_gap(user_skills: Iterable[str], required: Iterable[str], threshold: Optional[float] = None) -> Dict:
+    """
+    Which required skills the user covers, exactly or through a close skill
+    (cosine >= threshold, e.g. PostgreSQL for MySQL), and which are missing.
+    """
+    threshold = settings.EMBEDDING_SKILL_THRESHOLD if threshold is None else threshold
+    have, need = _skill_items(user_skills), _skill_items(required)
+    if not need:
+        return {"covered": [], "missing": []}
+    vectors = embedding_service.embed("skills", {**have, **need})
+    need_keys, have_keys = list(need), list(have)
+    if have_keys:
+        sims = np.stack([vectors[k] for k in need_keys]) @ np.stack([vectors[k] for k in have_keys]).T
+    else:
+        sims = np.zeros((len(need_keys), 1), dtype=np.float32)
+
+    covered, missing = [], []
+    for i, key in enumerate(need_keys):
+        if key in have:
+            covered.append({"skill": need[key], "via": have[key], "similarity": 1.0})
+            continue
+        j = int(np.argmax(sims[i]))
+        best = float(sims[i, j]) if have_keys else 0.0
+        entry = {"skill": need[key], "closest": have[have_keys[j]] if have_keys else None, "similarity": round(best, 4)}
+        if best >= threshold:
+            covered.append({"skill": need[key], "via": entry["closest"], "similarity": entry["similarity"]})
+        else:
+            missing.append(entry)
+    return {"covered": covered, "missing": missing}
+
+
+def precompute_embeddings() -> Dict[str, int]:
+    """Encode every stored skill, indexed job and roadmap topic title not embedded yet."""
+    counts = {}
+    skills = _skill_items(row.get("skill_name") for row in Skill.get_all())
+    counts["skills"] = len(embedding_service.embed("skills", skills))
+    jobs = {str(job["job_id"]): _job_text(job) for job in job_index.jobs()}
+    counts["jobs"] = len(embedding_service.embed("jobs", jobs)) if jobs else 0
+    topics = {}
+    for title in RoadmapCurriculum.distinct_topic_titles():
+        key = normalize_skill_key(title)
+        if key:
+            topics.setdefault(key, title)
+    counts["topics"] = len(embedding_service.embed("topics", topics)) if topics else 0
+    embedding_service.flush()
+    logger.info(f"[precompute_embeddings] {counts}")
+    return counts
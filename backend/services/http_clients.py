@@ -0,0 +1,103 @@
+# backend/services/http_clients.py
+
+import asyncio
+import logging
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from config import settings
+
+logger = logging.getLogger("services.http_clients")
+logger.setLevel(logging.INFO)
+
+try:
+    import h2  # noqa: F401  (httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpClientRegistry:
+    """
+    Application-lifetime outbound HTTP clients, one pooled httpx.AsyncClient
+    per upstream name ("jsearch", "google_tts", ...). Each upstream gets its
+    own keep-alive pool, timeouts and a cap on concurrent in-flight requests.
+    Clients are created lazily per event loop (uvicorn's, or a worker's own
+    asyncio.run loop) and closed by aclose() on that loop: at shutdown, or at
+    the end of each asyncio.run in a Celery task. Entries are keyed on the
+    loop object weakly, so a finished loop's entries go away with it.
+    """
+
+    def __init__(self):
+        self._config: Dict[str, Dict[str, Any]] = {}
+        # event loop -> {name: (client, in-flight semaphore)}
+        self._loops: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def register(
+        self,
+        name: str,
+        max_connections: Optional[int] = None,
+        timeout: Optional[float] = None,
+        headers: Optional[Dict[str, str]] = None,
+        http2: bool = True,
+    ):
+        """Set pool options for an upstream; unregistered names use the config defaults."""
+        self._config[name] = {
+            "max_connections": max_connections or settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+            "timeout": timeout or settings.HTTP_READ_TIMEOUT_SECONDS,
+            "headers": headers or {},
+            "http2": http2 and settings.HTTP2_ENABLED and HTTP2_AVAILABLE,
+        }
+
+    def _build(self, name: str) -> httpx.AsyncClient:
+        if name not in self._config:
+            self.register(name)
+        cfg = self._config[name]
+        return httpx.AsyncClient(
+            http2=cfg["http2"],
+            headers=cfg["headers"],
+            timeout=httpx.Timeout(cfg["timeout"], connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=cfg["max_connections"],
+                max_keepalive_connections=cfg["max_connections"],
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+
+    def _entry(self, name: str) -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        clients = self._loops.setdefault(asyncio.get_running_loop(), {})
+        entry = clients.get(name)
+        if entry is None or entry[0].is_closed:
+            client = self._build(name)
+            entry = clients[name] = (client, asyncio.Semaphore(self._config[name]["max_connections"]))
+        return entry
+
+    def client(self, name: str) -> httpx.AsyncClient:
+        return self._entry(name)[0]
+
+    async def request(self, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        client, limit = self._entry(name)
+        async with limit:
+            return await client.request(method, url, **kwargs)
+
+    async def start(self):
+        """Open the registered clients up front so the first request does not pay for it."""
+        for name in self._config:
+            self.client(name)
+        logger.info(f"[HttpClientRegistry] Ready: {', '.join(self._config) or 'none'} (http2={HTTP2_AVAILABLE})")
+
+    async def aclose(self):
+        """Close the clients opened on the running loop."""
+        clients = self._loops.pop(asyncio.get_running_loop(), {})
+        for name, (client, _) in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"[HttpClientRegistry] Closing {name} failed: {e}")
+
+
+http_clients = HttpClientRegistry()
+http_clients.register("jsearch", timeout=12)
+http_clients.register("google_tts", timeout=15)
@@ -0,0 +1,390 @@
+# backend/services/interview_live.py
+
+import time
+import base64
+import asyncio
+import logging
+import weakref
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+from fastapi import WebSocket
+
+from config import settings
+from models import MockInterview, MockInterviewConflict
+from services.interview_memory import interview_memory
+from services.interview_prefetch import interview_prefetch, answer_vars
+from services.tts import google_tts_stream
+
+logger = logging.getLogger("services.interview_live")
+logger.setLevel(logging.INFO)
+
+
+class LiveInterview:
+    """
+    A mock interview driven over WebSockets. The worker holding the socket
+    keeps the session header, open turns and clock in memory, so an answer
+    needs no auth, session load or state_json parse. Writes go through an
+    ordered background writer: the answer is stored before the next question
+    is sent, the turn completion after it has gone out.
+
+    Events carry a sequence number and the last INTERVIEW_LIVE_REPLAY_EVENTS
+    are kept (audio excepted), so a client that reconnects with last_seq gets
+    what it missed. State stays here for INTERVIEW_LIVE_IDLE_SECONDS after
+    the last socket closes; a reconnect after that, or to another worker,
+    starts again from the stored turns. If the stored session moves on
+    without this instance (a REST submit), it reloads and sends a fresh
+    "state" event.
+    """
+
+    def __init__(self, session_id: int, user_id: int, header: Dict, turns: List[Dict], seq: int = 0):
+        self.session_id = session_id
+        self.user_id = user_id
+        self._load(header, turns)
+        self.seq = seq  # continues a replaced instance's numbering so clients do not drop events
+        self.events: Deque[Dict] = deque(maxlen=settings.INTERVIEW_LIVE_REPLAY_EVENTS)
+        self.sockets: Dict[WebSocket, bool] = {}  # socket -> wants audio
+        self.last_active = time.time()
+        self._lock = asyncio.Lock()
+        self._writes: asyncio.Queue = asyncio.Queue()
+        self._tasks: Set[asyncio.Task] = set()
+        self._closed = False
+        self._writer = self._spawn(self._write_loop())
+
+    def _load(self, header: Dict, turns: List[Dict]):
+        self.session = header
+        self.state = header["state_json"]
+        self.round = int(header.get("current_round") or 1)
+        self.max_rounds = int(header.get("max_rounds") or 5)
+        self.remaining = int(header.get("remaining_seconds") or 0)
+        self.status = header.get("status") or "active"
+        self.turns = turns  # turn_index > summary_through, oldest first
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    # ---------------- persistence ----------------
+
+    async def _write_loop(self):
+        while True:
+            fn, args, done = await self._writes.get()
+            try:
+                result = await asyncio.to_thread(fn, *args)
+                if not done.done():
+                    done.set_result(result)
+            except MockInterviewConflict as e:
+                logger.info(f"[LiveInterview] {fn.__name__} conflicted for session {self.session_id}: {e}")
+                if not done.done():
+                    done.set_exception(e)
+            except Exception as e:
+                logger.error(f"[LiveInterview] {fn.__name__} failed for session {self.session_id}: {e}")
+                if not done.done():
+                    done.set_exception(e)
+                await self._publish({"type": "error", "detail": "Could not save interview progress"})
+            finally:
+                self._writes.task_done()
+
+    def _persist(self, fn: Callable, *args) -> asyncio.Future:
+        """Queue a blocking DB write behind the ones already queued for this session."""
+        done = asyncio.get_running_loop().create_future()
+        done.add_done_callback(lambda f: f.cancelled() or f.exception())  # failures are logged by the writer
+        self._writes.put_nowait((fn, args, done))
+        return done
+
+    async def _save_feedback(self, session_id: int, turn_index: int, feedback: Dict, penalty_seconds: int):
+        if not self._closed:
+            return await self._persist(MockInterview.save_feedback, session_id, turn_index, feedback, penalty_seconds)
+        # An evaluation outliving close(): the writer is stopping, so save after what it still holds.
+        if not self._writer.done():
+            await self.flush()
+        return await asyncio.to_thread(MockInterview.save_feedback, session_id, turn_index, feedback, penalty_seconds)
+
+    def _summary_saved(self, summary: str, through: int, folded_tokens: int):
+        """Take a newly stored history summary and drop the turns it now covers."""
+        known = self.session.get("summary_through")
+        if known is not None and known >= through:
+            return  # reloaded meanwhile with a newer summary
+        self.session["history_summary"] = summary
+        self.session["summary_through"] = through
+        self.session["history_tokens_folded"] = int(self.session.get("history_tokens_folded") or 0) + folded_tokens
+        self.turns = [t for t in self.turns if t["turn_index"] > through]
+
+    async def flush(self):
+        await self._writes.join()
+
+    async def _reload(self):
+        """Replace the in-memory session with the stored one and tell every socket (caller holds _lock)."""
+        await self.flush()
+        header = await asyncio.to_thread(MockInterview.get_header, self.session_id, self.user_id)
+        if not header:
+            return
+        turns = await asyncio.to_thread(
+            MockInterview.get_turns, self.session_id, interview_memory.first_needed_turn(header)
+        )
+        self._load(header, turns)
+        await self._publish(self.snapshot())
+
+    async def _confirm_turn(self, done: asyncio.Future, turn_index: int):
+        try:
+            await done
+        except MockInterviewConflict:
+            logger.info(f"[LiveInterview] Session {self.session_id} moved past turn {turn_index} elsewhere, reloading")
+            async with self._lock:
+                await self._reload()
+        except Exception:
+            pass  # logged and reported by the writer
+
+    async def close(self):
+        await interview_prefetch.drain(self.session_id, settings.INTERVIEW_FEEDBACK_WAIT_SECONDS)
+        self._closed = True  # evaluations still running save directly from here on
+        await self.flush()
+        for task in list(self._tasks):
+            task.cancel()
+
+    # ---------------- events ----------------
+
+    async def _send(self, ws: WebSocket, event: Dict) -> bool:
+        try:
+            await ws.send_json(event)
+            return True
+        except Exception:
+            self.sockets.pop(ws, None)
+            return False
+
+    async def _publish(self, event: Dict):
+        self.seq += 1
+        event = {"seq": self.seq, **event}
+        self.events.append(event)
+        for ws in list(self.sockets):
+            await self._send(ws, event)
+
+    async def _publish_audio(self, turn_index: int, text: str):
+        listeners = [ws for ws, audio in self.sockets.items() if audio]
+        if not listeners:
+            return
+        part = 0
+        async for chunk in google_tts_stream(text):
+            if chunk:
+                event = {
+                    "type": "audio", "turn_index": turn_index, "part": part,
+                    "format": "mp3", "data": base64.b64encode(chunk).decode("ascii"),
+                }
+                for ws in listeners:
+                    await self._send(ws, event)
+                part += 1
+        for ws in listeners:
+            await self._send(ws, {"type": "audio_end", "turn_index": turn_index, "parts": part})
+
+    def snapshot(self) -> Dict[str, Any]:
+        current = self.turns[-1] if self.turns and self.status == "active" else None
+        return {
+            "type": "state",
+            "session_id": self.session_id,
+            "status": self.status,
+            "turn_index": current["turn_index"] if current else None,
+            "interviewer_name": current["interviewer_name"] if current else None,
+            "question": current["question"] if current else None,
+            "rounds_completed": self.round,
+            "max_rounds": self.max_rounds,
+            "remaining_seconds": self.remaining,
+            "last_seq": self.seq,
+        }
+
+    async def attach(self, ws: WebSocket, last_seq: int = 0, audio: bool = False):
+        """Send the current state and any events after last_seq, then follow live events."""
+        self.last_active = time.time()
+        await self._send(ws, self.snapshot())
+        sent = last_seq
+        while True:  # events may be published while we send; register only once caught up
+            backlog = [event for event in self.events if event["seq"] > sent]
+            if not backlog:
+                break
+            for event in backlog:
+                await self._send(ws, event)
+                sent = event["seq"]
+        self.sockets[ws] = audio
+
+    def detach(self, ws: WebSocket):
+        self.sockets.pop(ws, None)
+        self.last_active = time.time()
+
+    # ---------------- interview ----------------
+
+    async def handle(self, ws: WebSocket, message: Dict):
+        self.last_active = time.time()
+        kind = message.get("type")
+        if kind == "answer":
+            await self.answer(ws, message)
+        elif kind == "ping":
+            await self._send(ws, {"type": "pong", "last_seq": self.seq})
+        else:
+            await self._send(ws, {"type": "error", "detail": f"Unknown message type: {kind}"})
+
+    async def answer(self, ws: WebSocket, message: Dict):
+        async with self._lock:
+            turn_index = self.round - 1
+            current = self.turns[-1] if self.turns else None
+            if self.status != "active" or current is None or current["turn_index"] != turn_index:
+                await self._send(ws, {"type": "error", "detail": "Session has no open question"})
+                return
+            if message.get("turn_index") is not None and message["turn_index"] != turn_index:
+                await self._send(ws, {"type": "error", "detail": "This question was already answered"})
+                return
+
+            answer = str(message.get("answer") or "")
+            skipped = bool(message.get("skipped", False))
+            elapsed = max(0, int(message.get("elapsed_seconds") or 0))
+            try:
+                remaining = await self._persist(
+                    MockInterview.save_answer, self.session_id, turn_index, answer, skipped, elapsed,
+                )
+            except Exception:
+                return  # logged and reported by the writer
+            if remaining is None:
+                # The stored session is no longer waiting for this answer.
+                await self._send(ws, {"type": "error", "detail": "This question was already answered"})
+                await self._reload()
+                return
+            self.remaining = remaining
+            current["answer"] = answer
+            current["skipped"] = skipped
+            await self._publish({"type": "answer_received", "turn_index": turn_index})
+
+            previous = self.turns[:-1]
+            history_vars, history_tokens = interview_memory.build(self.session, previous)
+            vars_for_prompt = answer_vars(
+                self.state, history_vars, current, answer, skipped, self.max_rounds, self.remaining,
+            )
+            next_turn = await interview_prefetch.next_turn(
+                self.session_id, self.state, history_vars, current, answer, skipped, self.max_rounds, self.remaining,
+            )
+            completed = self._persist(
+                MockInterview.complete_turn, self.session_id, turn_index, None, 0, None, next_turn, history_tokens, elapsed,
+            )
+            self._spawn(self._confirm_turn(completed, turn_index))
+
+            if next_turn:
+                self.round += 1
+                self.turns.append({**next_turn, "answer": "", "feedback": {}})
+                await self._publish({
+                    "type": "question",
+                    "turn_index": next_turn["turn_index"],
+                    "interviewer_name": next_turn["interviewer_name"],
+                    "question": next_turn["question"],
+                    "rounds_completed": self.round,
+                    "remaining_seconds": self.remaining,
+                })
+                self._spawn(self._publish_audio(next_turn["turn_index"], next_turn["question"]))
+                interview_prefetch.prefetch_after(self.session_id, self.session, next_turn, previous + [current], self.max_rounds)
+            else:
+                self.status = "completed"
+                await self._publish({
+                    "type": "completed",
+                    "rounds_completed": self.round,
+                    "remaining_seconds": self.remaining,
+                })
+
+            self._evaluate(current, previous, vars_for_prompt)
+
+    def _evaluate(self, current: Dict, previous: List[Dict], vars_for_prompt: Dict[str, Any]):
+        turn_index = current["turn_index"]
+
+        async def on_delta(text: str):
+            await self._publish({"type": "feedback_delta", "turn_index": turn_index, "text": text})
+
+        async def deliver():
+            try:
+                result = await task
+            except Exception as e:
+                logger.warning(f"[LiveInterview] Evaluation of turn {turn_index} failed: {e}")
+                return
+            penalty = int(result.get("penalty_seconds") or 0)
+            self.remaining = max(0, self.remaining - penalty)
+            feedback = result["feedback"]
+            await self._publish({
+                "type": "feedback",
+                "turn_index": turn_index,
+                "feedback": feedback,
+                "penalty_seconds": penalty,
+                "penalty_reason": str(feedback.get("penalty_reason") or ""),
+                "remaining_seconds": self.remaining,
+            })
+
+        task = interview_prefetch.evaluate(
+            self.session_id, self.session, current, previous, vars_for_prompt,
+            on_delta=on_delta, save=self._save_feedback, on_summary=self._summary_saved,
+        )
+        self._spawn(deliver())
+
+
+class LiveInterviews:
+    """LiveInterview instances held by this worker, dropped after they sit idle with no socket."""
+
+    def __init__(self, idle_seconds: int):
+        self.idle_seconds = idle_seconds
+        self._sessions: Dict[int, LiveInterview] = {}
+        self._locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self._reaper: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def open(self, session_id: int, user_id: int) -> Optional[LiveInterview]:
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = self._locks[session_id] = asyncio.Lock()
+        stale = None
+        try:
+            async with lock:  # per session: opening one session never waits on another's DB reads
+                live = self._sessions.get(session_id)
+                if live and live.user_id != user_id:
+                    return None
+                if live and live.sockets:
+                    return live
+                if live:
+                    await live.flush()
+                header = await asyncio.to_thread(MockInterview.get_header, session_id, user_id)
+                if live:
+                    # Nobody was connected: the client may have answered over REST meanwhile.
+                    if header and int(header.get("current_round") or 1) == live.round and header.get("status") == live.status:
+                        return live
+                    self._sessions.pop(session_id, None)
+                    stale = live
+                if not header:
+                    return None
+                turns = await asyncio.to_thread(
+                    MockInterview.get_turns, session_id, interview_memory.first_needed_turn(header)
+                )
+                live = LiveInterview(session_id, user_id, header, turns, seq=stale.seq if stale else 0)
+                self._sessions[session_id] = live
+                if self._reaper is None or self._reaper.done():
+                    self._reaper = asyncio.get_running_loop().create_task(self._reap())
+                return live
+        finally:
+            if stale:
+                # Draining its evaluations can take a while; the new instance is already serving.
+                await stale.close()
+
+    async def _reap(self):
+        while self._sessions:
+            await asyncio.sleep(min(60, self.idle_seconds))
+            cutoff = time.time() - self.idle_seconds
+            for session_id, live in list(self._sessions.items()):
+                if not live.sockets and live.last_active < cutoff:
+                    self._sessions.pop(session_id, None)
+                    await live.close()
+
+    async def close_all(self):
+        """Flush pending writes of every live session (shutdown)."""
+        for live in list(self._sessions.values()):
+            try:
+                await asyncio.wait_for(live.close(), timeout=10)
+            except Exception as e:
+                logger.warning(f"[LiveInterviews] Session {live.session_id} did not flush: {e}")
+        self._sessions.clear()
+
+
+live_interviews = LiveInterviews(idle_seconds=settings.INTERVIEW_LIVE_IDLE_SECONDS)
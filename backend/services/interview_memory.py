@@ -0,0 +1,109 @@
+# backend/services/interview_memory.py
+
+import json
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from config import settings
+from models import MockInterview
+from services.llm_manager import run_llm
+from services.prompts import PROMPT_INTERVIEW_SUMMARY
+from services.prompt_budget import count_tokens, compact_history_json
+
+logger = logging.getLogger("services.interview_memory")
+logger.setLevel(logging.INFO)
+
+def _turn_json(turn: Dict) -> Dict[str, Any]:
+    return {k: turn.get(k) for k in ("interviewer_name", "question", "answer", "feedback")}
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+class InterviewMemory:
+    """
+    Rolling conversation memory for mock interview prompts: the last `window`
+    evaluated turns go to the model verbatim, everything older is represented
+    by a short summary kept on the session row. The summary is refreshed in a
+    background task after the answer has been returned; turns it does not
+    cover yet are sent clipped (prompt_budget.compact_history_json), so a
+    lagging or failed summary never drops history.
+    """
+
+    def __init__(self, window: int, batch: int):
+        self.window = max(1, window)
+        self.batch = max(1, batch)
+        self._running: Set[int] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def first_needed_turn(self, session: Dict) -> int:
+        """Lowest turn_index the answer prompt needs; older turns live in the summary."""
+        return int(session.get("summary_through", -1)) + 1
+
+    def build(self, session: Dict, previous: List[Dict]) -> Tuple[Dict[str, str], Dict[str, int]]:
+        """
+        Prompt variables (history_summary, history_json) for the evaluated
+        turns in `previous` (turn_index > summary_through, oldest first), and
+        token stats: what the full history would have cost vs. what is sent.
+        """
+        summary = session.get("history_summary") or ""
+        verbatim = _dumps([_turn_json(t) for t in previous])
+        history_json = compact_history_json(verbatim, keep_last=self.window)
+
+        sent = count_tokens(summary) + count_tokens(history_json)
+        # Without the memory every earlier turn would go out verbatim.
+        full = int(session.get("history_tokens_folded") or 0) + count_tokens(verbatim)
+        return (
+            {"history_summary": summary, "history_json": history_json},
+            {"full": full, "sent": sent},
+        )
+
+    def schedule_update(self, session_id: int, session: Dict, evaluated: List[Dict],
+                        on_saved: Optional[Callable[[str, int, int], None]] = None):
+        """
+        Fold turns that have left the verbatim window into the summary, off the
+        request path. `evaluated` holds the evaluated turns with
+        turn_index > summary_through, oldest first. on_saved(summary, through,
+        folded_tokens) is called once the new summary is stored.
+        """
+        due = evaluated[:-self.window] if len(evaluated) > self.window else []
+        if len(due) < self.batch or session_id in self._running:
+            return
+        self._running.add(session_id)
+        task = asyncio.get_running_loop().create_task(self._update(session_id, session, due, on_saved))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _update(self, session_id: int, session: Dict, due: List[Dict], on_saved=None):
+        try:
+            state = session.get("state_json") or {}
+            raw = await run_llm(PROMPT_INTERVIEW_SUMMARY, variables={
+                "target_role": state.get("target_role") or session.get("target_role"),
+                "career_level": state.get("career_level") or "",
+                "history_summary": session.get("history_summary") or "",
+                "history_json": _dumps([_turn_json(t) for t in due]),
+            })
+            summary = " ".join((raw or "").split())
+            if not summary:
+                return
+            folded = count_tokens(_dumps([_turn_json(t) for t in due]))
+            saved = await asyncio.to_thread(
+                MockInterview.save_summary, session_id, summary,
+                due[-1]["turn_index"], session.get("summary_through"), folded,
+            )
+            if saved:
+                logger.info(f"[InterviewMemory] Session {session_id} summary now covers turns 0-{due[-1]['turn_index']}")
+                if on_saved:
+                    on_saved(summary, due[-1]["turn_index"], folded)
+        except Exception as e:
+            logger.warning(f"[InterviewMemory] Summary update failed for session {session_id}: {e}")
+        finally:
+            self._running.discard(session_id)
+
+
+interview_memory = InterviewMemory(
+    window=settings.INTERVIEW_HISTORY_WINDOW,
+    batch=settings.INTERVIEW_SUMMARY_BATCH,
+)
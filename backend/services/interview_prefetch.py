@@ -0,0 +1,290 @@
+# backend/services/interview_prefetch.py
+
+import json
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from config import settings
+from models import MockInterview
+from services.mock_interview_llm import (
+    evaluate_interview_answer,
+    stream_interview_evaluation,
+    generate_next_questions,
+)
+from services.interview_memory import interview_memory
+
+logger = logging.getLogger("services.interview_prefetch")
+logger.setLevel(logging.INFO)
+
+_MAX_PENDING = 1000
+
+FEEDBACK_UNAVAILABLE = {
+    "summary": "Feedback could not be generated for this answer.",
+    "strengths": [],
+    "improvements": [],
+    "score": 0,
+}
+
+
+def panel_vars(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Prompt variables describing the interview and its panel."""
+    return {
+        "target_role": state.get("target_role"),
+        "career_level": state.get("career_level"),
+        "difficulty": state.get("difficulty"),
+        "num_interviewers": str(state.get("num_interviewers")),
+        "interviewers_json": json.dumps(
+            state.get("interviewers", []), ensure_ascii=False
+        ),
+    }
+
+
+def interviewer_for_turn(state: Dict[str, Any], turn_index: int) -> str:
+    """Interviewers take turns in panel order."""
+    num_interviewers = int(state.get("num_interviewers") or 1)
+    idx = turn_index % num_interviewers if num_interviewers > 0 else 0
+    panel = state.get("interviewers", [])
+    return panel[idx].get("name", "Interviewer") if 0 <= idx < len(panel) else "Interviewer"
+
+
+def answer_vars(state: Dict[str, Any], history_vars: Dict[str, str], turn: Dict[str, Any], answer: str,
+                skipped: bool, max_rounds: int, remaining_seconds: int,
+                interviewer_name: Optional[str] = None) -> Dict[str, Any]:
+    """Variables for evaluating the answer to turn (PROMPT_INTERVIEW_ANSWER / _EVALUATE)."""
+    return {
+        **panel_vars(state),
+        **history_vars,
+        "interviewer_name": interviewer_name or turn.get("interviewer_name") or "Interviewer",
+        "question": turn["question"],
+        "answer": answer,
+        "round": turn["turn_index"] + 1,
+        "max_rounds": max_rounds,
+        "remaining_seconds": remaining_seconds,
+        "duration_minutes": state.get("duration_minutes", 20),
+        "skipped": skipped,
+    }
+
+
+def next_question_vars(state: Dict[str, Any], history_vars: Dict[str, str],
+                       turn: Dict[str, Any], max_rounds: int) -> Dict[str, Any]:
+    """Variables for PROMPT_INTERVIEW_NEXT_QUESTION while turn is being answered."""
+    return {
+        **panel_vars(state),
+        **history_vars,
+        "interviewer_name": turn.get("interviewer_name") or "Interviewer",
+        "question": turn["question"],
+        "next_interviewer_name": interviewer_for_turn(state, turn["turn_index"] + 1),
+        "next_round": turn["turn_index"] + 2,
+        "max_rounds": max_rounds,
+    }
+
+
+def choose_question(options: Dict[str, str], answer: str, skipped: bool) -> str:
+    """
+    Pick between the prefetched candidates without waiting for the evaluation:
+    a skipped or very short answer moves on to a new topic, anything else
+    gets the follow-up. Falls back to whichever candidate exists.
+    """
+    weak = skipped or len((answer or "").split()) < settings.INTERVIEW_FOLLOW_UP_MIN_WORDS
+    first, second = ("new_topic", "follow_up") if weak else ("follow_up", "new_topic")
+    return options.get(first) or options.get(second) or ""
+
+
+class InterviewPrefetch:
+    """
+    Keeps the LLM off the mock interview answer path. When a question is
+    asked, candidate next questions for the following interviewer are
+    generated in the background while the candidate types; on submit the
+    route takes one and returns at once, and the answer is evaluated in a
+    second background task whose result the client collects from the
+    feedback endpoint.
+
+    State is per process, keyed (session_id, turn_index). A submit that
+    lands on another worker (or after a restart) finds nothing and the route
+    generates the question inline; feedback is always persisted, so it can be
+    read from the turn row wherever the evaluation ran. An evaluation that
+    never stored its result (its worker restarted) is rerun by recover().
+    """
+
+    def __init__(self, max_pending: int = _MAX_PENDING):
+        self.max_pending = max_pending
+        self._questions: "OrderedDict[Tuple[int, int], asyncio.Task]" = OrderedDict()
+        self._feedback: Dict[Tuple[int, int], asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.waits = 0
+        self.misses = 0
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def prefetch_questions(self, session_id: int, turn_index: int, vars_for_prompt: Dict[str, Any]):
+        """Start generating the candidates that follow turn_index (just asked)."""
+        for key in [k for k in self._questions if k[0] == session_id]:
+            self._questions.pop(key).cancel()
+        self._questions[(session_id, turn_index)] = self._spawn(generate_next_questions(vars_for_prompt))
+        while len(self._questions) > self.max_pending:
+            _, stale = self._questions.popitem(last=False)
+            stale.cancel()
+
+    def prefetch_after(self, session_id: int, session: Dict, asked: Dict, history: List[Dict], max_rounds: int):
+        """While the candidate answers `asked`, prepare what the next interviewer asks."""
+        if not settings.INTERVIEW_PREFETCH_ENABLED or asked["turn_index"] + 1 >= max_rounds:
+            return
+        history_vars, _ = interview_memory.build(session, history)
+        self.prefetch_questions(
+            session_id, asked["turn_index"],
+            next_question_vars(session["state_json"], history_vars, asked, max_rounds),
+        )
+
+    async def next_turn(self, session_id: int, state: Dict, history_vars: Dict[str, str], current: Dict,
+                        answer: str, skipped: bool, max_rounds: int, remaining: int) -> Optional[Dict]:
+        """
+        The turn that follows current, or None when the interview is over
+        (clock or round limit) or no question could be generated. Uses the
+        prefetched candidates, generating them inline on a miss.
+        """
+        turn_index = current["turn_index"]
+        if remaining <= 0 or turn_index + 1 >= max_rounds:
+            return None
+        question = await self.next_question(session_id, turn_index, answer, skipped)
+        if not question:
+            options = await generate_next_questions(next_question_vars(state, history_vars, current, max_rounds))
+            question = choose_question(options, answer, skipped)
+        if not question:
+            return None
+        return {
+            "turn_index": turn_index + 1,
+            "interviewer_name": interviewer_for_turn(state, turn_index + 1),
+            "question": question,
+        }
+
+    async def next_question(self, session_id: int, turn_index: int, answer: str, skipped: bool) -> str:
+        """The prefetched question following turn_index, or "" if none was started here or it failed."""
+        task = self._questions.pop((session_id, turn_index), None)
+        if task is None:
+            self.misses += 1
+            return ""
+        if task.done():
+            self.hits += 1
+        else:
+            self.waits += 1
+        try:
+            options = await task
+        except Exception as e:
+            logger.warning(f"[InterviewPrefetch] Prefetch failed for session {session_id} turn {turn_index}: {e}")
+            return ""
+        return choose_question(options, answer, skipped)
+
+    def evaluate(self, session_id: int, session: Dict, current: Dict, previous: List[Dict],
+                 vars_for_prompt: Dict[str, Any],
+                 on_delta: Optional[Callable[[str], Awaitable[None]]] = None,
+                 save: Optional[Callable[..., Awaitable[Any]]] = None,
+                 on_summary: Optional[Callable[[str, int, int], None]] = None) -> asyncio.Task:
+        """
+        Evaluate the answer to current in the background; the result is stored
+        on its turn row. on_delta streams the feedback summary as it is
+        generated; save(session_id, turn_index, feedback, penalty_seconds)
+        replaces the direct MockInterview.save_feedback call (the live
+        WebSocket session orders it after its own pending writes); on_summary
+        is passed on to interview_memory.schedule_update.
+        """
+        key = (session_id, current["turn_index"])
+        task = self._spawn(self._evaluate(
+            session_id, session, current, previous, vars_for_prompt, on_delta, save, on_summary,
+        ))
+        self._feedback[key] = task
+        task.add_done_callback(lambda _: self._feedback.pop(key, None))
+        return task
+
+    async def _evaluate(self, session_id: int, session: Dict, current: Dict, previous: List[Dict],
+                        vars_for_prompt: Dict[str, Any], on_delta, save, on_summary) -> Dict[str, Any]:
+        turn_index = current["turn_index"]
+        try:
+            if on_delta:
+                result = await stream_interview_evaluation(vars_for_prompt, on_delta)
+            else:
+                result = await evaluate_interview_answer(vars_for_prompt)
+        except Exception as e:
+            logger.warning(f"[InterviewPrefetch] Evaluation failed for session {session_id} turn {turn_index}: {e}")
+            result = {"feedback": dict(FEEDBACK_UNAVAILABLE), "penalty_seconds": 0, "penalty_reason": ""}
+
+        feedback = dict(result["feedback"], penalty_reason=result["penalty_reason"])
+        try:
+            if save:
+                await save(session_id, turn_index, feedback, result["penalty_seconds"])
+            else:
+                await asyncio.to_thread(
+                    MockInterview.save_feedback, session_id, turn_index, feedback, result["penalty_seconds"]
+                )
+        except Exception as e:
+            logger.error(f"[InterviewPrefetch] Saving feedback failed for session {session_id} turn {turn_index}: {e}")
+
+        current["feedback"] = feedback
+        interview_memory.schedule_update(session_id, session, previous + [current], on_saved=on_summary)
+        return {"feedback": feedback, "penalty_seconds": result["penalty_seconds"]}
+
+    def recover(self, session_id: int, session: Dict, turns: List[Dict]) -> List[asyncio.Task]:
+        """
+        Evaluations of turns answered over INTERVIEW_FEEDBACK_LOST_SECONDS ago
+        that still have no feedback: the task running here, or a new one when
+        the worker that ran it is gone. turns come from MockInterview.get_turns,
+        oldest first. save_feedback only fills empty feedback, so a slow
+        evaluation finishing elsewhere meanwhile is not overwritten.
+        """
+        first_needed = interview_memory.first_needed_turn(session)
+        max_rounds = int(session.get("max_rounds") or 5)
+        remaining = int(session.get("remaining_seconds") or 0)
+        tasks = []
+        for i, turn in enumerate(turns):
+            age = turn.get("answered_age_seconds")
+            if turn["feedback"] or age is None:
+                continue
+            task = self._feedback.get((session_id, turn["turn_index"]))
+            if task is not None:
+                tasks.append(task)
+                continue
+            if age < settings.INTERVIEW_FEEDBACK_LOST_SECONDS:
+                continue
+            previous = [t for t in turns[:i] if t["turn_index"] >= first_needed]
+            history_vars, _ = interview_memory.build(session, previous)
+            vars_for_prompt = answer_vars(
+                session["state_json"], history_vars, turn, turn["answer"], bool(turn.get("skipped")),
+                max_rounds, remaining,
+            )
+            logger.info(f"[InterviewPrefetch] Re-evaluating session {session_id} turn {turn['turn_index']}")
+            tasks.append(self.evaluate(session_id, session, turn, previous, vars_for_prompt))
+        return tasks
+
+    async def wait_feedback(self, session_id: int, turn_index: int, timeout: float) -> Optional[Dict[str, Any]]:
+        """Result of an evaluation running in this process, or None if there is none or it is still running."""
+        task = self._feedback.get((session_id, turn_index))
+        if task is None:
+            return None
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def drain(self, session_id: int, timeout: float):
+        """Wait for this process's pending evaluations of session_id, e.g. before the final report."""
+        pending = [t for (sid, _), t in self._feedback.items() if sid == session_id]
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "waits": self.waits,
+            "misses": self.misses,
+            "pending_questions": len(self._questions),
+            "pending_feedback": len(self._feedback),
+        }
+
+
+interview_prefetch = InterviewPrefetch()
@@ -0,0 +1,220 @@
+# backend/services/job_index.py
+
+import time
+import heapq
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from config import settings
+from models import Job, Roadmap
+from services.skill_canonical import skill_index, normalize_skill_key
+from services.job_matcher import MatchBatch, skill_keys
+
+logger = logging.getLogger("services.job_index")
+logger.setLevel(logging.INFO)
+
+
+def _title_tokens(text: Optional[str]) -> Set[str]:
+    return {normalize_skill_key(w) for w in (text or "").split() if len(normalize_skill_key(w)) > 1}
+
+
+class JobIndex:
+    """
+    In-memory inverted index over stored job postings: canonical skill key ->
+    job ids. Built from the jobs/job_requirements tables at startup and kept
+    current as services.job_search_cache stores new API results, so matching
+    a skill set against every recent posting is a few set lookups instead of
+    a live search.
+    """
+
+    def __init__(self, max_jobs: int, max_age_days: int):
+        self.max_jobs = max_jobs
+        self.max_age = max_age_days * 86400
+        self._postings: Dict[str, Set[int]] = {}
+        self._jobs: Dict[int, Dict[str, Any]] = {}
+        self._skills: Dict[int, Dict[str, str]] = {}  # job_id -> {skill key: display name}
+        self._title_postings: Dict[str, Set[int]] = {}
+        self._titles: Dict[int, Set[str]] = {}
+        self._added: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    def jobs(self) -> List[Dict]:
+        with self._lock:
+            return [dict(job) for job in self._jobs.values()]
+
+    def _remove(self, job_id: int):
+        for key in self._skills.pop(job_id, {}):
+            ids = self._postings.get(key)
+            if ids:
+                ids.discard(job_id)
+                if not ids:
+                    del self._postings[key]
+        for token in self._titles.pop(job_id, ()):
+            ids = self._title_postings.get(token)
+            if ids:
+                ids.discard(job_id)
+                if not ids:
+                    del self._title_postings[token]
+        self._jobs.pop(job_id, None)
+        self._added.pop(job_id, None)
+
+    def _prepare(self, jobs: Iterable[Dict], added_at: Optional[float]) -> List[tuple]:
+        """Index entries for stored postings; canonicalizing skills is the slow part, so no lock is held."""
+        now = time.time()
+        entries = []
+        for job in jobs or []:
+            job_id = job.get("job_id")
+            if not job_id:
+                continue
+            skills = {}
+            for name in job.get("required_skills") or []:
+                key = skill_index.canonical_key(name)
+                if key:
+                    skills.setdefault(key, name)
+            doc = {k: v for k, v in job.items() if k not in ("age_seconds", "matched_skills", "missing_skills", "match_percent")}
+            age = job.get("age_seconds")  # computed by MySQL, see ResourceCache._load_db
+            added = added_at or (now - age if age is not None else now)
+            entries.append((job_id, doc, skills, added, _title_tokens(job.get("role"))))
+        return entries
+
+    def add_many(self, jobs: Iterable[Dict], added_at: Optional[float] = None) -> int:
+        """Index stored postings (those with a job_id); re-adding a job replaces its entry."""
+        entries = self._prepare(jobs, added_at)
+        with self._lock:
+            for job_id, doc, skills, added, titles in entries:
+                self._remove(job_id)
+                self._jobs[job_id] = doc
+                self._skills[job_id] = skills
+                self._added[job_id] = added
+                self._titles[job_id] = titles
+                for key in skills:
+                    self._postings.setdefault(key, set()).add(job_id)
+                for token in titles:
+                    self._title_postings.setdefault(token, set()).add(job_id)
+
+            if len(self._jobs) > self.max_jobs:
+                for job_id in heapq.nsmallest(len(self._jobs) - self.max_jobs, self._added, key=self._added.get):
+                    self._remove(job_id)
+        return len(entries)
+
+    def prune(self) -> int:
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            expired = [job_id for job_id, ts in self._added.items() if ts < cutoff]
+            for job_id in expired:
+                self._remove(job_id)
+        return len(expired)
+
+    def load(self):
+        """(Re)build the index from postings fetched within JOB_INDEX_MAX_AGE_DAYS."""
+        try:
+            jobs = Job.get_recent(settings.JOB_INDEX_MAX_AGE_DAYS, self.max_jobs)
+        except Exception as e:
+            logger.warning(f"[JobIndex.load] DB load failed, starting empty: {e}")
+            return
+        # Build aside and swap, so readers never wait on the rebuild or see it half-filled.
+        fresh = JobIndex(self.max_jobs, 0)
+        fresh.add_many(jobs)
+        with self._lock:
+            self._postings, self._jobs, self._skills, self._added = (
+                fresh._postings, fresh._jobs, fresh._skills, fresh._added
+            )
+            self._title_postings, self._titles = fresh._title_postings, fresh._titles
+        self.loaded = True
+        logger.info(f"[JobIndex] Indexed {len(self._jobs)} jobs over {len(self._postings)} skills")
+
+    def match(
+        self,
+        skills: Iterable[str],
+        k: int = 10,
+        role: Optional[str] = None,
+        location: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Top-k stored jobs for a skill set. Candidates come from the skill and
+        title postings; job_matcher.MatchBatch scores them (idf from the whole
+        index) and a job whose title shares words with role gets a boost.
+        location, when given, filters on a substring match.
+        """
+        user_keys = skill_keys(skills)
+        role_tokens = _title_tokens(role)
+        where = (location or "").strip().lower()
+        cutoff = time.time() - self.max_age
+
+        with self._lock:
+            candidates: Set[int] = set()
+            for key in user_keys:
+                candidates |= self._postings.get(key, set())
+            for token in role_tokens:
+                candidates |= self._title_postings.get(token, set())
+            ids = sorted(
+                (job_id for job_id in candidates
+                 if self._added[job_id] >= cutoff
+                 and (not where or where in (self._jobs[job_id].get("location") or "").lower())),
+                key=self._added.get, reverse=True,
+            )
+            if not ids:
+                return []
+            postings = self._postings
+            batch = MatchBatch(
+                [{key: (name, 1) for key, name in self._skills[job_id].items()} for job_id in ids],
+                user_keys,
+                df=lambda key: len(postings.get(key, ())),
+                n_docs=len(self._jobs),
+            )
+            docs = [self._jobs[job_id] for job_id in ids]
+            titles = [self._titles[job_id] for job_id in ids]
+
+        boost = np.zeros(len(ids))
+        if role_tokens:
+            boost = 0.25 * np.asarray([len(role_tokens & t) for t in titles]) / len(role_tokens)
+        results = []
+        for j in batch.top(k, boost):
+            score = float(batch.scores[j] + boost[j])
+            if score <= 0:
+                break
+            job = dict(docs[j])
+            job["matched_skills"], job["missing_skills"] = batch.skills(j)
+            job["match_percent"] = round(float(batch.scores[j]) * 100, 2)
+            job["score"] = round(score, 4)
+            results.append(job)
+        return results
+
+
+job_index = JobIndex(
+    max_jobs=settings.JOB_INDEX_MAX_JOBS,
+    max_age_days=settings.JOB_INDEX_MAX_AGE_DAYS,
+)
+
+
+async def ingest_popular_roles(limit: Optional[int] = None) -> Dict[str, int]:
+    """
+    Pull postings for the most requested target roles through fetch_real_jobs,
+    which stores them (jobs, job_requirements) and feeds the index. Searches
+    still inside the job search cache TTL cost no API call.
+    """
+    from services.services_utils import fetch_real_jobs  # circular: services_utils -> job_search_cache -> job_index
+
+    roles = await asyncio.to_thread(Roadmap.popular_target_roles, limit or settings.JOB_INGEST_ROLES)
+    fetched = 0
+    for row in roles:
+        try:
+            jobs = await fetch_real_jobs(row["target_role"], limit=settings.JOB_SEARCH_FETCH_LIMIT)
+            fetched += sum(1 for job in jobs if job.get("job_id"))
+        except Exception as e:
+            logger.warning(f"[ingest_popular_roles] '{row['target_role']}' failed: {e}")
+    pruned = job_index.prune()
+    logger.info(f"[ingest_popular_roles] {len(roles)} roles, {fetched} postings, {pruned} expired, {len(job_index)} indexed")
+    return {"roles": len(roles), "postings": fetched, "expired": pruned, "indexed": len(job_index)}
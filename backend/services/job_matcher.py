@@ -0,0 +1,140 @@
+# backend/services/job_matcher.py
+
+import logging
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from services.skill_canonical import skill_index
+
+logger = logging.getLogger("services.job_matcher")
+logger.setLevel(logging.INFO)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# skill key -> (display name, term frequency)
+JobTerms = Dict[str, Tuple[str, int]]
+
+
+@lru_cache(maxsize=20000)
+def _text_terms(text: str, index_version: int) -> Tuple[Tuple[str, str, int], ...]:
+    # index_version only keys the cache: terms found before skill_index gained
+    # new entries are not reused after.
+    counts = Counter(skill_index.mentions(text))
+    return tuple((skill_index.canonical_key(name), name, n) for name, n in counts.items())
+
+
+def job_terms(job: Dict) -> JobTerms:
+    """Skills a posting mentions with counts: role + description text, plus its stored required_skills."""
+    terms: JobTerms = {}
+    text = f"{job.get('role') or ''} {job.get('description') or ''}"
+    for key, name, n in _text_terms(text, skill_index.version):
+        terms[key] = (name, n)
+    # Stored descriptions are truncated; required_skills came from the full text.
+    for name in job.get("required_skills") or []:
+        key = skill_index.canonical_key(name)
+        if key and key not in terms:
+            terms[key] = (name, 1)
+    return terms
+
+
+def skill_keys(skills: Iterable[str]) -> Set[str]:
+    keys = {skill_index.canonical_key(str(s or "")) for s in skills or []}
+    keys.discard("")
+    return keys
+
+
+class MatchBatch:
+    """
+    A batch of postings as a sparse (CSR) job x skill matrix over a shared
+    vocabulary, BM25-weighted, scored against a binary user skill vector in
+    one pass. score[j] is the share of job j's skill weight the user covers.
+
+    df/n_docs override the batch statistics, e.g. with corpus-wide document
+    frequencies from services.job_index when the batch is only a candidate set.
+    """
+
+    def __init__(
+        self,
+        docs: List[JobTerms],
+        user_keys: Set[str],
+        df: Optional[Callable[[str], int]] = None,
+        n_docs: Optional[int] = None,
+    ):
+        self.docs = docs
+        self.user_keys = user_keys
+        vocab: Dict[str, int] = {}
+        indptr, indices, tf = [0], [], []
+        for terms in docs:
+            for key, (_, n) in terms.items():
+                indices.append(vocab.setdefault(key, len(vocab)))
+                tf.append(n)
+            indptr.append(len(indices))
+
+        n = len(docs)
+        self.vocab = vocab
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        tf_arr = np.asarray(tf, dtype=np.float32)
+        self.rows = np.repeat(np.arange(n), np.diff(self.indptr))
+
+        if df is not None:
+            keys = list(vocab)
+            df_arr = np.asarray([max(df(k), 1) for k in keys], dtype=np.float32)
+            total = float(max(n_docs or n, 1))
+        else:
+            df_arr = np.bincount(self.indices, minlength=len(vocab)).astype(np.float32)
+            total = float(n)
+        idf = np.log1p((total - df_arr + 0.5) / (df_arr + 0.5)) if len(vocab) else np.zeros(0, np.float32)
+
+        doc_len = np.bincount(self.rows, weights=tf_arr, minlength=n)
+        avg_len = doc_len[doc_len > 0].mean() if (doc_len > 0).any() else 1.0
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len[self.rows] / avg_len)
+        self.weights = idf[self.indices] * tf_arr * (BM25_K1 + 1) / (tf_arr + norm)
+
+        query = np.zeros(len(vocab), dtype=np.float32)
+        hits = [vocab[k] for k in user_keys if k in vocab]
+        query[hits] = 1.0
+        self.hit = query[self.indices] > 0
+
+        covered = np.bincount(self.rows, weights=self.weights * self.hit, minlength=n)
+        weight = np.bincount(self.rows, weights=self.weights, minlength=n)
+        self.overlap = np.bincount(self.rows, weights=self.hit, minlength=n)
+        self.scores = np.divide(covered, weight, out=np.zeros(n), where=weight > 0)
+
+    def skills(self, j: int) -> Tuple[List[str], List[str]]:
+        """(matched, missing) skill names for job j, most important first."""
+        lo, hi = self.indptr[j], self.indptr[j + 1]
+        names = [name for name, _ in self.docs[j].values()]
+        order = np.argsort(-self.weights[lo:hi], kind="stable")
+        hit = self.hit[lo:hi]
+        matched = [names[i] for i in order if hit[i]]
+        missing = [names[i] for i in order if not hit[i]]
+        return matched, missing
+
+    def top(self, k: Optional[int] = None, boost: Optional[np.ndarray] = None) -> List[int]:
+        """Indices of the k best jobs: by score (+ boost), then skill overlap, then input order."""
+        score = self.scores + boost if boost is not None else self.scores
+        order = np.lexsort((np.arange(len(score)), -self.overlap, -score))
+        return order[:k].tolist() if k is not None else order.tolist()
+
+
+def rank_jobs(jobs: List[Dict], skills: Iterable[str], k: Optional[int] = None) -> List[Dict]:
+    """
+    Rank postings for a skill set and annotate the top k (all by default) in
+    place with matched_skills, missing_skills (what the job asks for that the
+    user lacks) and match_percent.
+    """
+    if not jobs:
+        return []
+    batch = MatchBatch([job_terms(j) for j in jobs], skill_keys(skills))
+    ranked = []
+    for j in batch.top(k):
+        job = jobs[j]
+        job["matched_skills"], job["missing_skills"] = batch.skills(j)
+        job["match_percent"] = round(float(batch.scores[j]) * 100, 2)
+        ranked.append(job)
+    return ranked
@@ -0,0 +1,170 @@
+# backend/services/job_search_cache.py
+
+import copy
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from config import settings
+from models import Job
+from services.job_index import job_index
+
+logger = logging.getLogger("services.job_search_cache")
+logger.setLevel(logging.INFO)
+
+
+def _norm(value: Optional[str]) -> str:
+    return " ".join((value or "").lower().split())
+
+
+def job_query_key(query: str, location: Optional[str]) -> str:
+    return hashlib.sha1(f"{_norm(query)}|{_norm(location)}".encode("utf-8")).hexdigest()
+
+
+class JobSearchCache:
+    """
+    Cache for job search API results keyed by normalized (query, location):
+    an in-process LRU in front of the job_searches/jobs tables. Results newer
+    than the TTL are served directly; results within the stale window are
+    served while a background refresh runs; older ones are fetched inline.
+    Concurrent fetches of the same key share one API call.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, stale_seconds: float):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.stale = stale_seconds
+        self._lru: "OrderedDict[str, Tuple[List[Dict], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0, "db_hits": 0, "stale_served": 0, "coalesced": 0,
+            "api_calls": 0, "api_failures": 0, "refreshes": 0,
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        s = dict(self.stats)
+        saved = s["memory_hits"] + s["db_hits"] + s["stale_served"] + s["coalesced"]
+        requests = saved + s["api_calls"] - s["refreshes"]
+        s["api_calls_saved"] = saved
+        s["hit_ratio"] = round(saved / requests, 3) if requests > 0 else 0.0
+        return s
+
+    def _get_memory(self, key: str) -> Optional[Tuple[List[Dict], float]]:
+        with self._lock:
+            hit = self._lru.get(key)
+            if hit:
+                self._lru.move_to_end(key)
+            return hit
+
+    def _put_memory(self, key: str, jobs: List[Dict], fetched_at: float):
+        with self._lock:
+            self._lru[key] = (jobs, fetched_at)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    async def _load_db(self, key: str) -> Optional[Tuple[List[Dict], float]]:
+        try:
+            row = await asyncio.to_thread(Job.load_search, key)
+        except Exception as e:
+            logger.warning(f"[JobSearchCache] DB lookup failed: {e}")
+            return None
+        if not row or not row["jobs"]:
+            return None
+        age = row.get("age_seconds")  # computed by MySQL, see ResourceCache._load_db
+        return row["jobs"], (time.time() - age if age is not None else 0.0)
+
+    async def _store(self, key: str, query: str, location: Optional[str], jobs: List[Dict]):
+        try:
+            await asyncio.to_thread(Job.save_search_results, key, query, location, jobs)
+            await asyncio.to_thread(job_index.add_many, jobs)
+        except Exception as e:
+            logger.warning(f"[JobSearchCache] DB store failed: {e}")
+        self._put_memory(key, jobs, time.time())
+
+    async def _fetch(self, key: str, query: str, location: Optional[str], fetcher) -> List[Dict]:
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            return copy.deepcopy(await asyncio.shield(pending))
+
+        future = asyncio.get_running_loop().create_future()
+        # Retrieve the exception even when nobody else was waiting on it.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            self.stats["api_calls"] += 1
+            jobs = await fetcher()
+            if jobs:
+                await self._store(key, query, location, jobs)
+            future.set_result(jobs or [])
+            return copy.deepcopy(jobs or [])
+        except Exception as e:
+            self.stats["api_failures"] += 1
+            future.set_exception(e)
+            raise
+        finally:
+            if not future.done():
+                # The fetching request was cancelled; fail waiters instead of hanging them.
+                future.set_exception(RuntimeError("job search cancelled"))
+            self._inflight.pop(key, None)
+
+    async def _refresh(self, key: str, query: str, location: Optional[str], fetcher):
+        try:
+            self.stats["refreshes"] += 1
+            await self._fetch(key, query, location, fetcher)
+        except Exception as e:
+            logger.warning(f"[JobSearchCache] Background refresh failed for '{query}': {e}")
+
+    def _schedule_refresh(self, key: str, query: str, location: Optional[str], fetcher):
+        if key in self._inflight:
+            return
+        task = asyncio.get_running_loop().create_task(self._refresh(key, query, location, fetcher))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def search(
+        self, query: str, location: Optional[str], fetcher: Callable[[], Awaitable[List[Dict]]]
+    ) -> List[Dict]:
+        """Cached results for (query, location); fetcher() performs the live API call."""
+        key = job_query_key(query, location)
+        hit = self._get_memory(key)
+        if hit:
+            source = "memory_hits"
+        else:
+            hit = await self._load_db(key)
+            source = "db_hits"
+            if hit:
+                self._put_memory(key, *hit)
+
+        if hit:
+            jobs, fetched_at = hit
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                self.stats[source] += 1
+                return copy.deepcopy(jobs)
+            if age < self.ttl + self.stale:
+                self.stats["stale_served"] += 1
+                self._schedule_refresh(key, query, location, fetcher)
+                return copy.deepcopy(jobs)
+
+        try:
+            return await self._fetch(key, query, location, fetcher)
+        except Exception:
+            if hit:
+                # Past the stale window, but old postings beat a fallback link.
+                return copy.deepcopy(hit[0])
+            raise
+
+
+job_search_cache = JobSearchCache(
+    max_entries=settings.JOB_SEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.JOB_SEARCH_TTL_HOURS * 3600,
+    stale_seconds=settings.JOB_SEARCH_STALE_HOURS * 3600,
+)
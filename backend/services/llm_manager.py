@@ -3,7 +3,7 @@
 import sys
 import asyncio
 import logging
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple
 from pydantic import BaseModel
 
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -12,6 +12,8 @@ from langchain_core.messages import HumanMessage
 
 from config import settings
 from services.services_utils import is_model_on_cooldown, set_model_cooldown
+from services.prompt_budget import budget_variables
+from services.prompt_templates import get_template
 
 logger = logging.getLogger("services.llm_manager")
 logger.setLevel(logging.INFO)
@@ -80,15 +82,30 @@ class LLMManager:
             logger.error(f"[LLM] ❌ Failed to init HuggingFace: {e}")
             return None
 
+    def _render(self, prompt: str, variables: Optional[Dict[str, Any]], model_name: str) -> str:
+        """Substitute variables after fitting them to model_name's token budget."""
+        if not variables:
+            return prompt
+        template = get_template(prompt)
+        return template.render(budget_variables(template, variables, model_name))
+
     async def _call(self, llm, prompt: str) -> str:
         try:
-            safe_prompt = prompt[:30000]
-            result = await llm.ainvoke([HumanMessage(content=safe_prompt)])
+            result = await llm.ainvoke([HumanMessage(content=prompt)])
             text = getattr(result, "content", None) or getattr(result, "text", None)
             return str(text or "").strip()
         except Exception as e:
             raise RuntimeError(str(e))
 
+    def _candidates(self, preference: str) -> List[Tuple[str, Any]]:
+        model_map = {
+            "Gemini": self.gemini_client,
+            "HuggingFace": self.hf_client,
+        }
+        order = [(preference, model_map.get(preference))] if preference in model_map else []
+        order += [(k, v) for k, v in model_map.items() if (k, v) not in order]
+        return order
+
     async def run_llm(
         self,
         prompt: str,
@@ -98,19 +115,7 @@ class LLMManager:
         response_schema: Optional[BaseModel] = None,
     ) -> Tuple[str, str]:
 
-        if variables:
-            for k, v in variables.items():
-                val = str(v) if v is not None else ""
-                prompt = prompt.replace("{" + k + "}", val)
-
-        model_map = {
-            "Gemini": self.gemini_client,
-            "HuggingFace": self.hf_client,
-        }
-        order = [(preference, model_map.get(preference))] if preference in model_map else []
-        order += [(k, v) for k, v in model_map.items() if (k, v) not in order]
-
-        for name, client in order:
+        for name, client in self._candidates(preference):
             if not client:
                 continue
             if is_model_on_cooldown(name):
@@ -123,9 +128,11 @@ class LLMManager:
                 except Exception:
                     use_client = client
 
+            rendered = self._render(prompt, variables, name)
+
             for attempt in range(1, retries + 1):
                 try:
-                    res = await self._call(use_client, prompt)
+                    res = await self._call(use_client, rendered)
                     return res, name
                 except Exception as e:
                     err = str(e).lower()
@@ -144,6 +151,44 @@ class LLMManager:
 
         raise RuntimeError("All available models failed.")
 
+    async def stream_llm(
+        self,
+        prompt: str,
+        variables: Optional[Dict[str, Any]] = None,
+        preference: str = "auto",
+    ) -> AsyncIterator[str]:
+        """
+        Yield the response text as the model produces it. Falls over to the
+        next model only while nothing has been yielded; a failure mid-stream
+        is raised to the caller.
+        """
+        for name, client in self._candidates(preference):
+            if not client:
+                continue
+            if is_model_on_cooldown(name):
+                continue
+
+            rendered = self._render(prompt, variables, name)
+            started = False
+            try:
+                async for chunk in client.astream([HumanMessage(content=rendered)]):
+                    text = getattr(chunk, "content", None)
+                    if isinstance(text, list):
+                        text = "".join(p if isinstance(p, str) else str(p.get("text", "")) for p in text)
+                    if text:
+                        started = True
+                        yield str(text)
+                return
+            except Exception as e:
+                err = str(e).lower()
+                logger.warning(f"[LLMManager] ⚠️ {name} stream failed: {err}")
+                if any(p in err for p in QUOTA_ERRORS):
+                    set_model_cooldown(name, 600)
+                if started:
+                    raise RuntimeError(str(e))
+
+        raise RuntimeError("All available models failed.")
+
 llm_manager = LLMManager()
 
 async def run_llm(prompt: str, variables: Optional[Dict[str, Any]] = None, preference: str = "auto") -> str:
@@ -152,4 +197,9 @@ async def run_llm(prompt: str, variables: Optional[Dict[str, Any]] = None, prefe
         return output
     except Exception as e:
         logger.error(f"[run_llm] ❌ Error: {e}")
-        return ""
\ No newline at end of file
+        return ""
+
+
+async def stream_llm(prompt: str, variables: Optional[Dict[str, Any]] = None, preference: str = "auto") -> AsyncIterator[str]:
+    async for chunk in llm_manager.stream_llm(prompt, variables, preference):
+        yield chunk
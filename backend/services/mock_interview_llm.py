@@ -1,13 +1,16 @@
 # backend/services/mock_interview_llm.py
 
+import re
 import logging
 import json
-from typing import Dict, Any, List
+from typing import Awaitable, Callable, Dict, Any, List, Optional
 
-from services.llm_manager import run_llm
+from services.llm_manager import run_llm, stream_llm
 from services.prompts import (
     PROMPT_INTERVIEW_START,
     PROMPT_INTERVIEW_ANSWER,
+    PROMPT_INTERVIEW_EVALUATE,
+    PROMPT_INTERVIEW_NEXT_QUESTION,
     PROMPT_INTERVIEW_REPORT,
 )
 from services.services_utils import safe_json_load
@@ -103,6 +106,18 @@ async def process_interview_answer(vars_for_prompt: Dict[str, Any]) -> Dict[str,
     if not isinstance(data, dict):
         data = {}
 
+    next_question = data.get("next_question") or ""
+    should_continue = bool(data.get("should_continue", False))
+
+    return {
+        "feedback": _normalize_feedback(data),
+        "next_question": next_question,
+        "should_continue": should_continue,
+        **_normalize_penalty(data),
+    }
+
+
+def _normalize_feedback(data: Dict[str, Any]) -> Dict[str, Any]:
     feedback = data.get("feedback") or {}
     if not isinstance(feedback, dict):
         feedback = {}
@@ -124,10 +139,10 @@ async def process_interview_answer(vars_for_prompt: Dict[str, Any]) -> Dict[str,
     except Exception:
         score = 0
     feedback["score"] = max(0, min(10, score))
+    return feedback
 
-    next_question = data.get("next_question") or ""
-    should_continue = bool(data.get("should_continue", False))
 
+def _normalize_penalty(data: Dict[str, Any]) -> Dict[str, Any]:
     control = data.get("control") or {}
     if not isinstance(control, dict):
         control = {}
@@ -139,13 +154,130 @@ async def process_interview_answer(vars_for_prompt: Dict[str, Any]) -> Dict[str,
         penalty_seconds = 0
     penalty_seconds = max(0, min(180, penalty_seconds))  # cap at 3 minutes/turn
     penalty_reason = str(control.get("penalty_reason") or "")
+    return {"penalty_seconds": penalty_seconds, "penalty_reason": penalty_reason}
+
+
+# ---------------------- SPLIT EVALUATION / NEXT QUESTION ----------------------
+
+
+async def evaluate_interview_answer(vars_for_prompt: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Feedback and penalty for one answer, without choosing the next question
+    (see generate_next_questions). Same shape as process_interview_answer
+    minus next_question / should_continue.
+    """
+    raw = await run_llm(PROMPT_INTERVIEW_EVALUATE, variables=vars_for_prompt)
+    data = safe_json_load(raw, mode="generic")
+    if not isinstance(data, dict):
+        data = {}
+    return {"feedback": _normalize_feedback(data), **_normalize_penalty(data)}
+
+
+_SUMMARY_START = re.compile(r'"summary"\s*:\s*"')
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}
 
+
+def _hex4(digits: str) -> Optional[int]:
+    try:
+        return int(digits, 16)
+    except ValueError:
+        return None
+
+
+class SummaryStream:
+    """
+    Pulls the feedback.summary string out of a JSON response while it is
+    still streaming, so the readable part can be shown before the JSON is
+    complete. feed() returns the newly decoded summary text.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos: Optional[int] = None
+        self._done = False
+
+    def feed(self, chunk: str) -> str:
+        self.text += chunk
+        if self._done:
+            return ""
+        if self._pos is None:
+            m = _SUMMARY_START.search(self.text)
+            if not m:
+                return ""
+            self._pos = m.end()
+
+        buf, i, out = self.text, self._pos, []
+        while i < len(buf):
+            c = buf[i]
+            if c == '"':
+                self._done = True
+                break
+            if c == "\\":
+                if i + 1 >= len(buf):
+                    break
+                nxt = buf[i + 1]
+                if nxt == "u":
+                    if i + 6 > len(buf):
+                        break
+                    code = _hex4(buf[i + 2:i + 6])
+                    if code is not None and 0xD800 <= code < 0xDC00:
+                        # High surrogate: wait for its low half and join the pair
+                        if i + 8 > len(buf) or (buf[i + 6:i + 8] == "\\u" and i + 12 > len(buf)):
+                            break
+                        low = _hex4(buf[i + 8:i + 12]) if buf[i + 6:i + 8] == "\\u" else None
+                        if low is not None and 0xDC00 <= low < 0xE000:
+                            out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                            i += 12
+                            continue
+                    if code is not None:
+                        out.append(chr(code))
+                    i += 6
+                    continue
+                out.append(_ESCAPES.get(nxt, nxt))
+                i += 2
+                continue
+            out.append(c)
+            i += 1
+        self._pos = i
+        return "".join(out)
+
+
+async def stream_interview_evaluation(
+    vars_for_prompt: Dict[str, Any],
+    on_delta: Callable[[str], Awaitable[None]],
+) -> Dict[str, Any]:
+    """
+    evaluate_interview_answer, streamed: on_delta receives the feedback
+    summary as it is generated. Falls back to the non-streaming call if the
+    stream fails before producing anything usable.
+    """
+    stream = SummaryStream()
+    try:
+        async for chunk in stream_llm(PROMPT_INTERVIEW_EVALUATE, variables=vars_for_prompt):
+            delta = stream.feed(chunk)
+            if delta:
+                await on_delta(delta)
+    except Exception as e:
+        logger.warning(f"[stream_interview_evaluation] stream failed: {e}")
+
+    data = safe_json_load(stream.text, mode="generic") if stream.text else None
+    if not isinstance(data, dict) or not data.get("feedback"):
+        return await evaluate_interview_answer(vars_for_prompt)
+    return {"feedback": _normalize_feedback(data), **_normalize_penalty(data)}
+
+
+async def generate_next_questions(vars_for_prompt: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Candidate next questions written before the current answer is known:
+    {"follow_up": ..., "new_topic": ...}; either may be "" if the LLM failed.
+    """
+    raw = await run_llm(PROMPT_INTERVIEW_NEXT_QUESTION, variables=vars_for_prompt)
+    data = safe_json_load(raw, mode="generic")
+    if not isinstance(data, dict):
+        data = {}
     return {
-        "feedback": feedback,
-        "next_question": next_question,
-        "should_continue": should_continue,
-        "penalty_seconds": penalty_seconds,
-        "penalty_reason": penalty_reason,
+        "follow_up": str(data.get("follow_up") or "").strip(),
+        "new_topic": str(data.get("new_topic") or "").strip(),
     }
 
 
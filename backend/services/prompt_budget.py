@@ -0,0 +1,166 @@
+# backend/services/prompt_budget.py
+
+import json
+import math
+import re
+import logging
+from typing import Any, Dict, Iterable, Optional, Union
+
+from config import settings
+from services.prompt_templates import PromptTemplate, get_template
+
+logger = logging.getLogger("services.prompt_budget")
+logger.setLevel(logging.INFO)
+
+
+# Rough per-provider tokenizer ratios and limits. Gemini's SentencePiece
+# vocabulary averages ~4 chars/token on English prose, Mistral's ~3.5.
+# input_budget is a soft cap we aim for to keep calls cheap; context is the
+# hard window shared by prompt and completion.
+MODEL_PROFILES: Dict[str, Dict[str, float]] = {
+    "Gemini": {"chars_per_token": 4.0, "context": 1_048_576, "max_output": 8192},
+    "HuggingFace": {"chars_per_token": 3.5, "context": 32_768, "max_output": 2000},
+}
+_DEFAULT_PROFILE = {"chars_per_token": 3.5, "context": 32_768, "max_output": 2000}
+
+# Variables whose content is user-supplied and safe to compress/trim. Anything
+# else (role names, skill lists, JSON schema instructions in the template) is
+# treated as fixed and always sent in full.
+COMPRESSIBLE_VARIABLES = ("text", "history_json", "history_summary")
+
+_WS_RE = re.compile(r"[ \t\f\v]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+
+def _profile(model: Optional[str]) -> Dict[str, float]:
+    return MODEL_PROFILES.get(model or "", _DEFAULT_PROFILE)
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Estimate the token count of text for the given provider."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / _profile(model)["chars_per_token"])
+
+
+def input_token_budget(model: Optional[str] = None, output_tokens: Optional[int] = None) -> int:
+    """Tokens available for the prompt once the completion is reserved."""
+    profile = _profile(model)
+    reserve = int(output_tokens or profile["max_output"])
+    return max(0, min(settings.LLM_INPUT_TOKEN_BUDGET, int(profile["context"]) - reserve))
+
+
+def compress_text(text: str) -> str:
+    """Collapse whitespace and drop repeated lines (PDF headers/footers, copy-paste dupes)."""
+    if not text:
+        return ""
+    seen = set()
+    lines = []
+    for line in text.replace("\r", "\n").split("\n"):
+        line = _WS_RE.sub(" ", line).strip()
+        if not line:
+            if lines and lines[-1] != "":
+                lines.append("")
+            continue
+        key = line.lower()
+        if len(key) > 3 and key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+
+def compact_history_json(history_json: str, keep_last: int = 3, max_field_chars: int = 240) -> str:
+    """
+    Shrink an interview history (JSON list of turns): the last keep_last turns
+    stay verbatim, older ones keep only the question, a clipped answer and the score.
+    """
+    try:
+        turns = json.loads(history_json)
+    except Exception:
+        return history_json
+    if not isinstance(turns, list) or len(turns) <= keep_last:
+        return history_json
+
+    def clip(value: Any) -> str:
+        value = " ".join(str(value or "").split())
+        return value if len(value) <= max_field_chars else value[:max_field_chars] + "…"
+
+    older, recent = turns[:-keep_last], turns[-keep_last:]
+    compacted = []
+    for t in older:
+        if not isinstance(t, dict):
+            continue
+        feedback = t.get("feedback") if isinstance(t.get("feedback"), dict) else {}
+        compacted.append({
+            "interviewer_name": t.get("interviewer_name"),
+            "question": clip(t.get("question")),
+            "answer": clip(t.get("answer")),
+            "score": feedback.get("score"),
+        })
+    return json.dumps(compacted + recent, ensure_ascii=False, separators=(",", ":"))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """Cut text to max_tokens, preferring a line boundary over a mid-word cut."""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    max_chars = int(max_tokens * _profile(model)["chars_per_token"])
+    cut = text[:max_chars]
+    nl = cut.rfind("\n")
+    if nl > max_chars * 0.8:
+        cut = cut[:nl]
+    return cut.rstrip()
+
+
+def _compress_value(key: str, value: str) -> str:
+    if key == "history_json":
+        return compact_history_json(value)
+    return compress_text(value)
+
+
+def budget_variables(
+    template: Union[str, PromptTemplate],
+    variables: Optional[Dict[str, Any]],
+    model: Optional[str] = None,
+    output_tokens: Optional[int] = None,
+    compressible: Iterable[str] = COMPRESSIBLE_VARIABLES,
+) -> Dict[str, str]:
+    """
+    Return stringified variables whose rendered prompt fits the model's input
+    budget. The template (instructions + JSON schema) and non-compressible
+    variables are always kept whole; compressible ones are compressed first and
+    then trimmed proportionally to share whatever budget is left.
+    """
+    if not isinstance(template, PromptTemplate):
+        template = get_template(template)
+    values = {k: ("" if v is None else str(v)) for k, v in (variables or {}).items()}
+    compressible = [k for k in compressible if values.get(k) and k in template.variables]
+    if not compressible:
+        return values
+
+    for k in compressible:
+        values[k] = _compress_value(k, values[k])
+
+    uses = {k: template.counts.get(k, 0) for k in values}
+    fixed_tokens = count_tokens(template.static_text, model) + sum(
+        count_tokens(v, model) * uses[k] for k, v in values.items() if k not in compressible
+    )
+    available = input_token_budget(model, output_tokens) - fixed_tokens
+
+    wanted = {k: count_tokens(values[k], model) * uses[k] for k in compressible}
+    total_wanted = sum(wanted.values())
+    if total_wanted <= available:
+        return values
+
+    if available <= 0:
+        logger.warning(f"[prompt_budget] Fixed prompt parts exceed budget for {model}; dropping variable text.")
+        return {**values, **{k: "" for k in compressible}}
+
+    for k in compressible:
+        share = int(available * wanted[k] / total_wanted) // uses[k]
+        values[k] = truncate_to_tokens(values[k], share, model)
+    logger.info(
+        f"[prompt_budget] Trimmed {', '.join(compressible)} from ~{total_wanted} to ~{available} tokens for {model}"
+    )
+    return values
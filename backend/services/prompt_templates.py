@@ -0,0 +1,122 @@
+# backend/services/prompt_templates.py
+
+import hashlib
+import json
+import re
+import logging
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from services import prompts
+
+logger = logging.getLogger("services.prompt_templates")
+logger.setLevel(logging.INFO)
+
+# Only {identifier} counts as a placeholder, so JSON examples such as
+# `{ "skills": [...] }` inside the prompts are left untouched.
+_PLACEHOLDER_RE = re.compile(r"\{([a-zA-Z_][a-zA-Z0-9_]*)\}")
+
+# Placeholders that are part of the instructions themselves (e.g. URL
+# patterns shown to the model) and are never substituted.
+TEMPLATE_LITERALS: Dict[str, Tuple[str, ...]] = {
+    "PROMPT_ROADMAP_NETWORKING": ("slug", "role"),
+}
+
+
+class PromptTemplate:
+    """A prompt parsed once into literal segments and placeholder slots."""
+
+    __slots__ = ("name", "text", "version", "variables", "counts", "static_text", "_parts")
+
+    def __init__(self, name: Optional[str], text: str, literals: Tuple[str, ...] = ()):
+        self.name = name
+        self.text = text
+        self.version = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+        parts: List[Tuple[bool, str]] = []
+        counts: Dict[str, int] = {}
+        static: List[str] = []
+        pos = 0
+        for m in _PLACEHOLDER_RE.finditer(text):
+            key = m.group(1)
+            if key in literals:
+                continue
+            if m.start() > pos:
+                parts.append((False, text[pos:m.start()]))
+                static.append(text[pos:m.start()])
+            parts.append((True, key))
+            counts[key] = counts.get(key, 0) + 1
+            pos = m.end()
+        if pos < len(text):
+            parts.append((False, text[pos:]))
+            static.append(text[pos:])
+
+        self._parts = tuple(parts)
+        self.counts = counts
+        self.variables: FrozenSet[str] = frozenset(counts)
+        self.static_text = "".join(static)
+
+    def check(self, variables: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """Return (missing, extra) variable names for this template."""
+        provided = set(variables or {})
+        return sorted(self.variables - provided), sorted(provided - self.variables)
+
+    def render(self, variables: Optional[Dict[str, Any]] = None, strict: bool = False) -> str:
+        """
+        Substitute all placeholders in a single pass. Missing variables raise
+        in strict mode and are otherwise left as `{name}`; extras are ignored.
+        """
+        variables = variables or {}
+        missing, extra = self.check(variables)
+        if missing:
+            if strict:
+                raise KeyError(f"Prompt {self.name or self.version} missing variables: {', '.join(missing)}")
+            logger.warning(f"[PromptTemplate] {self.name or self.version} missing variables: {', '.join(missing)}")
+        if extra:
+            logger.debug(f"[PromptTemplate] {self.name or self.version} ignoring extra variables: {', '.join(extra)}")
+
+        out = []
+        for is_var, value in self._parts:
+            if not is_var:
+                out.append(value)
+            elif value in variables:
+                v = variables[value]
+                out.append("" if v is None else str(v))
+            else:
+                out.append("{" + value + "}")
+        return "".join(out)
+
+    def cache_key(self, variables: Optional[Dict[str, Any]] = None) -> str:
+        """Stable key over the template version and the variables it actually uses."""
+        used = {k: ("" if v is None else str(v)) for k, v in (variables or {}).items() if k in self.variables}
+        payload = json.dumps(used, sort_keys=True, ensure_ascii=False)
+        return f"{self.name or 'adhoc'}:{self.version}:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+
+def _build_registry() -> Dict[str, PromptTemplate]:
+    registry = {}
+    for name, value in vars(prompts).items():
+        if isinstance(value, str) and "PROMPT" in name and name.isupper():
+            registry[name] = PromptTemplate(name, value, TEMPLATE_LITERALS.get(name, ()))
+    return registry
+
+
+TEMPLATES: Dict[str, PromptTemplate] = _build_registry()
+_BY_TEXT: Dict[str, PromptTemplate] = {t.text: t for t in TEMPLATES.values()}
+
+
+@lru_cache(maxsize=64)
+def _compile_adhoc(text: str) -> PromptTemplate:
+    return PromptTemplate(None, text)
+
+
+def get_template(prompt: str) -> PromptTemplate:
+    """Look up a registered template by name or text, compiling ad-hoc prompts on demand."""
+    tpl = TEMPLATES.get(prompt) or _BY_TEXT.get(prompt)
+    if tpl:
+        return tpl
+    return _compile_adhoc(prompt)
+
+
+def render_prompt(prompt: str, variables: Optional[Dict[str, Any]] = None, strict: bool = False) -> str:
+    return get_template(prompt).render(variables, strict=strict)
@@ -579,7 +579,10 @@ Current turn:
 - Session duration (minutes): {duration_minutes}
 - Was the question skipped? {skipped}
 
-History of previous Q&A (JSON, most recent last):
+Summary of earlier rounds (may be empty):
+{history_summary}
+
+Most recent previous Q&A (JSON, most recent last):
 {history_json}
 
 Current question:
@@ -604,7 +607,7 @@ Your tasks:
      round >= max_rounds, usually set should_continue = false.
 4. Propose the NEXT QUESTION (if should_continue is true):
    - Progressively cover behavior, technical understanding, and role fit.
-   - Avoid repeating previous questions from history_json.
+   - Avoid repeating questions or topics from the summary or history_json.
 5. Apply **Penalty System P2 (dynamic)**:
    - If skipped == true:
        * penalty_seconds between 45 and 90.
@@ -637,6 +640,115 @@ Return JSON ONLY, no commentary, with this exact shape:
 """
 
 
+PROMPT_INTERVIEW_EVALUATE = """
+You are part of a mock interview panel evaluating a candidate answer.
+The next question has already been chosen; only judge this answer.
+
+Context:
+- Target role: {target_role}
+- Candidate level: {career_level}
+- Difficulty: {difficulty}
+- Active interviewer name: {interviewer_name}
+- Round number: {round} out of max {max_rounds}
+- Was the question skipped? {skipped}
+
+Summary of earlier rounds (may be empty):
+{history_summary}
+
+Most recent previous Q&A (JSON, most recent last):
+{history_json}
+
+Current question:
+{question}
+
+Candidate answer:
+{answer}
+
+Your tasks:
+1. Evaluate the answer for technical correctness, depth and clarity,
+   structure / communication and role alignment (for {target_role}).
+2. Provide **concise but specific** feedback:
+   - A short summary of how well they answered.
+   - 3–5 key strengths (if any).
+   - 3–5 concrete areas to improve (very practical).
+   - A numeric score from 1–10 (1 = very weak, 10 = outstanding).
+3. Apply **Penalty System P2 (dynamic)**:
+   - Skipped, off-topic, empty or extremely weak answer: penalty_seconds 45–90.
+   - Partially correct but missing important parts: penalty_seconds 15–45.
+   - Strong and well-structured: penalty_seconds = 0.
+   - Never exceed 180 seconds penalty in one turn.
+
+STRICT OUTPUT:
+Return JSON ONLY, no commentary, with this exact shape:
+
+{
+  "feedback": {
+    "summary": "2–4 sentences summarizing performance on THIS question.",
+    "strengths": ["bullet", "points"],
+    "improvements": ["bullet", "points"],
+    "score": 0
+  },
+  "control": {
+    "penalty_seconds": 0,
+    "penalty_reason": "short explanation for UI, e.g. 'Skipped question' or ''"
+  }
+}
+"""
+
+
+PROMPT_INTERVIEW_NEXT_QUESTION = """
+You are running a mock interview for a {target_role} candidate
+({career_level}, difficulty: {difficulty}). The candidate is answering the
+current question right now; prepare what {next_interviewer_name} asks next.
+
+Interviewers (JSON): {interviewers_json}
+Round {next_round} of max {max_rounds}.
+
+Summary of earlier rounds (may be empty):
+{history_summary}
+
+Most recent previous Q&A (JSON, most recent last):
+{history_json}
+
+Current question (asked by {interviewer_name}):
+{question}
+
+Write two candidate next questions in {next_interviewer_name}'s style:
+- "follow_up": digs deeper into the current question's topic, used if the
+  candidate answers it reasonably.
+- "new_topic": moves to a topic not covered yet (behaviour, technical depth
+  or role fit), used if the candidate skips or struggles.
+Never repeat a question or topic from the summary or history.
+
+STRICT OUTPUT:
+Return JSON ONLY, no commentary:
+
+{
+  "follow_up": "question text",
+  "new_topic": "question text"
+}
+"""
+
+
+PROMPT_INTERVIEW_SUMMARY = """
+You maintain the running memory of a mock interview for a {target_role}
+candidate ({career_level}). The panel only sees this summary for older
+rounds, so it must keep what matters for choosing and judging later questions.
+
+Current summary (may be empty):
+{history_summary}
+
+Rounds to fold in (JSON, oldest first):
+{history_json}
+
+Write the updated summary as plain text, at most 150 words:
+- Topics and questions already covered (one short phrase each).
+- Recurring strengths and weaknesses in the candidate's answers.
+- Score trend (e.g. "5, 6, 4").
+No preamble, no JSON, no markdown headings.
+"""
+
+
 PROMPT_INTERVIEW_REPORT = """
 You are an expert interviewer and career coach. You must generate a
 final mock interview report in a structured JSON format.
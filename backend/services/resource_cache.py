@@ -0,0 +1,163 @@
+# backend/services/resource_cache.py
+
+import re
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from config import settings
+from models import Resource
+
+logger = logging.getLogger("services.resource_cache")
+logger.setLevel(logging.INFO)
+
+# Only these types hit YouTube; Docs/Project/Article links are computed locally.
+CACHED_TYPES = ("Video", "Playlist", "Course")
+_CACHEABLE_HOSTS = ("youtube.com/embed/", "youtube.com/playlist", "youtube.com/watch")
+
+_WORD_RE = re.compile(r"[a-z0-9\+#]+")
+
+
+def normalize_query(query: str) -> str:
+    """Order-insensitive form of a search query: lowercased, de-duplicated, sorted words."""
+    return " ".join(sorted(set(_WORD_RE.findall((query or "").lower()))))
+
+
+def is_cacheable(url: str) -> bool:
+    return bool(url) and any(h in url for h in _CACHEABLE_HOSTS)
+
+
+def query_key(query: str, r_type: str) -> str:
+    return hashlib.sha1(f"{r_type}|{normalize_query(query)}".encode("utf-8")).hexdigest()
+
+
+class ResourceCache:
+    """
+    Two-level cache for YouTube resource lookups: an in-process LRU in front
+    of the resources table. Entries older than the refresh-ahead threshold are
+    served immediately and refreshed in the background; entries past the TTL
+    are re-fetched inline.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, refresh_ratio: float = 0.8):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.refresh_after = int(ttl_seconds * refresh_ratio)
+        self._lru: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats: Dict[str, int] = {"memory_hits": 0, "db_hits": 0, "misses": 0, "refreshes": 0}
+
+    def _get_memory(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            hit = self._lru.get(key)
+            if hit:
+                self._lru.move_to_end(key)
+            return hit
+
+    def _put_memory(self, key: str, url: str, fetched_at: float):
+        with self._lock:
+            self._lru[key] = (url, fetched_at)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    async def _load_db(self, key: str, r_type: str) -> Optional[Tuple[str, float]]:
+        try:
+            row = await asyncio.to_thread(Resource.get_by_query_key, key, r_type)
+        except Exception as e:
+            logger.warning(f"[ResourceCache] DB lookup failed: {e}")
+            return None
+        if not row or not row.get("url"):
+            return None
+        # Age is computed by MySQL: DATETIME columns carry no zone, so converting
+        # fetched_at here would be off whenever DB and app time zones differ.
+        age = row.get("age_seconds")
+        return row["url"], (time.time() - age if age is not None else 0.0)
+
+    async def _store(self, key: str, query: str, r_type: str, url: str):
+        now = time.time()
+        self._put_memory(key, url, now)
+        try:
+            await asyncio.to_thread(Resource.upsert_lookup, key, r_type, query, url)
+        except Exception as e:
+            logger.warning(f"[ResourceCache] DB store failed: {e}")
+
+    async def _fetch_and_store(self, key: str, query: str, r_type: str, fetcher) -> str:
+        url = await fetcher(query, r_type)
+        if is_cacheable(url):
+            await self._store(key, query, r_type, url)
+        return url
+
+    async def _refresh(self, key: str, query: str, r_type: str, fetcher):
+        try:
+            self.stats["refreshes"] += 1
+            await self._fetch_and_store(key, query, r_type, fetcher)
+        except Exception as e:
+            logger.warning(f"[ResourceCache] Background refresh failed for '{query}': {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    def _schedule_refresh(self, key: str, query: str, r_type: str, fetcher):
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.get_running_loop().create_task(self._refresh(key, query, r_type, fetcher))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def resolve(
+        self,
+        query: str,
+        r_type: str,
+        fetcher: Callable[[str, str], Awaitable[str]],
+        live: str = "inline",
+    ) -> str:
+        """
+        Return a cached URL for (query, r_type). On a miss, live="inline" calls
+        fetcher and waits; "background" schedules fetcher to fill the cache and
+        returns "" (or the expired URL); "off" never calls fetcher.
+        """
+        if r_type not in CACHED_TYPES:
+            return await fetcher(query, r_type)
+
+        key = query_key(query, r_type)
+        hit = self._get_memory(key)
+        if hit:
+            self.stats["memory_hits"] += 1
+        else:
+            hit = await self._load_db(key, r_type)
+            if hit:
+                self.stats["db_hits"] += 1
+                self._put_memory(key, *hit)
+
+        if hit:
+            url, fetched_at = hit
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                if age >= self.refresh_after:
+                    self._schedule_refresh(key, query, r_type, fetcher)
+                return url
+
+        self.stats["misses"] += 1
+        if live != "inline":
+            if live == "background":
+                self._schedule_refresh(key, query, r_type, fetcher)
+            return hit[0] if hit else ""
+
+        url = await self._fetch_and_store(key, query, r_type, fetcher)
+        if hit and not is_cacheable(url):
+            # Live search failed; an expired YouTube link beats a generic fallback.
+            return hit[0]
+        return url
+
+
+resource_cache = ResourceCache(
+    max_entries=settings.RESOURCE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESOURCE_CACHE_TTL_HOURS * 3600,
+)
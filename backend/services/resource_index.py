@@ -0,0 +1,150 @@
+# backend/services/resource_index.py
+
+import os
+import re
+import json
+import math
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from config import settings
+from models import Resource
+
+logger = logging.getLogger("services.resource_index")
+logger.setLevel(logging.INFO)
+
+_WORD_RE = re.compile(r"[a-z0-9\+#]+")
+STOPWORDS = {
+    "a", "an", "and", "the", "for", "to", "of", "in", "on", "with", "by", "from",
+    "full", "course", "tutorial", "beginners", "beginner", "complete", "guide",
+    "introduction", "intro", "learn", "learning", "playlist", "video", "basics",
+    # role words from the "<target role> <topic> <title>" queries built during enrichment
+    "developer", "engineer", "engineering", "scientist", "analyst", "specialist",
+    "senior", "junior", "associate", "intern",
+}
+
+# Which indexed resource types may answer a request for a given type.
+COMPATIBLE_TYPES = {
+    "Video": {"Video"},
+    "Playlist": {"Playlist", "Course", "Video"},
+    "Course": {"Course", "Playlist", "Video"},
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [w for w in _WORD_RE.findall((text or "").lower()) if w not in STOPWORDS]
+
+
+class ResourceIndex:
+    """
+    In-process inverted index (token -> doc ids) over learning resources,
+    bulk-loaded from a curated JSON dataset and the resources table. Scores are
+    the idf-weighted share of query terms a document covers.
+    """
+
+    def __init__(self, min_score: float):
+        self.min_score = min_score
+        self._docs: List[Dict[str, Any]] = []
+        self._urls: Dict[str, int] = {}
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, doc: Dict[str, Any]) -> Optional[int]:
+        url = (doc.get("url") or "").strip()
+        r_type = (doc.get("type") or "").title()
+        if not url or not r_type:
+            return None
+        terms = set(tokenize(doc.get("title")))
+        for tag in doc.get("tags") or []:
+            terms.update(tokenize(tag))
+        if not terms:
+            return None
+        with self._lock:
+            if url in self._urls:
+                doc_id = self._urls[url]
+                self._docs[doc_id]["terms"] |= terms
+            else:
+                doc_id = len(self._docs)
+                self._urls[url] = doc_id
+                self._docs.append({
+                    "url": url,
+                    "title": doc.get("title") or "",
+                    "type": r_type,
+                    "duration_minutes": doc.get("duration_minutes"),
+                    "terms": terms,
+                })
+            for term in terms:
+                self._postings[term].add(doc_id)
+        return doc_id
+
+    def bulk_add(self, docs: Iterable[Dict[str, Any]]) -> int:
+        return sum(1 for d in docs if self.add(d) is not None)
+
+    def load_dataset(self, path: str) -> int:
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"[ResourceIndex] Could not read dataset {path}: {e}")
+            return 0
+        return self.bulk_add(data if isinstance(data, list) else data.get("resources", []))
+
+    def load(self, include_db: bool = True):
+        """Load the curated dataset and (optionally) every cached row of the resources table."""
+        count = self.load_dataset(settings.RESOURCE_INDEX_DATASET)
+        if include_db:
+            try:
+                count += self.bulk_add(Resource.get_indexable())
+            except Exception as e:
+                logger.warning(f"[ResourceIndex] DB load failed: {e}")
+        self.loaded = True
+        logger.info(f"[ResourceIndex] Indexed {count} resources ({len(self)} unique)")
+
+    def search(self, query: str, r_type: str, limit: int = 1) -> List[Dict[str, Any]]:
+        """Best matches for query among resources compatible with r_type."""
+        if not self.loaded:
+            self.load(include_db=False)
+        allowed = COMPATIBLE_TYPES.get(r_type)
+        terms = set(tokenize(query))
+        if not allowed or not terms or not self._docs:
+            return []
+
+        n_docs = len(self._docs)
+        weights = {t: math.log(1 + n_docs / (1 + len(self._postings.get(t) or ()))) for t in terms}
+        total = sum(weights.values()) or 1.0
+
+        scores: Dict[int, float] = defaultdict(float)
+        ranked = []
+        with self._lock:
+            for t in terms:
+                for doc_id in self._postings.get(t, ()):
+                    scores[doc_id] += weights[t]
+
+            for doc_id, score in scores.items():
+                doc = self._docs[doc_id]
+                if doc["type"] not in allowed:
+                    continue
+                norm = score / total
+                if norm >= self.min_score:
+                    exact_type = 1 if doc["type"] == r_type else 0
+                    ranked.append((norm, exact_type, doc.get("duration_minutes") or 0, doc_id))
+            ranked.sort(reverse=True)
+            return [
+                {k: v for k, v in self._docs[d].items() if k != "terms"} | {"score": round(s, 3)}
+                for s, _, _, d in ranked[:limit]
+            ]
+
+    def best_url(self, query: str, r_type: str) -> Optional[str]:
+        hits = self.search(query, r_type, limit=1)
+        return hits[0]["url"] if hits else None
+
+
+resource_index = ResourceIndex(min_score=settings.RESOURCE_INDEX_MIN_SCORE)
@@ -1,10 +1,13 @@
 
+import copy
 import json
+import time
 import asyncio
 import logging
 import urllib.parse
 import re
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from youtubesearchpython import VideosSearch, PlaylistsSearch
 
 from services.prompts import (
@@ -16,10 +19,25 @@ from services.prompts import (
 from database import mysql_db
 from services.llm_manager import run_llm
 from services.services_utils import safe_json_load, fetch_real_jobs, match_jobs_bulk
+from services.job_index import job_index
+from services.skill_canonical import skill_index
+from services.resource_cache import resource_cache, normalize_query, is_cacheable, CACHED_TYPES
+from services.resource_index import resource_index
+from services.roadmap_templates import roadmap_templates, template_key, personalize_curriculum
+from config import settings
 
 logger = logging.getLogger("services.roadmap_generate")
 logger.setLevel(logging.INFO)
 
+# YouTube scraping is blocking; keep it off the default executor and bounded.
+search_executor = ThreadPoolExecutor(
+    max_workers=settings.RESOURCE_SEARCH_WORKERS, thread_name_prefix="resource-search"
+)
+
+
+async def _run_search(fn):
+    return await asyncio.get_running_loop().run_in_executor(search_executor, fn)
+
 
 def parse_duration_seconds(duration_str: str) -> int:
     if not duration_str:
@@ -46,7 +64,7 @@ async def fetch_top_video(query: str) -> str:
      - Official docs search (google result) as last fallback
     """
     try:
-        data = await asyncio.to_thread(lambda: VideosSearch(query + " full course", limit=12).result())
+        data = await _run_search(lambda: VideosSearch(query + " full course", limit=12).result())
         candidates = (data or {}).get("result", []) or []
         best = None
         for vid in candidates:
@@ -76,7 +94,7 @@ async def fetch_top_video(query: str) -> str:
 
 async def fetch_top_playlist(query: str) -> str:
     try:
-        data = await asyncio.to_thread(lambda: PlaylistsSearch(query, limit=6).result())
+        data = await _run_search(lambda: PlaylistsSearch(query, limit=6).result())
         results = (data or {}).get("result", []) or []
         for pl in results:
             count = pl.get("count") or pl.get("videoCount") or pl.get("videos") or 0
@@ -99,6 +117,34 @@ async def fetch_top_playlist(query: str) -> str:
 
 
 async def fetch_resource_by_type(query: str, r_type: str) -> str:
+    """
+    Resolve a resource link: local resource index first, then the resource
+    cache. Live YouTube search runs per settings.RESOURCE_LIVE_SEARCH
+    (by default only in the background, filling cache and index for next time).
+    Returns "" when no YouTube link is known yet, so the caller can count the
+    fallback it substitutes.
+    """
+    if r_type in CACHED_TYPES:
+        url = resource_index.best_url(query, r_type)
+        if url:
+            return url
+
+    url = await resource_cache.resolve(
+        query, r_type, _fetch_and_index, live=settings.RESOURCE_LIVE_SEARCH
+    )
+    if r_type in CACHED_TYPES and not is_cacheable(url):
+        return ""
+    return url or f"https://github.com/search?q={urllib.parse.quote(query)}&type=repositories"
+
+
+async def _fetch_and_index(query: str, r_type: str) -> str:
+    url = await _fetch_resource_live(query, r_type)
+    if url and "youtube.com/" in url:
+        resource_index.add({"title": query, "type": r_type, "url": url})
+    return url
+
+
+async def _fetch_resource_live(query: str, r_type: str) -> str:
     """
     FIXED VERSION — NO GOOGLE SEARCH LINKS
     """
@@ -159,9 +205,22 @@ async def fetch_resource_by_type(query: str, r_type: str) -> str:
 
     return f"https://github.com/search?q={q}&type=repositories"
 
-async def enrich_curriculum_with_real_videos(curriculum: List[Dict], target_role: str) -> List[Dict]:
-    tasks = []
-    mapping = []
+def _fallback_resource_url(resource: Dict) -> str:
+    return f"https://github.com/search?q={urllib.parse.quote(resource.get('title') or '')}"
+
+
+async def enrich_curriculum_with_real_videos(
+    curriculum: List[Dict], target_role: str, stats: Optional[Dict[str, Any]] = None
+) -> List[Dict]:
+    """
+    Resolve resource links for every topic. Identical (query, type) pairs are
+    looked up once, lookups run through a bounded semaphore/executor with a
+    per-lookup timeout, and anything still pending at the overall deadline
+    gets a fallback link. Timing and counts are written into stats if given.
+    """
+    started = time.perf_counter()
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    total = 0
 
     for phase in curriculum:
         if not isinstance(phase, dict):
@@ -181,21 +240,52 @@ async def enrich_curriculum_with_real_videos(curriculum: List[Dict], target_role
                         continue
                 title = resource.get("title") or ""
                 search_query = " ".join(p for p in [target_role, topic.get("title",""), title] if p)[:200]
-                tasks.append(fetch_resource_by_type(search_query, r_type))
-                mapping.append(resource)
+                key = (normalize_query(search_query), r_type)
+                group = groups.setdefault(key, {"query": search_query, "r_type": r_type, "resources": []})
+                group["resources"].append(resource)
+                total += 1
 
-    if not tasks:
+    if not groups:
         return curriculum
 
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    for i, res in enumerate(results):
-        resource_obj = mapping[i]
-        if isinstance(res, Exception) or not res:
-            
-            resource_obj["url"] = f"https://github.com/search?q={urllib.parse.quote(resource_obj.get('title') or '')}"
-        else:
-            resource_obj["url"] = res
+    semaphore = asyncio.Semaphore(settings.RESOURCE_SEARCH_CONCURRENCY)
 
+    async def lookup(query: str, r_type: str) -> str:
+        async with semaphore:
+            return await asyncio.wait_for(
+                fetch_resource_by_type(query, r_type), settings.RESOURCE_LOOKUP_TIMEOUT_SECONDS
+            )
+
+    tasks = {
+        asyncio.ensure_future(lookup(g["query"], g["r_type"])): g for g in groups.values()
+    }
+    done, pending = await asyncio.wait(tasks, timeout=settings.ENRICHMENT_DEADLINE_SECONDS)
+    for task in pending:
+        task.cancel()
+
+    failed = 0
+    for task, group in tasks.items():
+        res = None
+        if task in done and not task.cancelled() and task.exception() is None:
+            res = task.result()
+        if not res:
+            failed += 1
+        for resource_obj in group["resources"]:
+            resource_obj["url"] = res or _fallback_resource_url(resource_obj)
+
+    duration_ms = int((time.perf_counter() - started) * 1000)
+    if stats is not None:
+        stats.update({
+            "resources": total,
+            "unique_lookups": len(groups),
+            "timed_out": len(pending),
+            "fallbacks": failed,
+            "duration_ms": duration_ms,
+        })
+    logger.info(
+        f"[enrich_curriculum] {total} resources, {len(groups)} lookups, "
+        f"{len(pending)} timed out, {failed} fallbacks in {duration_ms}ms"
+    )
     return curriculum
 
 
@@ -232,10 +322,12 @@ def get_user_skills(user_id: int) -> Dict[str, List[str]]:
     mastered, intermediate, beginner = [], [], []
     try:
         rows = mysql_db.fetch_all("SELECT s.skill_name, us.level FROM USER_SKILLS us JOIN SKILLS s USING (skill_id) WHERE us.user_id=%s", (user_id,))
+        seen = set()
         for r in rows:
-            level, name = (r.get("level") or "").lower(), (r.get("skill_name") or "").strip()
-            if not name:
+            level, name = (r.get("level") or "").lower(), skill_index.canonical(r.get("skill_name") or "")
+            if not name or name in seen:
                 continue
+            seen.add(name)
             if level in ("expert", "advanced"):
                 mastered.append(name)
             elif level == "intermediate":
@@ -247,16 +339,106 @@ def get_user_skills(user_id: int) -> Dict[str, List[str]]:
     return {"mastered": mastered, "intermediate": intermediate, "beginner": beginner}
 
 
+# Roadmap section produced by each pipeline stage (see generate_roadmap).
+STAGE_SECTIONS = {
+    "overview": "overview",
+    "curriculum": "curriculum",
+    "personalization": "curriculum",
+    "skills": "skills",
+    "networking": "networking",
+    "job_matching": "related_jobs",
+}
+
+
+def parse_curriculum(curriculum_data: Any) -> List[Dict]:
+    if isinstance(curriculum_data, list):
+        return curriculum_data
+    if isinstance(curriculum_data, dict):
+        return curriculum_data.get("curriculum") or curriculum_data.get("phases") or []
+    return []
+
+
+def curriculum_topic_titles(curriculum: List[Dict]) -> List[str]:
+    topics_list = []
+    for p in curriculum or []:
+        if isinstance(p, dict):
+            for t in p.get("topics", []):
+                val = t.get("title") if isinstance(t, dict) else t
+                if val:
+                    topics_list.append(val)
+    return topics_list
+
+
+async def run_stage_graph(
+    stages: Dict[str, Tuple[Tuple[str, ...], Callable[[Dict[str, Any]], Awaitable[Any]]]],
+    timings: Dict[str, Dict[str, int]],
+    on_complete: Optional[Callable[[str, Any], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """
+    Run a DAG of async stages. Every stage is scheduled up front and starts as
+    soon as the stages it depends on have finished; start offset and duration
+    of each stage (plus "_total") are written into timings. on_complete, if
+    given, is awaited with (stage name, result) as each stage finishes.
+    """
+    started = time.perf_counter()
+    tasks: Dict[str, asyncio.Task] = {}
+
+    def ms(t: float) -> int:
+        return int((t - started) * 1000)
+
+    async def run(name, deps, fn):
+        inputs = {d: await tasks[d] for d in deps}
+        t0 = time.perf_counter()
+        try:
+            result = await fn(inputs)
+        finally:
+            timings[name] = {"start_ms": ms(t0), "duration_ms": ms(time.perf_counter()) - ms(t0)}
+        if on_complete:
+            try:
+                await on_complete(name, result)
+            except Exception as e:
+                logger.warning(f"[run_stage_graph] on_complete failed for stage '{name}': {e}")
+        return result
+
+    for name, (deps, fn) in stages.items():
+        unknown = [d for d in deps if d not in stages]
+        if unknown:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {unknown}")
+        tasks[name] = asyncio.ensure_future(run(name, deps, fn))
+
+    try:
+        results = await asyncio.gather(*tasks.values())
+    except Exception:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    finally:
+        timings["_total"] = {"start_ms": 0, "duration_ms": ms(time.perf_counter())}
+    return dict(zip(tasks.keys(), results))
+
+
 async def generate_roadmap(
     user_id: int, target_role: str, timeline_months: int = 6,
     parsed_resume: Optional[Dict[str, Any]] = None, model_pref: str = "auto",
-    career_level: Optional[str] = "Entry-level", location: Optional[str] = None
+    career_level: Optional[str] = "Entry-level", location: Optional[str] = None,
+    on_section: Optional[Callable[[str, Any], Awaitable[None]]] = None,
 ) -> Dict[str, Any]:
+    """
+    Generate a full roadmap. Overview, curriculum (with enriched links) and
+    networking come from the shared template for (role, level, timeline,
+    location), built on a cache miss (and shared with concurrent requests for
+    the same key) but only stored when every resource link resolved; jobs come from the job search cache, and skills, topic
+    personalization and job matching run per user. If on_section is given it is awaited with
+    (section name, data) as each roadmap section becomes available; the
+    curriculum is reported twice, first shared and then personalized.
+    """
 
     parsed_resume = parsed_resume or {}
     resume_skills = parsed_resume.get("skills") or []
+    mastered_skills: List[str] = []
     if not resume_skills:
         db_skills = get_user_skills(user_id)
+        mastered_skills = db_skills["mastered"]
         resume_skills = db_skills["mastered"] + db_skills["intermediate"] + db_skills["beginner"]
         parsed_resume["skills"] = resume_skills
 
@@ -270,75 +452,138 @@ async def generate_roadmap(
         "personality": "Visual Learner",
         "location": location or ""
     }
+    # Template sections must not depend on who asked first.
+    shared_vars = {**base_vars, "present_skills": "", "missing_skills": ""}
 
     logger.info(f"[generate_roadmap] Role: {target_role} Location: {location}")
 
-    try:
-        job_query = f"{target_role} in {location}" if location else target_role
-
-        
-        overview_task = run_llm(PROMPT_ROADMAP_OVERVIEW, variables=base_vars, preference=model_pref)
-        curriculum_task = run_llm(PROMPT_ROADMAP_CURRICULUM, variables=base_vars, preference=model_pref)
-        job_task = fetch_real_jobs(query=job_query, limit=8, location=location)
-
-        overview_raw, curriculum_raw, jobs_raw = await asyncio.gather(overview_task, curriculum_task, job_task)
-
-        overview = safe_json_load(overview_raw, mode="roadmap")
-        curriculum_data = safe_json_load(curriculum_raw, mode="roadmap")
-
-        curriculum = []
-        if isinstance(curriculum_data, list):
-            curriculum = curriculum_data
-        elif isinstance(curriculum_data, dict):
-            curriculum = curriculum_data.get("curriculum") or curriculum_data.get("phases") or []
-
-        
-        if curriculum:
-            try:
-                curriculum = await enrich_curriculum_with_real_videos(curriculum, target_role)
-            except Exception as e:
-                logger.error(f"[generate_roadmap] Enrichment failed: {e}")
-
-        
-        topics_list = []
-        for p in curriculum:
-            if isinstance(p, dict):
-                for t in p.get("topics", []):
-                    val = t.get("title") if isinstance(t, dict) else t
-                    if val:
-                        topics_list.append(val)
+    job_query = f"{target_role} in {location}" if location else target_role
+    enrichment_stats: Dict[str, Any] = {}
+    stage_timings: Dict[str, Dict[str, int]] = {}
+
+    key = template_key(target_role, career_level, timeline_months, location)
+    template = await roadmap_templates.acquire(key) if roadmap_templates.enabled else None
+    building = roadmap_templates.enabled and template is None
+
+    async def overview_stage(_):
+        if template is not None:
+            return template.get("overview")
+        raw = await run_llm(PROMPT_ROADMAP_OVERVIEW, variables=shared_vars, preference=model_pref)
+        return safe_json_load(raw, mode="roadmap")
+
+    async def curriculum_stage(_):
+        if template is not None:
+            return template.get("curriculum")
+        raw = await run_llm(PROMPT_ROADMAP_CURRICULUM, variables=shared_vars, preference=model_pref)
+        return parse_curriculum(safe_json_load(raw, mode="roadmap"))
+
+    async def jobs_stage(_):
+        # Not part of the template: postings expire on JOB_SEARCH_TTL_HOURS.
+        return await fetch_real_jobs(query=job_query, limit=8, location=location)
+
+    async def networking_stage(_):
+        if template is not None:
+            return template.get("networking")
+        raw = await run_llm(PROMPT_ROADMAP_NETWORKING, variables=shared_vars, preference=model_pref)
+        net_data = safe_json_load(raw)
+        networking_list = net_data if isinstance(net_data, list) else net_data.get("networking", [])
+        return generate_networking_links(networking_list, target_role, location)
 
+    async def skills_stage(inputs):
+        topics_list = curriculum_topic_titles(inputs["curriculum"])
         skill_vars = {**base_vars, "curriculum_topics": ", ".join(topics_list[:10])}
-
-        skills_task = run_llm(PROMPT_ROADMAP_SKILLS, variables=skill_vars, preference=model_pref)
-        net_task = run_llm(PROMPT_ROADMAP_NETWORKING, variables=base_vars, preference=model_pref)
-
-        skills_raw, net_raw = await asyncio.gather(skills_task, net_task)
-
-        final_jobs = jobs_raw or []
+        raw = await run_llm(PROMPT_ROADMAP_SKILLS, variables=skill_vars, preference=model_pref)
+        return safe_json_load(raw) or {}
+
+    async def enrichment_stage(inputs):
+        curriculum = inputs["curriculum"]
+        if not curriculum or template is not None:
+            return curriculum
+        try:
+            return await enrich_curriculum_with_real_videos(curriculum, target_role, enrichment_stats)
+        except Exception as e:
+            logger.error(f"[generate_roadmap] Enrichment failed: {e}")
+            return curriculum
+
+    async def personalization_stage(inputs):
+        return personalize_curriculum(inputs["enrichment"] or [], resume_skills, mastered_skills)
+
+    async def job_matching_stage(inputs):
+        final_jobs = copy.deepcopy(inputs["jobs"] or [])
+        # Stored postings from earlier searches that fit this user's skills.
+        seen = {j.get("job_id") for j in final_jobs if j.get("job_id")}
+        stored = await asyncio.to_thread(job_index.match, resume_skills, 8, target_role, location)
+        for job in stored:
+            if job["job_id"] not in seen:
+                final_jobs.append(job)
         if final_jobs:
             try:
                 final_jobs = match_jobs_bulk(final_jobs, parsed_resume)
             except Exception:
                 logger.warning("[generate_roadmap] job matching failed, returning jobs raw")
+        return final_jobs
+
+    # stage name -> (dependencies, coroutine fn receiving {dependency: result})
+    stages = {
+        "overview": ((), overview_stage),
+        "curriculum": ((), curriculum_stage),
+        "jobs": ((), jobs_stage),
+        "networking": ((), networking_stage),
+        "skills": (("curriculum",), skills_stage),
+        "enrichment": (("curriculum",), enrichment_stage),
+        "personalization": (("enrichment",), personalization_stage),
+        "job_matching": (("jobs",), job_matching_stage),
+    }
 
-        net_data = safe_json_load(net_raw)
-        networking_list = net_data if isinstance(net_data, list) else net_data.get("networking", [])
+    async def report_section(stage: str, result: Any):
+        section = STAGE_SECTIONS.get(stage)
+        if on_section and section:
+            await on_section(section, result or ([] if section in ("curriculum", "related_jobs", "networking") else {}))
 
-        networking_list = generate_networking_links(networking_list, target_role, location)
+    built, store = None, False
+    try:
+        results = await run_stage_graph(stages, stage_timings, report_section)
+
+        if building and results["overview"] and results["enrichment"]:
+            built = {
+                "overview": results["overview"],
+                "curriculum": results["enrichment"],
+                "networking": results["networking"] or [],
+                "enrichment": enrichment_stats,
+            }
+            # Fallback links (lookups that failed or are still being filled in
+            # the background) would be served to every user of the template for
+            # its whole TTL, so such a build only goes to concurrent requests.
+            store = not enrichment_stats.get("fallbacks")
 
         roadmap = {
-            "metadata": base_vars,
-            "overview": overview or {},
-            "curriculum": curriculum or [],
-            "skills": safe_json_load(skills_raw) or {},
-            "related_jobs": final_jobs or [],
-            "networking": networking_list or [],
+            "metadata": {
+                **base_vars,
+                "enrichment": enrichment_stats,  # this request's lookups; none on a template hit
+                "stage_timings": stage_timings,
+                "template": {
+                    "key": key,
+                    "cached": template is not None,
+                    "enrichment": (template or {}).get("enrichment") or {},
+                },
+            },
+            "overview": results["overview"] or {},
+            "curriculum": results["personalization"] or [],
+            "skills": results["skills"] or {},
+            "related_jobs": results["job_matching"] or [],
+            "networking": results["networking"] or [],
         }
 
-        logger.info("[generate_roadmap] ✅ Success")
+        logger.info(
+            f"[generate_roadmap] ✅ Success ({stage_timings.get('_total', {}).get('duration_ms')}ms, "
+            f"template {'hit' if template is not None else 'miss'})"
+        )
         return roadmap
 
     except Exception as e:
         logger.exception(f"[generate_roadmap] Failed: {e}")
-        return {"error": str(e), "metadata": base_vars}
\ No newline at end of file
+        return {"error": str(e), "metadata": base_vars}
+
+    finally:
+        if building:
+            await roadmap_templates.release(key, built, shared_vars, store=store)
@@ -0,0 +1,172 @@
+# backend/services/roadmap_patch.py
+
+import copy
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SKILL_CATEGORIES = ("skills_to_focus", "skills_to_improve")
+
+
+class RoadmapPatchError(ValueError):
+    """An operation that cannot be applied to the roadmap document."""
+
+
+def _parse_pointer(path: str) -> List[str]:
+    if path == "":
+        return []
+    if not isinstance(path, str) or not path.startswith("/"):
+        raise RoadmapPatchError(f"Invalid JSON pointer: {path!r}")
+    return [p.replace("~1", "/").replace("~0", "~") for p in path[1:].split("/")]
+
+
+def _index(container: list, token: str, allow_end: bool = False) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise RoadmapPatchError(f"Invalid array index: {token!r}")
+    i = int(token)
+    if i > len(container) or (i == len(container) and not allow_end):
+        raise RoadmapPatchError(f"Array index out of range: {i}")
+    return i
+
+
+def _resolve(doc: Any, tokens: List[str]) -> Any:
+    node = doc
+    for token in tokens:
+        if isinstance(node, dict):
+            if token not in node:
+                raise RoadmapPatchError(f"Path not found: /{'/'.join(tokens)}")
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_index(node, token)]
+        else:
+            raise RoadmapPatchError(f"Path not found: /{'/'.join(tokens)}")
+    return node
+
+
+def _add(doc: Any, tokens: List[str], value: Any) -> Any:
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1])
+    last = tokens[-1]
+    if isinstance(parent, dict):
+        parent[last] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, last, allow_end=True), value)
+    else:
+        raise RoadmapPatchError(f"Cannot add to /{'/'.join(tokens[:-1])}")
+    return doc
+
+
+def _remove(doc: Any, tokens: List[str]) -> Tuple[Any, Any]:
+    if not tokens:
+        raise RoadmapPatchError("Cannot remove the whole document")
+    parent = _resolve(doc, tokens[:-1])
+    last = tokens[-1]
+    if isinstance(parent, dict):
+        if last not in parent:
+            raise RoadmapPatchError(f"Path not found: /{'/'.join(tokens)}")
+        return doc, parent.pop(last)
+    if isinstance(parent, list):
+        return doc, parent.pop(_index(parent, last))
+    raise RoadmapPatchError(f"Path not found: /{'/'.join(tokens)}")
+
+
+def apply_json_patch(doc: Any, operations: Iterable[Dict[str, Any]]) -> Any:
+    """
+    Apply RFC 6902 operations (add, remove, replace, move, copy, test) and
+    return the patched document. The input is left untouched; any failing
+    operation aborts the whole patch.
+    """
+    doc = copy.deepcopy(doc)
+    for n, op in enumerate(operations or []):
+        if not isinstance(op, dict) or "op" not in op or "path" not in op:
+            raise RoadmapPatchError(f"Operation {n} must have 'op' and 'path'")
+        name, tokens = op["op"], _parse_pointer(op["path"])
+
+        if name in ("add", "replace", "test") and "value" not in op:
+            raise RoadmapPatchError(f"Operation {n} ({name}) requires 'value'")
+
+        if name == "add":
+            doc = _add(doc, tokens, copy.deepcopy(op["value"]))
+        elif name == "remove":
+            doc, _ = _remove(doc, tokens)
+        elif name == "replace":
+            _resolve(doc, tokens)
+            if tokens:
+                doc, _ = _remove(doc, tokens)
+            doc = _add(doc, tokens, copy.deepcopy(op["value"]))
+        elif name in ("move", "copy"):
+            source = _parse_pointer(op.get("from", ""))
+            if name == "move":
+                if tokens[:len(source)] == source and tokens != source:
+                    raise RoadmapPatchError(f"Operation {n} moves a value into itself")
+                doc, value = _remove(doc, source)
+            else:
+                value = copy.deepcopy(_resolve(doc, source))
+            doc = _add(doc, tokens, value)
+        elif name == "test":
+            if _resolve(doc, tokens) != op["value"]:
+                raise RoadmapPatchError(f"Test failed at {op['path']}")
+        else:
+            raise RoadmapPatchError(f"Unsupported operation: {name!r}")
+    return doc
+
+
+def apply_completion_deltas(
+    doc: Dict[str, Any],
+    topics: Optional[Iterable[Dict[str, Any]]] = None,
+    skills: Optional[Iterable[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Set completed flags by position: topics as {phase, topic, completed},
+    skills as {category, index, completed}. Plain-string skills become
+    {"name", "completed"} objects, as the roadmap viewer does. Also the
+    check that a patched document is still an object.
+    """
+    if not isinstance(doc, dict):
+        raise RoadmapPatchError("The roadmap document must be a JSON object")
+    doc = copy.deepcopy(doc)
+    curriculum = doc.get("curriculum") or []
+    for t in topics or []:
+        try:
+            topic = curriculum[t["phase"]]["topics"][t["topic"]]
+        except (IndexError, KeyError, TypeError):
+            raise RoadmapPatchError(f"No topic at phase {t.get('phase')}, topic {t.get('topic')}")
+        if not isinstance(topic, dict):
+            raise RoadmapPatchError(f"Topic at phase {t['phase']}, topic {t['topic']} is not an object")
+        topic["completed"] = bool(t["completed"])
+
+    skill_lists = doc.get("skills") if isinstance(doc.get("skills"), dict) else {}
+    for s in skills or []:
+        category = s.get("category")
+        items = skill_lists.get(category) if category in SKILL_CATEGORIES else None
+        idx = s.get("index")
+        if not isinstance(items, list) or not isinstance(idx, int) or not 0 <= idx < len(items):
+            raise RoadmapPatchError(f"No skill at {category}[{idx}]")
+        if isinstance(items[idx], dict):
+            items[idx]["completed"] = bool(s["completed"])
+        else:
+            items[idx] = {"name": items[idx], "completed": bool(s["completed"])}
+    return doc
+
+
+def calculate_completion(doc: Dict[str, Any]) -> int:
+    """Completed share of curriculum topics and focus/improve skills, as the roadmap viewer computes it."""
+    total = done = 0
+    curriculum = doc.get("curriculum")
+    for phase in curriculum if isinstance(curriculum, list) else []:
+        if not isinstance(phase, dict) or not isinstance(phase.get("topics"), list):
+            continue
+        for topic in phase["topics"]:
+            total += 1
+            if isinstance(topic, dict) and topic.get("completed"):
+                done += 1
+    skills = doc.get("skills") if isinstance(doc.get("skills"), dict) else {}
+    for category in SKILL_CATEGORIES:
+        items = skills.get(category)
+        for skill in items if isinstance(items, list) else []:
+            total += 1
+            if isinstance(skill, dict) and skill.get("completed"):
+                done += 1
+    # Math.round semantics (half up), not Python's banker's rounding
+    return 0 if total == 0 else int(done * 100 / total + 0.5)
@@ -0,0 +1,201 @@
+# backend/services/roadmap_stream.py
+
+import copy
+import json
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from config import settings
+from models import RoadmapStep
+from services.roadmap_generate import generate_roadmap
+
+logger = logging.getLogger("services.roadmap_stream")
+logger.setLevel(logging.INFO)
+
+ROADMAP_SECTIONS = ("overview", "curriculum", "skills", "related_jobs", "networking")
+
+
+def sse_event(event: str, data: Any, event_id: Optional[Any] = None) -> str:
+    """Format one server-sent event."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False, default=str))
+    return "\n".join(lines) + "\n\n"
+
+
+# Section events are identified by the set of sections the client holds once
+# it has that event ("overview,skills"), so the Last-Event-ID a client
+# reconnects with says exactly what to skip, whichever worker serves it and
+# whatever order the sections finished in.
+
+def seen_sections(last_event_id: Optional[str]) -> Set[str]:
+    """Sections a reconnecting client already has, from its Last-Event-ID header."""
+    return {s for s in (last_event_id or "").split(",") if s in ROADMAP_SECTIONS}
+
+
+class _SectionIds:
+    def __init__(self, seen: Iterable[str] = ()):
+        self.seen = set(seen)
+
+    def render(self, event: str, data: Any, section: Optional[str]) -> Optional[str]:
+        """The SSE payload for this client, or None for a section it already has."""
+        if section is None:
+            return sse_event(event, data)
+        if section in self.seen:
+            return None
+        self.seen.add(section)
+        return sse_event(event, data, ",".join(s for s in ROADMAP_SECTIONS if s in self.seen))
+
+
+class RoadmapGeneration:
+    """
+    One in-flight roadmap generation. Runs independently of any client
+    connection, persists each finished section into the roadmap row and fans
+    events out to every connected subscriber.
+
+    Sections finish concurrently, so writes go through a single writer task:
+    each persist snapshots the document on the event loop and replaces any
+    snapshot not yet written, and rows are only ever overwritten by newer ones.
+    """
+
+    def __init__(self, roadmap_id: int, user_id: int):
+        self.roadmap_id = roadmap_id
+        self.user_id = user_id
+        self.document: Dict[str, Any] = {"generation_status": "generating"}
+        self.events: List[Tuple[str, Any, Optional[str]]] = []  # (event, data, section)
+        self.subscribers: List[asyncio.Queue] = []
+        self.done = False
+        self.task: Optional[asyncio.Task] = None
+        self._pending: Optional[Dict[str, Any]] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    def _publish(self, event: str, data: Any, section: Optional[str] = None):
+        item = (event, data, section)
+        self.events.append(item)
+        for q in list(self.subscribers):
+            q.put_nowait(item)
+
+    def _persist(self):
+        self._pending = copy.deepcopy(self.document)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.get_running_loop().create_task(self._write_loop())
+
+    async def _write_loop(self):
+        while self._pending is not None:
+            document, self._pending = self._pending, None
+            try:
+                await asyncio.to_thread(RoadmapStep.update_content, self.roadmap_id, document)
+            except Exception as e:
+                logger.warning(f"[RoadmapGeneration] Persist failed for roadmap {self.roadmap_id}: {e}")
+
+    async def _flush(self):
+        """Persist the current document and wait until it is written."""
+        self._persist()
+        await self._writer
+
+    async def on_section(self, section: str, data: Any):
+        self.document[section] = data
+        self._publish("section", {"roadmap_id": self.roadmap_id, "section": section, "data": data}, section)
+        self._persist()
+
+    async def run(self, **generate_kwargs):
+        try:
+            roadmap = await generate_roadmap(on_section=self.on_section, **generate_kwargs)
+            failed = bool(roadmap.get("error"))
+            self.document = {**roadmap, "generation_status": "failed" if failed else "completed"}
+            await self._flush()
+            if failed:
+                self._publish("error", {"roadmap_id": self.roadmap_id, "detail": roadmap["error"]})
+            else:
+                self._publish("complete", {"roadmap_id": self.roadmap_id, "roadmap": self.document})
+        except Exception as e:
+            logger.exception(f"[RoadmapGeneration] roadmap {self.roadmap_id} failed: {e}")
+            self.document["generation_status"] = "failed"
+            await self._flush()
+            self._publish("error", {"roadmap_id": self.roadmap_id, "detail": str(e)})
+        finally:
+            self.done = True
+            for q in list(self.subscribers):
+                q.put_nowait(None)
+            _ACTIVE.pop(self.roadmap_id, None)
+
+    async def stream(self, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+        """Replay what the client does not have yet, then follow live events until done."""
+        ids = _SectionIds(seen_sections(last_event_id))
+        queue: asyncio.Queue = asyncio.Queue()
+        backlog = list(self.events)
+        self.subscribers.append(queue)
+        try:
+            for item in backlog:
+                payload = ids.render(*item)
+                if payload:
+                    yield payload
+            if self.done:
+                return
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                payload = ids.render(*item)
+                if payload:
+                    yield payload
+        finally:
+            if queue in self.subscribers:
+                self.subscribers.remove(queue)
+
+
+_ACTIVE: Dict[int, RoadmapGeneration] = {}
+
+
+def start_generation(roadmap_id: int, user_id: int, **generate_kwargs) -> RoadmapGeneration:
+    """Kick off generation in the background; the caller streams it via gen.stream()."""
+    gen = RoadmapGeneration(roadmap_id, user_id)
+    _ACTIVE[roadmap_id] = gen
+    gen.task = asyncio.get_running_loop().create_task(
+        gen.run(user_id=user_id, **generate_kwargs)
+    )
+    return gen
+
+
+def get_active_generation(roadmap_id: int) -> Optional[RoadmapGeneration]:
+    return _ACTIVE.get(roadmap_id)
+
+
+def fail_if_stale(roadmap_id: int, document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    A stored roadmap still "generating" that is not running in this worker
+    and has had no section written for ROADMAP_GENERATION_STALE_MINUTES lost
+    its worker: mark it failed so clients stop waiting (blocking).
+    """
+    if document.get("generation_status") != "generating":
+        return document
+    age = RoadmapStep.content_age_seconds(roadmap_id)
+    if age is not None and age < settings.ROADMAP_GENERATION_STALE_MINUTES * 60:
+        return document
+    logger.warning(f"[RoadmapGeneration] roadmap {roadmap_id} stuck generating ({age}s since last write), marking failed")
+    document = {**document, "generation_status": "failed"}
+    RoadmapStep.update_content(roadmap_id, document)
+    return document
+
+
+async def replay_persisted(roadmap_id: int, document: Dict[str, Any],
+                           last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+    """Stream a roadmap whose generation is not running in this worker from its stored sections."""
+    ids = _SectionIds(seen_sections(last_event_id))
+    for section in ROADMAP_SECTIONS:
+        if section in document:
+            payload = ids.render("section", {"roadmap_id": roadmap_id, "section": section, "data": document[section]}, section)
+            if payload:
+                yield payload
+    status = document.get("generation_status", "completed")
+    if status == "completed":
+        yield sse_event("complete", {"roadmap_id": roadmap_id, "roadmap": document})
+    elif status == "failed":
+        yield sse_event("error", {"roadmap_id": roadmap_id, "detail": "Roadmap generation failed"})
+    else:
+        # Still generating on another worker: send what is stored so far and
+        # let the client reconnect later (see fail_if_stale for dead workers).
+        yield sse_event("pending", {"roadmap_id": roadmap_id, "generation_status": status})
@@ -0,0 +1,185 @@
+# backend/services/roadmap_templates.py
+
+import copy
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import settings
+from models import RoadmapTemplate
+from services.prompt_templates import get_template
+from services.services_utils import canonical_skill_keys
+from services.skill_canonical import skill_index
+
+logger = logging.getLogger("services.roadmap_templates")
+logger.setLevel(logging.INFO)
+
+# Sections that depend only on the template key, never on the user.
+TEMPLATE_PROMPTS = ("PROMPT_ROADMAP_OVERVIEW", "PROMPT_ROADMAP_CURRICULUM", "PROMPT_ROADMAP_NETWORKING")
+
+
+def _norm(value: Any) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+def template_key(target_role: str, career_level: str, timeline_months: int, location: Optional[str]) -> str:
+    """
+    Cache key for the shared part of a roadmap. Includes the prompt versions,
+    so editing one of the template prompts invalidates existing entries.
+    """
+    versions = ",".join(get_template(name).version for name in TEMPLATE_PROMPTS)
+    raw = "|".join([_norm(target_role), _norm(career_level), str(timeline_months or ""), _norm(location), versions])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class RoadmapTemplateCache:
+    """
+    Shared roadmap templates keyed by (role, level, timeline, location): an
+    in-process LRU in front of the roadmap_templates table. Concurrent misses
+    for the same key are coalesced: one request builds the template and the
+    others wait for it and use the result, even one that is not stored (its
+    links are no worse than the builder's own roadmap).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self._lru: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._building: Dict[str, asyncio.Future] = {}
+        self.stats: Dict[str, int] = {"memory_hits": 0, "db_hits": 0, "misses": 0, "coalesced": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _get_memory(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        with self._lock:
+            hit = self._lru.get(key)
+            if hit:
+                self._lru.move_to_end(key)
+            return hit
+
+    def _put_memory(self, key: str, template: Dict[str, Any], created_at: float):
+        with self._lock:
+            self._lru[key] = (template, created_at)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    async def _load_db(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        try:
+            row = await asyncio.to_thread(RoadmapTemplate.get, key)
+        except Exception as e:
+            logger.warning(f"[RoadmapTemplateCache] DB lookup failed: {e}")
+            return None
+        if not row:
+            return None
+        age = row.get("age_seconds")  # computed by MySQL, see ResourceCache._load_db
+        return row["template"], (time.time() - age if age is not None else 0.0)
+
+    def _fresh(self, hit) -> bool:
+        return bool(hit) and time.time() - hit[1] < self.ttl
+
+    async def acquire(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a private copy of the cached template for key, or None if the
+        caller should build it. A None result makes the caller the builder for
+        key: it must call release(key, ...) when done, even on failure.
+        """
+        while True:
+            hit = self._get_memory(key)
+            if self._fresh(hit):
+                self.stats["memory_hits"] += 1
+                return copy.deepcopy(hit[0])
+            hit = await self._load_db(key)
+            if self._fresh(hit):
+                self.stats["db_hits"] += 1
+                self._put_memory(key, *hit)
+                return copy.deepcopy(hit[0])
+
+            pending = self._building.get(key)
+            if pending is None:
+                self.stats["misses"] += 1
+                self._building[key] = asyncio.get_running_loop().create_future()
+                return None
+            self.stats["coalesced"] += 1
+            # Another request is building this template; use what it built. If
+            # that build failed, look again (the first waiter to get here takes over).
+            built = await asyncio.shield(pending)
+            if built is not None:
+                return copy.deepcopy(built)
+
+    async def release(self, key: str, template: Optional[Dict[str, Any]] = None,
+                      meta: Optional[Dict[str, Any]] = None, store: bool = True):
+        """
+        Hand a freshly built template (if any) to the requests waiting for key
+        and, if store is set, cache it for later ones.
+        """
+        try:
+            if template is not None and store:
+                stored = copy.deepcopy(template)
+                self._put_memory(key, stored, time.time())
+                meta = meta or {}
+                try:
+                    await asyncio.to_thread(
+                        RoadmapTemplate.upsert, key, meta.get("target_role"), meta.get("career_level"),
+                        meta.get("timeline_months"), meta.get("location"), stored,
+                    )
+                except Exception as e:
+                    logger.warning(f"[RoadmapTemplateCache] DB store failed: {e}")
+        finally:
+            pending = self._building.pop(key, None)
+            if pending is not None and not pending.done():
+                pending.set_result(copy.deepcopy(template) if template is not None else None)
+
+
+def personalize_curriculum(
+    curriculum: List[Any], known_skills: Iterable[str], mastered_skills: Iterable[str] = ()
+) -> List[Any]:
+    """
+    Per-user pass over a shared curriculum. Topics covering skills the user
+    already has are marked known (with the matching skills) and moved after
+    the new material in their phase; topics covered entirely by mastered
+    skills are dropped outside the final phase and listed in skipped_topics.
+    Returns a new list; the input is not modified.
+    """
+    known = {skill_index.canonical_key(s): skill_index.canonical(s) for s in known_skills or [] if s}
+    known.pop("", None)
+    mastered = {skill_index.canonical_key(s) for s in mastered_skills or [] if s}
+
+    out = copy.deepcopy(curriculum or [])
+    last = len(out) - 1
+    for i, phase in enumerate(out):
+        if not isinstance(phase, dict) or not isinstance(phase.get("topics"), list):
+            continue
+        learn, review, skipped = [], [], []
+        for topic in phase["topics"]:
+            title = topic.get("title") if isinstance(topic, dict) else None
+            hits = canonical_skill_keys(title) & known.keys() if title else set()
+            if not hits:
+                learn.append(topic)
+                continue
+            topic["known"] = True
+            topic["known_skills"] = sorted(known[k] for k in hits)
+            if i != last and hits <= mastered:
+                skipped.append(topic)
+            else:
+                review.append(topic)
+        if not learn and not review:
+            # Never empty a phase; keep what it had as review material.
+            review, skipped = skipped, []
+        phase["topics"] = learn + review
+        if skipped:
+            phase["skipped_topics"] = [t["title"] for t in skipped]
+    return out
+
+
+roadmap_templates = RoadmapTemplateCache(
+    max_entries=settings.ROADMAP_TEMPLATE_MAX_ENTRIES,
+    ttl_seconds=settings.ROADMAP_TEMPLATE_TTL_HOURS * 3600,
+)
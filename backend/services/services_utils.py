@@ -5,12 +5,17 @@ import urllib.parse
 import time
 import logging
 import ast
+import hashlib
 from typing import Any, List, Optional, Dict
 from pydantic import BaseModel, ValidationError, field_validator,Field
-import httpx
 from config import settings
-from fastapi import HTTPException
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from database import mysql_db
+from services.skill_canonical import skill_index
+from services.http_clients import http_clients
+from services.job_search_cache import job_search_cache
+from services.job_matcher import rank_jobs
 
 logger = logging.getLogger("services.services_utils")
 logger.setLevel(logging.INFO)
@@ -19,6 +24,30 @@ logger.setLevel(logging.INFO)
 
 
 
+# Cache-Control for per-user JSON documents: browsers may store them but must
+# revalidate with If-None-Match; shared caches must not store them.
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from a version/hash tuple (never from the serialized body)."""
+    raw = ":".join("" if p is None else str(p) for p in parts)
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(t.strip().removeprefix("W/") == etag for t in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str = PRIVATE_REVALIDATE) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
 _MODEL_COOLDOWN: Dict[str, float] = {}
 _DEFAULT_COOLDOWN = 600  
 
@@ -43,6 +72,104 @@ def is_model_on_cooldown(model_name: str) -> bool:
 
 
 
+class SpooledUpload:
+    """Upload spooled to memory/disk with its size and SHA-256 digest."""
+
+    def __init__(self, fileobj, size: int, sha256: str, filename: str, content_type: str):
+        self.file = fileobj
+        self.size = size
+        self.sha256 = sha256
+        self.filename = filename
+        self.content_type = content_type
+
+    def rewind(self):
+        self.file.seek(0)
+        return self.file
+
+    def close(self):
+        try:
+            self.file.close()
+        except Exception:
+            pass
+
+
+def _too_large(limit: int) -> str:
+    return f"File too large (max {limit // (1024 * 1024)} MB)"
+
+
+class UploadSizeLimit:
+    """
+    ASGI middleware capping request bodies on upload paths before the
+    framework parses (and spools) them: a Content-Length over the limit is
+    refused with a 413 straight away, and a body without one is cut off with
+    a 413 as soon as it crosses the limit. `limits` maps a path to its cap in
+    bytes, multipart framing included.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        length = dict(scope.get("headers") or []).get(b"content-length", b"")
+        if length.isdigit() and int(length) > limit:
+            await JSONResponse({"detail": _too_large(limit)}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def capped_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=_too_large(limit))
+            return message
+
+        await self.app(scope, capped_receive, send)
+
+
+async def spool_upload(upload, max_bytes: Optional[int] = None) -> SpooledUpload:
+    """
+    Size and hash an UploadFile in chunks, rejecting anything over max_bytes
+    with a 413. The file stays in the temp file Starlette already spooled it
+    to (no second copy); UploadSizeLimit keeps oversized bodies from being
+    received in the first place.
+    """
+    limit = max_bytes or settings.MAX_RESUME_UPLOAD_BYTES
+    chunk_size = settings.UPLOAD_CHUNK_BYTES
+    digest = hashlib.sha256()
+    size = 0
+    await upload.seek(0)
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > limit:
+            raise HTTPException(status_code=413, detail=_too_large(limit))
+        digest.update(chunk)
+
+    await upload.seek(0)
+    return SpooledUpload(
+        upload.file,
+        size,
+        digest.hexdigest(),
+        upload.filename or "resume.pdf",
+        upload.content_type or "application/pdf",
+    )
+
+
+
+
+
+
 JUNK_FILTER_KEYWORDS = [
     "volunteer", "donation", "ngo", "call for papers",
     "teacher", "principal", "receptionist", "driver",
@@ -58,83 +185,54 @@ async def _call_jsearch(query: str, location: Optional[str], timeout: int = 12)
     params = {"query": query, "num_pages": 1}
     if location:
         params["location"] = location
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        resp = await client.get(f"https://{settings.JSEARCH_RAPIDAPI_HOST}/search", headers=headers, params=params)
-        resp.raise_for_status()
-        return resp.json()
-
-
-async def fetch_real_jobs(query: str, limit: int = 10, location: str = None) -> List[Dict]:
-  
-    import urllib.parse
-    import httpx
-    from config import settings
-
-    def extract_salary(item):
-        try:
-            highlights = item.get("job_highlights", {})
-            salary_list = highlights.get("Salary") or []
-            if isinstance(salary_list, list) and salary_list:
-                return salary_list[0]
-        except:
-            pass
+    resp = await http_clients.request(
+        "jsearch", "GET", f"https://{settings.JSEARCH_RAPIDAPI_HOST}/search",
+        headers=headers, params=params, timeout=timeout,
+    )
+    resp.raise_for_status()
+    return resp.json()
 
-        direct = item.get("job_salary_info")
-        if isinstance(direct, str) and direct.strip():
-            return direct
 
-        try:
-            min_sal = item.get("job_min_salary")
-            max_sal = item.get("job_max_salary")
-            if min_sal or max_sal:
-                return f"{min_sal or ''} - {max_sal or ''}".strip()
-        except:
-            pass
+def _fallback_jobs(query: str, location: Optional[str], description: str) -> List[Dict]:
+    fallback_url = f"https://www.linkedin.com/jobs/search/?keywords={urllib.parse.quote(query)}"
+    return [{
+        "role": query,
+        "company": "Various",
+        "location": location or "Remote",
+        "salary_range": "Not Provided",
+        "description": description,
+        "job_portal_link": fallback_url,
+        "posted_date": "N/A"
+    }]
 
-        return "Not Provided"
 
-    api_key = settings.JSEARCH_RAPIDAPI_KEY
-    api_host = settings.JSEARCH_RAPIDAPI_HOST
+def _extract_salary(item: Dict) -> str:
+    try:
+        highlights = item.get("job_highlights", {})
+        salary_list = highlights.get("Salary") or []
+        if isinstance(salary_list, list) and salary_list:
+            return salary_list[0]
+    except:
+        pass
 
-    if not api_key or not api_host:
-        fallback_url = f"https://www.linkedin.com/jobs/search/?keywords={urllib.parse.quote(query)}"
-        return [{
-            "role": query,
-            "company": "Various",
-            "location": location or "Remote",
-            "salary_range": "Not Provided",
-            "description": f"View job listings for {query} on LinkedIn.",
-            "job_portal_link": fallback_url,
-            "posted_date": "N/A"
-        }]
+    direct = item.get("job_salary_info")
+    if isinstance(direct, str) and direct.strip():
+        return direct
 
     try:
-        headers = {
-            "X-RapidAPI-Key": api_key,
-            "X-RapidAPI-Host": api_host
-        }
-
-        params = {"query": query, "num_pages": 1}
-        if location:
-            params["location"] = location
+        min_sal = item.get("job_min_salary")
+        max_sal = item.get("job_max_salary")
+        if min_sal or max_sal:
+            return f"{min_sal or ''} - {max_sal or ''}".strip()
+    except:
+        pass
 
-        async with httpx.AsyncClient(timeout=12) as client:
-            resp = await client.get(f"https://{api_host}/search", headers=headers, params=params)
-            resp.raise_for_status()
-            data = resp.json()
+    return "Not Provided"
 
-    except Exception as e:
-        fallback_url = f"https://www.linkedin.com/jobs/search/?keywords={urllib.parse.quote(query)}"
-        return [{
-            "role": query,
-            "company": "Various",
-            "location": location or "Remote",
-            "salary_range": "Not Provided",
-            "description": f"Job results for {query} unavailable. Showing LinkedIn fallback link.",
-            "job_portal_link": fallback_url,
-            "posted_date": "N/A"
-        }]
 
+async def search_jobs_live(query: str, limit: int = 10, location: str = None) -> List[Dict]:
+    """One JSearch API call, parsed into job dicts with skills extracted from the full description."""
+    data = await _call_jsearch(query, location)
     items = data.get("data") or []
     jobs = []
 
@@ -148,38 +246,52 @@ async def fetch_real_jobs(query: str, limit: int = 10, location: str = None) ->
         posted = item.get("job_posted_at") or item.get("job_date") or ""
         location_final = item.get("job_city") or item.get("job_location") or (location or "N/A")
 
-        salary_cleaned = extract_salary(item)
+        salary_cleaned = _extract_salary(item)
 
         desc = item.get("job_description") or ""
         desc_clean = " ".join(desc.split())  
         desc_short = desc_clean[:450] + ("..." if len(desc_clean) > 450 else "")
 
         jobs.append({
+            "external_id": item.get("job_id"),
             "role": title,
             "company": company,
             "location": location_final,
             "salary_range": salary_cleaned,
             "description": desc_short,
             "posted_date": posted,
-            "job_portal_link": job_url
+            "job_portal_link": job_url,
+            "required_skills": extract_skills_from_text(f"{title} {desc_clean}"),
         })
 
         if len(jobs) >= limit:
             break
 
+    return jobs
+
+
+async def fetch_real_jobs(query: str, limit: int = 10, location: str = None) -> List[Dict]:
+    """
+    Job postings for query/location, served from services.job_search_cache
+    (live JSearch call on a miss). Falls back to a LinkedIn search link when
+    the API is not configured, fails, or finds nothing.
+    """
+    if not settings.JSEARCH_RAPIDAPI_KEY or not settings.JSEARCH_RAPIDAPI_HOST:
+        return _fallback_jobs(query, location, f"View job listings for {query} on LinkedIn.")
+
+    fetch_limit = max(limit, settings.JOB_SEARCH_FETCH_LIMIT)
+    try:
+        jobs = await job_search_cache.search(
+            query, location, lambda: search_jobs_live(query, fetch_limit, location)
+        )
+    except Exception as e:
+        logger.warning(f"[fetch_real_jobs] search failed for '{query}': {e}")
+        return _fallback_jobs(query, location, f"Job results for {query} unavailable. Showing LinkedIn fallback link.")
+
     if not jobs:
-        fallback_url = f"https://www.linkedin.com/jobs/search/?keywords={urllib.parse.quote(query)}"
-        return [{
-            "role": query,
-            "company": "Various",
-            "location": location or "Remote",
-            "salary_range": "Not Provided",
-            "description": f"No results found via API. View LinkedIn listings.",
-            "job_portal_link": fallback_url,
-            "posted_date": "N/A"
-        }]
+        return _fallback_jobs(query, location, "No results found via API. View LinkedIn listings.")
 
-    return jobs
+    return jobs[:limit]
 
 
 def _build_job_search_url(query: str, location: Optional[str]):
@@ -377,42 +489,47 @@ def _tok(text: str) -> List[str]:
     return re.findall(r"[a-zA-Z0-9\-\+\.#]+", text.lower())
 
 
-def match_job(job: Dict, resume: Dict) -> Dict:
-    desc = f"{job.get('role','')} {job.get('company','')} {job.get('location','')}".lower()
-    job_tokens = set(_tok(desc))
+def canonical_skill_keys(text: str, max_ngram: int = 3) -> set:
+    """Canonical skill keys for every 1..max_ngram word window, so 'React.js' and 'machine learning' match."""
+    words = _tok(text)
+    keys = set()
+    for n in range(1, max_ngram + 1):
+        for i in range(len(words) - n + 1):
+            keys.add(skill_index.canonical_key(" ".join(words[i:i + n])))
+    return keys
 
-    skills = resume.get("skills") or []
-    if isinstance(skills, dict):
-        skills = skills.get("present_skills") or []
-    skills = [s.lower() for s in skills]
 
-    matched = [s for s in skills if s in job_tokens]
-    missing = [s for s in skills if s not in job_tokens]
+def extract_skills_from_text(text: str, limit: int = 30) -> List[str]:
+    """Known skills (see SkillIndex.lookup) mentioned in free text, in order of first mention."""
+    found: Dict[str, None] = {}
+    for skill in skill_index.mentions(text):
+        found.setdefault(skill, None)
+        if len(found) >= limit:
+            break
+    return list(found)
 
-    score = 0
-    if skills:
-        score = round(len(matched) / len(skills) * 100, 2)
 
-    job["matched_skills"] = matched
-    job["missing_skills"] = missing
-    job["match_percent"] = score
+def _resume_skills(resume: Dict) -> List[str]:
+    skills = resume.get("skills") or []
+    if isinstance(skills, dict):
+        skills = skills.get("present_skills") or []
+    return [c for _, c in skill_index.canonicalize_many(skills)]
 
-    
-    if "job_portal_link" not in job and job.get("url"):
-        job["job_portal_link"] = job["url"]
 
-    return job
+def match_job(job: Dict, resume: Dict) -> Dict:
+    return match_jobs_bulk([job], resume)[0]
 
 
 def match_jobs_bulk(jobs: List[Dict], resume: Dict) -> List[Dict]:
+    """Jobs ranked for the resume by services.job_matcher, annotated with matched/missing skills."""
     if not jobs:
         return jobs
-    return sorted(
-        (match_job(j, resume) for j in jobs),
-        key=lambda x: x.get("match_percent", 0),
-        reverse=True
-    )
-    
+    for job in jobs:
+        if "job_portal_link" not in job and job.get("url"):
+            job["job_portal_link"] = job["url"]
+    return rank_jobs(jobs, _resume_skills(resume))
+
+
 class StartMockInterviewRequest(BaseModel):
     target_role: str = Field(..., example="Data Scientist")
     difficulty: str = Field("medium", pattern="^(easy|medium|hard)$")
@@ -441,35 +558,3 @@ class AnswerResponse(BaseModel):
     next_question: Optional[str]
     should_continue: bool
     rounds_completed: int
-
-
-# ---------- Helper Functions to manage DB state ----------
-
-def load_mock_session(session_id: int, user_id: int) -> Dict[str, Any]:
-    row = mysql_db.fetch_one(
-        "SELECT * FROM mock_interview_sessions WHERE session_id=%s AND user_id=%s",
-        (session_id, user_id),
-    )
-    if not row:
-        raise HTTPException(status_code=404, detail="Session not found")
-
-    state = row.get("state_json") or {}
-    if isinstance(state, str):
-        try:
-            state = json.loads(state)
-        except json.JSONDecodeError:
-            state = {}
-
-    row["state_json"] = state
-    return row
-
-
-def save_mock_session(session_id: int, state: dict):
-    mysql_db.execute(
-        """
-        UPDATE mock_interview_sessions
-        SET state_json=%s, updated_at=NOW()
-        WHERE session_id=%s
-        """,
-        (json.dumps(state), session_id)
-    )    
\ No newline at end of file
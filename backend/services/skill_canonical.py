@@ -0,0 +1,213 @@
+# backend/services/skill_canonical.py
+
+import re
+import logging
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models import Skill, SkillAlias
+
+logger = logging.getLogger("services.skill_canonical")
+logger.setLevel(logging.INFO)
+
+
+# Canonical display name -> common spellings produced by resumes / LLM output.
+# Keys are normalized with normalize_skill_key, so punctuation and case
+# variants ("React.js", "ReactJS", "react js") need no separate entries.
+BUILTIN_ALIASES: Dict[str, List[str]] = {
+    "React": ["reactjs", "react js"],
+    "React Native": ["reactnative"],
+    "Node.js": ["node", "nodejs"],
+    "Express.js": ["expressjs"],
+    "Next.js": ["nextjs"],
+    "Vue.js": ["vue", "vuejs"],
+    "Angular": ["angularjs", "angular 2+"],
+    "JavaScript": ["js", "ecmascript", "es6"],
+    "Python": ["python3"],
+    "C++": ["cpp", "cplusplus"],
+    "C#": ["csharp", "c sharp"],
+    ".NET": ["dotnet", "asp.net", "net core", ".net core"],
+    "Go": ["golang"],
+    "PostgreSQL": ["postgres", "postgre", "psql"],
+    "MySQL": ["my sql"],
+    "MongoDB": ["mongo"],
+    "SQL": ["structured query language"],
+    "Machine Learning": ["ml"],
+    "Deep Learning": ["deeplearning"],
+    "Artificial Intelligence": ["ai"],
+    "Natural Language Processing": ["nlp"],
+    "Large Language Models": ["llm", "llms"],
+    "TensorFlow": ["tensor flow"],
+    "PyTorch": ["torch"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "Amazon Web Services": ["aws", "amazon aws"],
+    "Google Cloud Platform": ["gcp", "google cloud"],
+    "Microsoft Azure": ["azure"],
+    "Kubernetes": ["k8s"],
+    "Docker": ["docker containers"],
+    "CI/CD": ["cicd", "ci cd"],
+    "Git": ["git scm"],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    "Tailwind CSS": ["tailwind", "tailwindcss"],
+    "REST APIs": ["rest api", "restful", "restful apis", "restful api"],
+    "GraphQL": ["graph ql"],
+    "Power BI": ["powerbi", "microsoft power bi"],
+    "Microsoft Excel": ["excel", "ms excel"],
+    "Data Structures and Algorithms": ["dsa", "data structures & algorithms"],
+    "Object-Oriented Programming": ["oop", "oops"],
+    "FastAPI": ["fast api"],
+    "Spring Boot": ["springboot"],
+    "Linux": ["linux os"],
+}
+
+_NON_KEY_CHARS = re.compile(r"[^a-z0-9\+#]+")
+_WS_RE = re.compile(r"\s+")
+_WORD_RE = re.compile(r"[a-zA-Z0-9\-\+\.#]+")
+
+# Single words that are also skill names but usually mean something else in prose.
+AMBIGUOUS_SKILL_WORDS = {"go", "r", "c", "rest", "express", "spring", "swift", "less", "excel", "next", "node"}
+
+
+def normalize_skill_key(name: str) -> str:
+    """Case/punctuation-insensitive lookup key: 'React.js' / 'ReactJS' / 'react js' -> 'reactjs'."""
+    key = (name or "").strip().lower().replace("&", "and")
+    return _NON_KEY_CHARS.sub("", key)
+
+
+def _clean_display(name: str) -> str:
+    return _WS_RE.sub(" ", (name or "").strip())[:255]
+
+
+class SkillIndex:
+    """
+    In-memory alias index: normalized key -> canonical display name.
+    Built from BUILTIN_ALIASES, the skills table and the skill_aliases table;
+    every lookup is a dict hit. version changes whenever entries are added,
+    so callers can key derived caches on it.
+    """
+
+    def __init__(self):
+        self._by_key: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.version = 0
+        self._add_builtins()
+
+    def _add_builtins(self):
+        for canonical, aliases in BUILTIN_ALIASES.items():
+            self._by_key[normalize_skill_key(canonical)] = canonical
+            for alias in aliases:
+                self._by_key[normalize_skill_key(alias)] = canonical
+
+    def load(self):
+        """(Re)load skill names and persisted aliases from the database."""
+        by_key: Dict[str, str] = {}
+        try:
+            for row in Skill.get_all():
+                name = _clean_display(row.get("skill_name"))
+                if name:
+                    by_key.setdefault(normalize_skill_key(name), name)
+            for row in SkillAlias.get_all():
+                if row.get("alias_key") and row.get("skill_name"):
+                    by_key.setdefault(row["alias_key"], row["skill_name"])
+        except Exception as e:
+            logger.warning(f"[SkillIndex.load] DB load failed, using builtin aliases only: {e}")
+            return
+        with self._lock:
+            self._by_key = by_key
+            self._add_builtins()
+            self.loaded = True
+            self.version += 1
+        logger.info(f"[SkillIndex] Loaded {len(self._by_key)} skill keys")
+
+    def _resolve(self, key: str) -> Optional[str]:
+        hit = self._by_key.get(key)
+        if hit:
+            return hit
+        # "framer.js" for a skill stored as "Framer"; only spellings that carry
+        # the suffix are folded, so plain words like "next" stay words.
+        if key.endswith("js") and len(key) > 2:
+            return self._by_key.get(key[:-2])
+        return None
+
+    def canonical(self, name: str) -> str:
+        """
+        Canonical display name for a skill; unseen skills become their own
+        canonical form but are only added to the index once persisted
+        (see register), so arbitrary input cannot grow it.
+        """
+        key = normalize_skill_key(name)
+        if not key:
+            return ""
+        return self._resolve(key) or _clean_display(name)
+
+    def register(self, names: Iterable[str]):
+        """Add skills that now exist in the skills table, keeping any mapping already known."""
+        with self._lock:
+            for name in names:
+                key = normalize_skill_key(name)
+                if key and key not in self._by_key:
+                    self._by_key[key] = _clean_display(name)
+                    self.version += 1
+
+    def lookup(self, name_or_key: str) -> Optional[str]:
+        """Canonical name if the skill is already known; unlike canonical(), never registers it."""
+        key = normalize_skill_key(name_or_key)
+        return self._resolve(key) if key else None
+
+    def mentions(self, text: str) -> Iterator[str]:
+        """Canonical name of every known skill mentioned in free text, longest phrase first, repeats kept."""
+        words = _WORD_RE.findall((text or "").lower())
+        for i in range(len(words)):
+            for n in (3, 2, 1):
+                if i + n > len(words):
+                    continue
+                phrase = " ".join(words[i:i + n])
+                if n == 1 and phrase.strip(".") in AMBIGUOUS_SKILL_WORDS:
+                    continue
+                skill = self.lookup(phrase)
+                if skill:
+                    yield skill
+                    break
+
+    def canonical_key(self, name_or_key: str) -> str:
+        key = normalize_skill_key(name_or_key)
+        hit = self._resolve(key)
+        return normalize_skill_key(hit) if hit else key
+
+    def canonicalize_many(self, names: Iterable[str]) -> List[Tuple[str, str]]:
+        """Return (raw, canonical) pairs, deduplicated on the canonical name, input order kept."""
+        seen, out = set(), []
+        for raw in names or []:
+            canon = self.canonical(str(raw or ""))
+            key = normalize_skill_key(canon)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            out.append((str(raw).strip(), canon))
+        return out
+
+    def remember_aliases(self, pairs: Iterable[Tuple[str, str]], skill_ids: Dict[str, int]):
+        """
+        Index the now-persisted canonical skills and persist raw spellings that
+        differ from them so other workers pick them up.
+        """
+        self.register(canon for _, canon in pairs if skill_ids.get(canon.lower()))
+        rows = []
+        for raw, canon in pairs:
+            key = normalize_skill_key(raw)
+            if not key or key == normalize_skill_key(canon):
+                continue
+            sid = skill_ids.get(canon.lower())
+            if sid:
+                rows.append((key, sid))
+        if not rows:
+            return
+        try:
+            SkillAlias.bulk_add(rows)
+        except Exception as e:
+            logger.warning(f"[SkillIndex] Failed to persist aliases: {e}")
+
+
+skill_index = SkillIndex()
@@ -1,13 +1,14 @@
 import io
 import logging
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, BinaryIO
 from concurrent.futures import ThreadPoolExecutor
 from PyPDF2 import PdfReader
 
 from models import User, Skill, UserSkill
 from services.prompts import PROMPT_PARSE, PROMPT_LINKEDIN_ANALYSIS
 from services.llm_manager import run_llm
+from services.skill_canonical import skill_index
 from services.services_utils import safe_json_load, validate_resume_json, validate_linkedin_json, ExperienceList
 from services.recommendations import generate_experience_suggestions, generate_resume_improvement
 
@@ -16,32 +17,43 @@ logger.setLevel(logging.INFO)
 executor = ThreadPoolExecutor(max_workers=3)
 
 
-def extract_text_from_bytes(content: bytes, filename: str) -> str:
-    """Extract readable text from uploaded file bytes."""
+def extract_text_from_file(fileobj: BinaryIO, filename: str) -> str:
+    """Extract readable text from a seekable file handle without copying it."""
     try:
+        fileobj.seek(0)
         if filename.lower().endswith(".pdf"):
-            reader = PdfReader(io.BytesIO(content))
+            reader = PdfReader(fileobj)
             return "\n".join(page.extract_text() or "" for page in reader.pages)
-        return content.decode("utf-8", errors="ignore")
+        return fileobj.read().decode("utf-8", errors="ignore")
     except Exception as e:
-        logger.error(f"[extract_text_from_bytes] {e}")
+        logger.error(f"[extract_text_from_file] {e}")
         return ""
 
 
+def extract_text_from_bytes(content: bytes, filename: str) -> str:
+    """Extract readable text from uploaded file bytes."""
+    if not filename.lower().endswith(".pdf"):
+        return content.decode("utf-8", errors="ignore")
+    return extract_text_from_file(io.BytesIO(content), filename)
+
+
 async def process_resume(
     user_id: int,
     file_bytes: Optional[bytes] = None,
     filename: Optional[str] = None,
     file_path: Optional[str] = None,
     model_pref: str = "auto",
+    file_obj: Optional[BinaryIO] = None,
 ) -> Dict[str, Any]:
     """Enhanced resume/LinkedIn parser with improvement insights."""
     text = ""
-    if file_bytes:
+    if file_obj is not None:
+        text = extract_text_from_file(file_obj, filename or "resume.pdf")
+    elif file_bytes:
         text = extract_text_from_bytes(file_bytes, filename or "resume.pdf")
     elif file_path:
         with open(file_path, "rb") as f:
-            text = extract_text_from_bytes(f.read(), file_path)
+            text = extract_text_from_file(f, file_path)
 
     if not text.strip():
         return {"error": "Empty or unreadable file"}
@@ -57,7 +69,7 @@ async def process_resume(
     try:
         output = await run_llm(
             prompt,
-            variables={"text": text[:14000], "current_role": current_role, "target_role": target_role},
+            variables={"text": text, "current_role": current_role, "target_role": target_role},
             preference=model_pref,
         )
         parsed = safe_json_load(output, mode=mode)
@@ -123,9 +135,10 @@ def save_extracted_skills(user_id: int, skills: List[str], level: str = "Beginne
     if not skills:
         return
     try:
-        for s in skills:
-            sid = Skill.get_or_create(s)
-            UserSkill.create_or_update(user_id, sid, level)
-        logger.info(f"[save_extracted_skills] Saved {len(skills)} skills for {user_id}.")
+        pairs = skill_index.canonicalize_many(skills)
+        canonical = [c for _, c in pairs]
+        saved = UserSkill.bulk_create_or_update(user_id, canonical, level)
+        skill_index.remember_aliases(pairs, Skill.bulk_get_or_create(canonical))
+        logger.info(f"[save_extracted_skills] Saved {saved} skills for {user_id}.")
     except Exception as e:
         logger.error(f"[save_extracted_skills] DB error: {e}")
\ No newline at end of file
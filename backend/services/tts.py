@@ -0,0 +1,144 @@
+# backend/services/tts.py
+
+import re
+import base64
+import asyncio
+import logging
+from typing import AsyncIterator, List, Optional
+
+from config import settings
+from services.http_clients import http_clients
+from services.audio_cache import AudioCache
+
+logger = logging.getLogger("services.tts")
+logger.setLevel(logging.INFO)
+
+GOOGLE_TTS_URL = "https://texttospeech.googleapis.com/v1/text:synthesize"
+MAX_TTS_CHARS = 4500  # API limit is 5000 bytes of input
+TTS_CHUNK_CHARS = 300
+TTS_CHUNK_CONCURRENCY = 3
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+tts_cache = AudioCache(
+    directory=settings.TTS_CACHE_DIR,
+    max_bytes=settings.TTS_CACHE_MAX_MB * 1024 * 1024,
+)
+
+
+def _clean(text: str) -> str:
+    return (text or "").strip()[:MAX_TTS_CHARS]
+
+
+def tts_key(text: str, voice: Optional[str] = None, language: Optional[str] = None) -> str:
+    """Cache key of the MP3 for text in voice/language (the configured defaults when None)."""
+    return AudioCache.key(
+        _clean(text), voice or settings.GOOGLE_TTS_VOICE, language or settings.GOOGLE_TTS_LANGUAGE, "mp3",
+    )
+
+
+async def google_tts(text: str, voice: Optional[str] = None, language: Optional[str] = None) -> bytes:
+    """MP3 for text, from the audio cache or synthesized once and stored; b"" when unavailable."""
+    text = _clean(text)
+    if not text:
+        return b""
+    return await tts_cache.get_or_create(tts_key(text, voice, language), lambda: _synthesize(text, voice, language))
+
+
+async def _synthesize(text: str, voice: Optional[str] = None, language: Optional[str] = None) -> bytes:
+    """Synthesize text to MP3 with Google Cloud Text-to-Speech; returns b"" when unavailable."""
+    text = _clean(text)
+    api_key = settings.GOOGLE_TTS_API_KEY or settings.GOOGLE_API_KEY
+    if not text or not api_key:
+        return b""
+
+    body = {
+        "input": {"text": text},
+        "voice": {
+            "languageCode": language or settings.GOOGLE_TTS_LANGUAGE,
+            "name": voice or settings.GOOGLE_TTS_VOICE,
+        },
+        "audioConfig": {"audioEncoding": "MP3"},
+    }
+    try:
+        resp = await http_clients.request("google_tts", "POST", GOOGLE_TTS_URL, params={"key": api_key}, json=body)
+        resp.raise_for_status()
+        return base64.b64decode(resp.json().get("audioContent") or "")
+    except Exception as e:
+        logger.warning(f"[google_tts] synthesis failed: {e}")
+        return b""
+
+
+def speech_chunks(text: str, max_chars: int = TTS_CHUNK_CHARS) -> List[str]:
+    """Split text at sentence boundaries into pieces of at most max_chars (long sentences at spaces)."""
+    pieces: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_END.split((text or "").strip()):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current} {sentence}".strip()
+    if current:
+        pieces.append(current)
+    return [p for p in pieces if p]
+
+
+async def google_tts_chunks(text: str, voice: Optional[str] = None, language: Optional[str] = None) -> AsyncIterator[bytes]:
+    """
+    Synthesize text piece by piece (speech_chunks), a few pieces at a time,
+    yielding each MP3 segment in order as soon as it is ready, so playback
+    can start before the whole text is synthesized. Failed pieces yield b"".
+    """
+    limit = asyncio.Semaphore(TTS_CHUNK_CONCURRENCY)
+
+    async def synthesize(piece: str) -> bytes:
+        async with limit:
+            return await _synthesize(piece, voice, language)
+
+    tasks = [asyncio.create_task(synthesize(p)) for p in speech_chunks(text)]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def google_tts_stream(text: str, voice: Optional[str] = None, language: Optional[str] = None) -> AsyncIterator[bytes]:
+    """
+    MP3 for text as an async stream: the cached file in one piece, or on a
+    miss the google_tts_chunks segments as they are synthesized, with the
+    joined audio cached afterwards if every segment succeeded.
+    """
+    text = _clean(text)
+    if not text:
+        return
+    key = tts_key(text, voice, language)
+    cached = await asyncio.to_thread(tts_cache.read, key)
+    if cached is not None:
+        tts_cache.stats["hits"] += 1
+        yield cached
+        return
+
+    tts_cache.stats["misses"] += 1
+    parts: List[bytes] = []
+    complete = True
+    async for chunk in google_tts_chunks(text, voice, language):
+        if not chunk:
+            complete = False
+            continue
+        parts.append(chunk)
+        yield chunk
+    if complete and parts:
+        try:
+            await asyncio.to_thread(tts_cache.put, key, b"".join(parts))
+        except OSError as e:
+            logger.warning(f"[google_tts_stream] Could not cache audio: {e}")
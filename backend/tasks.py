@@ -2,6 +2,7 @@
 import os
 import json
 import time
+import asyncio
 import logging
 from celery import Celery, states
 from celery.exceptions import Ignore
@@ -9,6 +10,10 @@ from celery.exceptions import Ignore
 from config import settings
 from services.skill_extractions import process_resume
 from services.roadmap_generate import generate_roadmap
+from services.job_index import job_index, ingest_popular_roles
+from services.embeddings import embedding_service, precompute_embeddings
+from services.http_clients import http_clients
+from services.skill_canonical import skill_index
 from models import Resume
 
 logger = logging.getLogger("backend.task")
@@ -21,6 +26,10 @@ celery_app = Celery(
     broker=getattr(settings, "REDIS_URL", "redis://localhost:6379/0"),
     backend=getattr(settings, "REDIS_URL", "redis://localhost:6379/0"),
 )
+celery_app.conf.beat_schedule = {
+    "ingest-jobs": {"task": "ingest_jobs_task", "schedule": settings.JOB_SEARCH_TTL_HOURS * 3600},
+    "precompute-embeddings": {"task": "precompute_embeddings_task", "schedule": 3600},
+}
 
 
 
@@ -46,6 +55,7 @@ def parse_resume_task(self, user_id: int, resume_id: int, file_path: str):
 
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Resume file not found: {file_path}")
+        skill_index.load()
 
         
         parsed = process_resume(user_id=user_id, file_path=file_path, model_pref="auto")
@@ -88,4 +98,31 @@ def parse_resume_task(self, user_id: int, resume_id: int, file_path: str):
     except Exception as e:
         logger.error(f"[Task] ❌ Error during pipeline: {e}")
         
-        raise e
\ No newline at end of file
+        raise e
+
+
+@celery_app.task(name="ingest_jobs_task")
+def ingest_jobs_task(limit: int = None):
+    """Refresh stored postings for the most requested target roles (run by celery beat)."""
+    # Workers never run main.py's startup: without the stored skills and aliases,
+    # skill extraction sees only the builtin aliases and postings are stored degraded.
+    skill_index.load()
+
+    async def run():
+        try:
+            return await ingest_popular_roles(limit)
+        finally:
+            # Each run gets a fresh loop; its pooled clients must not outlive it.
+            await http_clients.aclose()
+
+    return asyncio.run(run())
+
+
+@celery_app.task(name="precompute_embeddings_task")
+def precompute_embeddings_task():
+    """Encode new skills, stored jobs and roadmap topics so API workers only read the vector files."""
+    if not embedding_service.enabled:
+        return {"skipped": "embeddings disabled"}
+    skill_index.load()
+    job_index.load()
+    return precompute_embeddings()
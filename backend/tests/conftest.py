@@ -0,0 +1,28 @@
+# backend/tests/conftest.py
+
+import os
+import sys
+import types
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# config.Settings reads these at import time.
+os.environ.setdefault("MYSQL_PORT", "3306")
+
+
+class _NoDatabase:
+    """Stands in for database.mysql_db: unit tests never open a MySQL pool."""
+
+    def __getattr__(self, name):
+        raise RuntimeError(f"Unit tests do not use the database (mysql_db.{name})")
+
+
+# database.py creates its connection pool on import; tests that need rows
+# patch models.mysql_db with a fake instead.
+_database = types.ModuleType("database")
+_database.mysql_db = _NoDatabase()
+_database.get_db = lambda: _database.mysql_db
+_database.init_db = lambda: None
+sys.modules["database"] = _database
@@ -0,0 +1,48 @@
+# backend/tests/test_audio_cache.py
+
+import os
+
+from services.audio_cache import AudioCache
+
+
+def _cache(tmp_path, max_bytes=1000) -> AudioCache:
+    return AudioCache(str(tmp_path), max_bytes)
+
+
+def test_put_then_read(tmp_path):
+    cache = _cache(tmp_path)
+    key = AudioCache.key("hello", "voice", "en-US", "mp3")
+    cache.put(key, b"mp3 bytes")
+    assert cache.contains(key)
+    assert cache.read(key) == b"mp3 bytes"
+    assert cache.metrics()["entries"] == 1
+
+
+def test_missing_file_reads_as_miss_and_leaves_the_index(tmp_path):
+    cache = _cache(tmp_path)
+    cache.put("k1", b"abc")
+    os.remove(cache.path("k1"))  # evicted by another worker
+    assert cache.read("k1") is None
+    assert cache.metrics()["bytes"] == 0
+    assert not cache.contains("k1")
+
+
+def test_evicts_least_recently_read(tmp_path):
+    cache = _cache(tmp_path, max_bytes=250)
+    cache.put("a", b"x" * 100)
+    cache.put("b", b"x" * 100)
+    cache.read("a")
+    cache.put("c", b"x" * 100)
+    assert cache.read("b") is None
+    assert cache.read("a") is not None and cache.read("c") is not None
+    assert not os.path.exists(cache.path("b"))
+    assert cache.stats["evictions"] == 1
+
+
+def test_load_picks_up_files_written_by_another_process(tmp_path):
+    _cache(tmp_path).put("k1", b"abcd")
+    cache = _cache(tmp_path)
+    cache.load()
+    assert cache.metrics()["entries"] == 1
+    assert cache.metrics()["bytes"] == 4
+    assert cache.read("k1") == b"abcd"
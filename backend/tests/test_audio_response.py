@@ -0,0 +1,61 @@
+# backend/tests/test_audio_response.py
+
+import pytest
+from starlette.requests import Request
+
+from routes.mock_interview import _audio_headers, _audio_response
+
+KEY = "ab" * 32
+AUDIO = bytes(range(100))
+
+
+def _request(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def _get(**headers):
+    return _audio_response(AUDIO, _request(**headers), _audio_headers(KEY))
+
+
+def test_full_response_without_range():
+    res = _get()
+    assert res.status_code == 200
+    assert res.body == AUDIO
+    assert res.headers["accept-ranges"] == "bytes"
+    assert res.headers["etag"] == f'"{KEY}"'
+
+
+@pytest.mark.parametrize("header, start, end", [
+    ("bytes=0-9", 0, 9),
+    ("bytes=90-", 90, 99),
+    ("bytes=95-500", 95, 99),
+    ("bytes=-10", 90, 99),
+    ("bytes=-500", 0, 99),
+])
+def test_single_and_suffix_ranges(header, start, end):
+    res = _get(range=header)
+    assert res.status_code == 206
+    assert res.body == AUDIO[start:end + 1]
+    assert res.headers["content-range"] == f"bytes {start}-{end}/{len(AUDIO)}"
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=150-200", "bytes=-0"])
+def test_unsatisfiable_range_is_416(header):
+    res = _get(range=header)
+    assert res.status_code == 416
+    assert res.headers["content-range"] == f"bytes */{len(AUDIO)}"
+    assert res.body == b""
+
+
+@pytest.mark.parametrize("header", ["bytes=9-0", "bytes=0-1,5-6", "items=0-9", "bytes=-"])
+def test_unsupported_or_invalid_range_serves_everything(header):
+    res = _get(range=header)
+    assert res.status_code == 200
+    assert res.body == AUDIO
+
+
+def test_matching_etag_is_304():
+    res = _get(if_none_match=f'"{KEY}"', range="bytes=0-9")
+    assert res.status_code == 304
+    assert res.body == b""
@@ -0,0 +1,49 @@
+# backend/tests/test_embeddings.py
+
+import numpy as np
+import pytest
+
+from services import embeddings
+from services.embeddings import EmbeddingService, EmbeddingStore, similar_skills
+
+DIM = 4
+VECTORS = {
+    "python": [1, 0, 0, 0],
+    "django": [0.9, 0.1, 0, 0],
+    "docker": [0, 1, 0, 0],
+}
+
+
+class _FakeModel:
+    """Maps a few known texts to fixed directions; anything else points along the last axis."""
+
+    def encode(self, texts, **kwargs):
+        out = np.array([VECTORS.get(t.lower(), [0.7, 0, 0, 0.7]) for t in texts], dtype=np.float32)
+        return out / np.linalg.norm(out, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    svc = EmbeddingService("fake-model", str(tmp_path), batch_size=8)
+    svc._model = _FakeModel()
+    for ns in EmbeddingService.NAMESPACES:
+        store = EmbeddingStore(svc.directory, ns, DIM)
+        store.load()
+        svc._stores[ns] = store
+    svc.embed("skills", {"python": "Python", "django": "Django", "docker": "Docker"})
+    monkeypatch.setattr(embeddings, "embedding_service", svc)
+    return svc
+
+
+def test_similar_skills_of_a_stored_skill(service):
+    hits = similar_skills("Python", k=2)
+    assert [h["skill"].lower() for h in hits] == ["django", "docker"]
+    assert hits[0]["similarity"] > 0.9
+
+
+def test_free_text_query_is_not_added_to_the_store(service):
+    before = len(service.store("skills")._keys)
+    hits = similar_skills("some tool nobody has heard of", k=3)
+    assert len(hits) == 3
+    assert len(service.store("skills")._keys) == before
+    assert service.store("skills").pending == 3  # only the seeded skills
@@ -0,0 +1,89 @@
+# backend/tests/test_job_matcher.py
+
+import math
+
+import numpy as np
+import pytest
+
+from services.job_matcher import BM25_B, BM25_K1, MatchBatch, job_terms, rank_jobs, skill_keys
+from services.skill_canonical import skill_index
+
+
+def _bm25(tf, df, n_docs, doc_len, avg_len):
+    idf = math.log1p((n_docs - df + 0.5) / (df + 0.5))
+    return idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * doc_len / avg_len))
+
+
+DOCS = [
+    {"python": ("Python", 3), "docker": ("Docker", 1)},
+    {"python": ("Python", 1), "kubernetes": ("Kubernetes", 1), "go": ("Go", 1)},
+    {"java": ("Java", 2)},
+]
+
+
+def test_scores_are_covered_share_of_bm25_weight():
+    batch = MatchBatch(DOCS, {"python", "go"})
+    avg_len = (4 + 3 + 2) / 3
+    w = {
+        (0, "python"): _bm25(3, 2, 3, 4, avg_len), (0, "docker"): _bm25(1, 1, 3, 4, avg_len),
+        (1, "python"): _bm25(1, 2, 3, 3, avg_len), (1, "kubernetes"): _bm25(1, 1, 3, 3, avg_len),
+        (1, "go"): _bm25(1, 1, 3, 3, avg_len),
+    }
+    expected_0 = w[0, "python"] / (w[0, "python"] + w[0, "docker"])
+    expected_1 = (w[1, "python"] + w[1, "go"]) / (w[1, "python"] + w[1, "kubernetes"] + w[1, "go"])
+    assert batch.scores == pytest.approx([expected_0, expected_1, 0.0], rel=1e-5)
+    assert batch.overlap.tolist() == [1, 2, 0]
+
+
+def test_matched_and_missing_ordered_by_weight():
+    batch = MatchBatch(DOCS, {"kubernetes"})
+    matched, missing = batch.skills(1)
+    assert matched == ["Kubernetes"]
+    # python is in two of three docs, so it weighs less than go
+    assert missing == ["Go", "Python"]
+    assert batch.skills(0) == ([], ["Docker", "Python"])
+
+
+def test_top_breaks_ties_by_overlap_then_input_order():
+    docs = [{"a": ("A", 1)}, {"a": ("A", 1)}, {"b": ("B", 1)}]
+    batch = MatchBatch(docs, {"a"})
+    assert batch.top() == [0, 1, 2]
+    assert batch.top(1, boost=np.asarray([0.0, 0.5, 0.0])) == [1]
+
+
+def test_corpus_df_overrides_batch_statistics():
+    batch = MatchBatch(DOCS[:1], {"python"}, df=lambda key: {"python": 90, "docker": 1}[key], n_docs=100)
+    w_python = _bm25(3, 90, 100, 4, 4)
+    w_docker = _bm25(1, 1, 100, 4, 4)
+    assert batch.scores[0] == pytest.approx(w_python / (w_python + w_docker), rel=1e-5)
+
+
+def test_job_terms_counts_text_mentions_and_required_skills():
+    job = {
+        "role": "Python Developer",
+        "description": "Python services on AWS. Python and Docker daily.",
+        "required_skills": ["Kubernetes", "python"],
+    }
+    terms = job_terms(job)
+    assert terms[skill_index.canonical_key("Python")] == ("Python", 3)
+    assert terms[skill_index.canonical_key("AWS")] == ("Amazon Web Services", 1)
+    assert terms[skill_index.canonical_key("Kubernetes")] == ("Kubernetes", 1)
+
+
+def test_job_terms_refresh_when_skill_index_grows():
+    job = {"role": "Engineer", "description": "Ships Zig tooling"}
+    assert skill_index.canonical_key("Zig") not in job_terms(job)
+    skill_index.register(["Zig"])
+    assert skill_index.canonical_key("Zig") in job_terms(job)
+
+
+def test_rank_jobs_annotates_in_rank_order():
+    jobs = [
+        {"role": "Java Developer", "required_skills": ["Java", "Spring Boot"]},
+        {"role": "Python Developer", "required_skills": ["Python", "FastAPI"]},
+    ]
+    ranked = rank_jobs(jobs, ["python", "fast api"])
+    assert [j["role"] for j in ranked] == ["Python Developer", "Java Developer"]
+    assert ranked[0]["match_percent"] == 100.0
+    assert ranked[1]["matched_skills"] == []
+    assert skill_keys(["ReactJS", "", None]) == {skill_index.canonical_key("React")}
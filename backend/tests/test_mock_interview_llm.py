@@ -0,0 +1,57 @@
+# backend/tests/test_mock_interview_llm.py
+
+import json
+
+import pytest
+
+from services.mock_interview_llm import SummaryStream
+
+
+SUMMARY = 'Said "hi"\tthen\\left\r\nline2 café \U0001F600 / done'
+RESPONSE = json.dumps({
+    "feedback": {"summary": SUMMARY, "strengths": ["x"]},
+    "control": {"penalty_seconds": 0},
+})
+
+
+def _stream(chunks):
+    stream = SummaryStream()
+    return [stream.feed(c) for c in chunks]
+
+
+def test_whole_response_decodes_summary():
+    assert "".join(_stream([RESPONSE])) == SUMMARY
+
+
+@pytest.mark.parametrize("cut", range(1, len(RESPONSE)))
+def test_any_split_point_decodes_the_same(cut):
+    assert "".join(_stream([RESPONSE[:cut], RESPONSE[cut:]])) == SUMMARY
+
+
+def test_one_character_chunks():
+    assert "".join(_stream(list(RESPONSE))) == SUMMARY
+
+
+@pytest.mark.parametrize("head, tail, expected", [
+    ('{"summary": "a\\', 'nb"}', "a\nb"),
+    ('{"summary": "a\\', '"b"}', 'a"b'),
+    ('{"summary": "caf\\u00', 'e9"}', "café"),
+    ('{"summary": "\\ud83d', '\\ude00"}', "\U0001F600"),
+    ('{"summary": "\\ud83d\\ude', '00"}', "\U0001F600"),
+])
+def test_escape_split_across_chunks_is_held_back(head, tail, expected):
+    first, second = _stream([head, tail])
+    assert not first.endswith("\\")
+    assert first + second == expected
+
+
+def test_nothing_emitted_before_summary_key():
+    out = _stream(['{"feedback": {"strengths": ["clear"], "summ', 'ary": "ok', '"}}'])
+    assert out == ["", "ok", ""]
+
+
+def test_stops_at_closing_quote():
+    stream = SummaryStream()
+    assert stream.feed('{"summary": "done", "improvements": ["more') == "done"
+    assert stream.feed(' detail"], "summary_extra": "x"}') == ""
+    assert stream.text.endswith('"x"}')
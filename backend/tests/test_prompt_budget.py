@@ -0,0 +1,64 @@
+# backend/tests/test_prompt_budget.py
+
+import json
+
+from services.prompt_budget import (
+    budget_variables,
+    compact_history_json,
+    compress_text,
+    count_tokens,
+    input_token_budget,
+    truncate_to_tokens,
+)
+from services.prompt_templates import PromptTemplate
+
+
+def test_count_tokens_uses_provider_ratio():
+    assert count_tokens("", "Gemini") == 0
+    assert count_tokens("a" * 8, "Gemini") == 2
+    assert count_tokens("a" * 8, "HuggingFace") == 3  # ceil(8 / 3.5)
+
+
+def test_input_budget_reserves_completion():
+    assert input_token_budget("HuggingFace", output_tokens=30_000) == 32_768 - 30_000
+    assert input_token_budget("Unknown", output_tokens=40_000) == 0
+
+
+def test_compress_text_collapses_whitespace_and_repeated_lines():
+    text = "Page Header\nJohn   Doe\t\tEngineer\n\n\n\nPage Header\nok\nok"
+    assert compress_text(text) == "Page Header\nJohn Doe Engineer\n\nok\nok"
+
+
+def test_compact_history_keeps_recent_turns_verbatim():
+    turns = [
+        {"interviewer_name": f"I{i}", "question": f"q{i}", "answer": "x" * 500, "feedback": {"score": i}}
+        for i in range(5)
+    ]
+    compacted = json.loads(compact_history_json(json.dumps(turns), keep_last=2, max_field_chars=10))
+    assert compacted[-2:] == turns[-2:]
+    assert compacted[0] == {"interviewer_name": "I0", "question": "q0", "answer": "x" * 10 + "…", "score": 0}
+
+
+def test_compact_history_leaves_short_or_invalid_input():
+    assert compact_history_json("not json") == "not json"
+    assert compact_history_json("[1, 2]") == "[1, 2]"
+
+
+def test_truncate_prefers_line_boundary():
+    text = "a" * 30 + "\n" + "b" * 20
+    assert truncate_to_tokens(text, 100, "Gemini") == text
+    assert truncate_to_tokens(text, 9, "Gemini") == "a" * 30
+
+
+def test_budget_variables_keeps_fixed_and_trims_compressible():
+    template = PromptTemplate("t", "Role {role}. Resume: {text}")
+    out = budget_variables(template, {"role": "Data Engineer", "text": "word " * 200_000}, model="Gemini")
+    assert out["role"] == "Data Engineer"
+    used = count_tokens(template.render(out), "Gemini")
+    assert used <= input_token_budget("Gemini")
+    assert len(out["text"]) > 0
+
+
+def test_budget_variables_untouched_when_within_budget():
+    template = PromptTemplate("t", "Resume: {text}")
+    assert budget_variables(template, {"text": "short", "unused": 1}) == {"text": "short", "unused": "1"}
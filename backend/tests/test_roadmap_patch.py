@@ -0,0 +1,138 @@
+# backend/tests/test_roadmap_patch.py
+
+from contextlib import contextmanager
+
+import pytest
+
+import models
+from models import RoadmapStep, RoadmapVersionConflict
+from services.roadmap_patch import (
+    RoadmapPatchError,
+    apply_completion_deltas,
+    apply_json_patch,
+    calculate_completion,
+)
+
+
+def _doc():
+    return {
+        "overview": {"title": "Backend"},
+        "curriculum": [
+            {"title": "Basics", "topics": [{"title": "HTTP"}, {"title": "SQL"}]},
+            {"title": "Advanced", "topics": [{"title": "Caching"}]},
+        ],
+        "skills": {"skills_to_focus": ["Python", "Docker"], "skills_to_improve": []},
+    }
+
+
+def test_add_replace_remove():
+    doc = _doc()
+    out = apply_json_patch(doc, [
+        {"op": "add", "path": "/curriculum/0/topics/-", "value": {"title": "REST"}},
+        {"op": "replace", "path": "/overview/title", "value": "Backend Engineer"},
+        {"op": "remove", "path": "/curriculum/1"},
+    ])
+    assert [t["title"] for t in out["curriculum"][0]["topics"]] == ["HTTP", "SQL", "REST"]
+    assert out["overview"]["title"] == "Backend Engineer"
+    assert len(out["curriculum"]) == 1
+    assert doc == _doc()  # input untouched
+
+
+def test_move_copy_and_escaped_pointer():
+    out = apply_json_patch({"a/b": 1, "x": {"y": [1, 2]}}, [
+        {"op": "copy", "from": "/x/y/1", "path": "/x/y/0"},
+        {"op": "move", "from": "/a~1b", "path": "/moved"},
+    ])
+    assert out == {"x": {"y": [2, 1, 2]}, "moved": 1}
+
+
+@pytest.mark.parametrize("ops", [
+    [{"op": "remove", "path": "/missing"}],
+    [{"op": "replace", "path": "/curriculum/5", "value": {}}],
+    [{"op": "add", "path": "/curriculum/01", "value": {}}],
+    [{"op": "test", "path": "/overview/title", "value": "Frontend"}],
+    [{"op": "move", "from": "/curriculum", "path": "/curriculum/0"}],
+    [{"op": "add", "path": "overview", "value": 1}],
+    [{"op": "add", "path": "/x"}],
+    [{"op": "merge", "path": "/x", "value": 1}],
+])
+def test_invalid_operations_raise(ops):
+    with pytest.raises(RoadmapPatchError):
+        apply_json_patch(_doc(), ops)
+
+
+def test_failing_operation_aborts_whole_patch():
+    doc = _doc()
+    with pytest.raises(RoadmapPatchError):
+        apply_json_patch(doc, [
+            {"op": "replace", "path": "/overview/title", "value": "changed"},
+            {"op": "remove", "path": "/nope"},
+        ])
+    assert doc["overview"]["title"] == "Backend"
+
+
+def test_completion_deltas_and_percentage():
+    out = apply_completion_deltas(
+        _doc(),
+        topics=[{"phase": 0, "topic": 1, "completed": True}],
+        skills=[{"category": "skills_to_focus", "index": 0, "completed": True}],
+    )
+    assert out["curriculum"][0]["topics"][1]["completed"] is True
+    assert out["skills"]["skills_to_focus"][0] == {"name": "Python", "completed": True}
+    assert calculate_completion(out) == 40  # 2 of 5
+    with pytest.raises(RoadmapPatchError):
+        apply_completion_deltas(_doc(), topics=[{"phase": 3, "topic": 0, "completed": True}])
+
+
+@pytest.mark.parametrize("value", [[], "roadmap", 3, None])
+def test_root_replaced_with_non_object_is_rejected(value):
+    doc = apply_json_patch(_doc(), [{"op": "replace", "path": "", "value": value}])
+    with pytest.raises(RoadmapPatchError):
+        apply_completion_deltas(doc)
+
+
+def test_completion_ignores_malformed_sections():
+    doc = apply_json_patch(_doc(), [
+        {"op": "replace", "path": "/skills", "value": "none"},
+        {"op": "replace", "path": "/curriculum/1/topics", "value": 4},
+    ])
+    out = apply_completion_deltas(doc, topics=[{"phase": 0, "topic": 0, "completed": True}])
+    assert calculate_completion(out) == 50  # 1 of the 2 remaining topics
+    with pytest.raises(RoadmapPatchError):
+        apply_completion_deltas(doc, skills=[{"category": "skills_to_focus", "index": 0, "completed": True}])
+
+
+class _Cursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.executed = []
+
+    def execute(self, query, params=None):
+        self.executed.append(query)
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+
+def _fake_db(monkeypatch, cursor):
+    class FakeDB:
+        @contextmanager
+        def get_cursor(self, dictionary=True):
+            yield cursor
+
+    monkeypatch.setattr(models, "mysql_db", FakeDB())
+
+
+def test_patch_content_rejects_stale_version(monkeypatch):
+    cursor = _Cursor([{"content_version": 4}])
+    _fake_db(monkeypatch, cursor)
+    with pytest.raises(RoadmapVersionConflict) as exc:
+        RoadmapStep.patch_content(1, 2, 3, lambda doc: pytest.fail("must not apply"))
+    assert exc.value.current_version == 4
+    assert not any(q.lstrip().startswith("UPDATE") for q in cursor.executed)
+
+
+def test_patch_content_missing_roadmap(monkeypatch):
+    _fake_db(monkeypatch, _Cursor([]))
+    with pytest.raises(LookupError):
+        RoadmapStep.patch_content(1, 2, None, lambda doc: (doc, 0))
@@ -0,0 +1,66 @@
+# backend/tests/test_roadmap_stream.py
+
+import asyncio
+import json
+
+import pytest
+
+from services import roadmap_stream
+from services.roadmap_stream import RoadmapGeneration, fail_if_stale, replay_persisted, seen_sections
+
+
+def _parse(payload):
+    fields = dict(line.split(": ", 1) for line in payload.strip().split("\n"))
+    return fields.get("id"), fields["event"], json.loads(fields["data"])
+
+
+async def _collect(agen):
+    return [_parse(p) async for p in agen]
+
+
+def test_seen_sections_ignores_unknown_ids():
+    assert seen_sections("overview,skills") == {"overview", "skills"}
+    assert seen_sections("3") == set()
+    assert seen_sections(None) == set()
+
+
+def test_live_ids_accumulate_in_finish_order_and_last_event_id_skips():
+    gen = RoadmapGeneration(1, 7)
+    gen._publish("section", {"section": "skills"}, "skills")
+    gen._publish("section", {"section": "overview"}, "overview")
+    gen._publish("section", {"section": "networking"}, "networking")
+    gen._publish("complete", {"roadmap_id": 1})
+    gen.done = True
+
+    events = asyncio.run(_collect(gen.stream()))
+    assert [e[0] for e in events] == ["skills", "overview,skills", "overview,skills,networking", None]
+
+    resumed = asyncio.run(_collect(gen.stream("overview,skills")))
+    assert [(e[0], e[1]) for e in resumed] == [("overview,skills,networking", "section"), (None, "complete")]
+
+
+def test_replay_skips_sections_the_client_has():
+    document = {"overview": {"a": 1}, "skills": [], "curriculum": [], "generation_status": "generating"}
+    events = asyncio.run(_collect(replay_persisted(1, document, "skills")))
+    assert [(e[0], e[2].get("section")) for e in events] == [
+        ("overview,skills", "overview"),
+        ("overview,curriculum,skills", "curriculum"),
+        (None, None),
+    ]
+    assert events[-1][1] == "pending"
+
+
+@pytest.mark.parametrize("age, expected", [(60, "generating"), (10 ** 6, "failed"), (None, "failed")])
+def test_fail_if_stale_uses_the_last_write_age(monkeypatch, age, expected):
+    written = []
+    monkeypatch.setattr(roadmap_stream.RoadmapStep, "content_age_seconds", staticmethod(lambda rid: age))
+    monkeypatch.setattr(roadmap_stream.RoadmapStep, "update_content", staticmethod(lambda rid, doc: written.append(doc)))
+
+    document = fail_if_stale(1, {"overview": {}, "generation_status": "generating"})
+    assert document["generation_status"] == expected
+    assert len(written) == (expected == "failed")
+
+
+def test_fail_if_stale_leaves_finished_roadmaps_alone(monkeypatch):
+    monkeypatch.setattr(roadmap_stream.RoadmapStep, "content_age_seconds", staticmethod(lambda rid: 10 ** 6))
+    assert fail_if_stale(1, {"generation_status": "completed"})["generation_status"] == "completed"
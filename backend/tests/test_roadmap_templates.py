@@ -0,0 +1,79 @@
+# backend/tests/test_roadmap_templates.py
+
+import asyncio
+
+import pytest
+
+from services import roadmap_templates as templates_module
+from services.roadmap_templates import RoadmapTemplateCache
+
+TEMPLATE = {"overview": {"title": "Data Engineer"}, "curriculum": [{"phase": 1}], "networking": []}
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    rows = []
+    monkeypatch.setattr(templates_module.RoadmapTemplate, "get", staticmethod(lambda key: None))
+    monkeypatch.setattr(templates_module.RoadmapTemplate, "upsert", staticmethod(lambda *args: rows.append(args)))
+    return rows
+
+
+async def _until_waiting(cache, n):
+    while cache.stats["coalesced"] < n:  # waiters look in the DB (a thread) first
+        await asyncio.sleep(0.001)
+
+
+async def _build_concurrently(cache, store):
+    first = await cache.acquire("k")
+    assert first is None  # this request builds
+    waiters = [asyncio.ensure_future(cache.acquire("k")) for _ in range(3)]
+    await _until_waiting(cache, 3)
+    await cache.release("k", TEMPLATE, {"target_role": "Data Engineer"}, store=store)
+    return await asyncio.gather(*waiters)
+
+
+def test_waiters_share_an_unstored_build(stored):
+    cache = RoadmapTemplateCache(max_entries=10, ttl_seconds=3600)
+
+    async def run():
+        got = await _build_concurrently(cache, store=False)
+        later = await cache.acquire("k")
+        await cache.release("k")
+        return got, later
+
+    got, later = asyncio.run(run())
+    assert got == [TEMPLATE] * 3
+    assert got[0] is not got[1]  # private copies
+    assert later is None  # not cached: the next request builds again
+    assert stored == []
+    assert cache.stats["coalesced"] == 3
+
+
+def test_stored_build_serves_later_requests(stored):
+    cache = RoadmapTemplateCache(max_entries=10, ttl_seconds=3600)
+
+    async def run():
+        got = await _build_concurrently(cache, store=True)
+        return got, await cache.acquire("k")
+
+    got, later = asyncio.run(run())
+    assert got == [TEMPLATE] * 3
+    assert later == TEMPLATE
+    assert len(stored) == 1
+
+
+def test_failed_build_hands_over_to_one_waiter(stored):
+    cache = RoadmapTemplateCache(max_entries=10, ttl_seconds=3600)
+
+    async def run():
+        assert await cache.acquire("k") is None
+        waiters = [asyncio.ensure_future(cache.acquire("k")) for _ in range(2)]
+        await _until_waiting(cache, 2)
+        await cache.release("k")  # build failed
+        done, pending = await asyncio.wait(waiters, timeout=0.5)
+        assert [t.result() for t in done] == [None]  # the next builder
+        await _until_waiting(cache, 3)
+        await cache.release("k", TEMPLATE, store=False)
+        return await asyncio.gather(*pending)
+
+    assert asyncio.run(run()) == [TEMPLATE]
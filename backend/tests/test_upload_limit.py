@@ -0,0 +1,64 @@
+# backend/tests/test_upload_limit.py
+
+import asyncio
+
+from fastapi import HTTPException
+
+from services.services_utils import UploadSizeLimit
+
+PATH = "/api/user/upload/resume"
+
+
+async def _echo_app(scope, receive, send):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+def _call(path, chunks, content_length=None, limit=10):
+    headers = [] if content_length is None else [(b"content-length", str(content_length).encode())]
+    scope = {"type": "http", "method": "POST", "path": path, "headers": headers}
+    messages = [{"type": "http.request", "body": c, "more_body": i < len(chunks) - 1} for i, c in enumerate(chunks)]
+    sent, pulled = [], []
+
+    async def receive():
+        message = messages.pop(0)
+        pulled.append(message)
+        return message
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(UploadSizeLimit(_echo_app, {PATH: limit})(scope, receive, send))
+    return sent, pulled
+
+
+def test_declared_length_over_limit_is_refused_before_reading():
+    sent, pulled = _call(PATH, [b"x" * 20], content_length=20)
+    assert sent[0]["status"] == 413
+    assert pulled == []
+
+
+def test_body_within_limit_passes_through():
+    sent, _ = _call(PATH, [b"abc", b"def"], content_length=6)
+    assert sent[0]["status"] == 200
+    assert sent[1]["body"] == b"abcdef"
+
+
+def test_undeclared_body_is_cut_off_at_the_limit():
+    try:
+        _call(PATH, [b"x" * 6, b"x" * 6, b"x" * 6])
+    except HTTPException as e:
+        assert e.status_code == 413
+    else:
+        raise AssertionError("expected a 413")
+
+
+def test_other_paths_are_not_limited():
+    sent, _ = _call("/api/user/profile", [b"x" * 20], content_length=20)
+    assert sent[0]["status"] == 200
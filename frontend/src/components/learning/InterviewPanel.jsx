@@ -2,6 +2,8 @@
 import React, { useEffect, useRef, useState } from "react";
 import {
   sendMockAnswer,
+  getMockFeedback,
+  openMockInterviewSocket,
   transcribeMockAudio,
   getMockReport,
 } from "../../utils/api";
@@ -34,6 +36,19 @@ const PREFERRED_VOICE_NAMES = [
   "Microsoft David Desktop",
 ];
 
+const FEEDBACK_POLL_ATTEMPTS = 5;
+const SOCKET_RETRY_MS = 2000;
+
+const feedbackMessage = (feedback = {}, penalty = 0, penaltyReason = "") => ({
+  type: "feedback",
+  summary: feedback.summary,
+  strengths: feedback.strengths || [],
+  improvements: feedback.improvements || [],
+  score: feedback.score,
+  penalty,
+  penalty_reason: penaltyReason,
+});
+
 const formatTime = (s) =>
   `${Math.floor(s / 60)}:${String(s % 60).padStart(2, "0")}`;
 
@@ -46,6 +61,7 @@ export default function InterviewPanel({ session, onClose, onHistoryRefresh }) {
   const [interviewers, setInterviewers] = useState(session.interviewers || []);
   const [messages, setMessages] = useState([]);
   const [currentIndex, setCurrentIndex] = useState(0);
+  const [turnIndex, setTurnIndex] = useState(0);
   const [answerText, setAnswerText] = useState("");
   const [loading, setLoading] = useState(false);
   const [recording, setRecording] = useState(false);
@@ -68,6 +84,11 @@ export default function InterviewPanel({ session, onClose, onHistoryRefresh }) {
   const [interviewerVoices, setInterviewerVoices] = useState({});
   const greetingPlayedRef = useRef(false);
 
+  const socketRef = useRef(null);
+  const lastSeqRef = useRef(0);
+  const liveEventRef = useRef(null);
+  const interviewEndedRef = useRef(false);
+
   useEffect(() => {
     if (typeof window === "undefined" || !window.speechSynthesis) return;
 
@@ -247,6 +268,175 @@ export default function InterviewPanel({ session, onClose, onHistoryRefresh }) {
     setRecording(false);
   };
 
+  const applyPenalty = (penaltySeconds) => {
+    const penalty = Number(penaltySeconds) || 0;
+    if (penalty > 0) {
+      setRemainingSeconds((prev) => Math.max(0, prev - penalty));
+    }
+  };
+
+  // The next question arrives first; feedback for the answer is evaluated
+  // server-side in the background and filled into its placeholder here.
+  const loadFeedback = async (turn) => {
+    const fill = (message) =>
+      setMessages((m) =>
+        m.map((msg) =>
+          msg.type === "feedback" && msg.turn === turn
+            ? { ...message, turn }
+            : msg
+        )
+      );
+
+    for (let attempt = 0; attempt < FEEDBACK_POLL_ATTEMPTS; attempt++) {
+      try {
+        const res = await getMockFeedback(session.session_id, turn);
+        if (!res.pending) {
+          fill(
+            feedbackMessage(res.feedback, res.penalty_seconds, res.penalty_reason)
+          );
+          applyPenalty(res.penalty_seconds);
+          return;
+        }
+      } catch (err) {
+        console.error(err);
+        break;
+      }
+    }
+    fill(
+      feedbackMessage({
+        summary: "Feedback is not ready yet; it will be included in the final report.",
+      })
+    );
+  };
+
+  const showNextQuestion = (text, name) => {
+    const byName = interviewers.findIndex((iv) => iv.name === name);
+    const nextIndex =
+      byName >= 0
+        ? byName
+        : interviewers.length > 0
+        ? (currentIndex + 1) % interviewers.length
+        : 0;
+
+    setCurrentIndex(nextIndex);
+    setQuestion(text);
+    setAnswerText("");
+
+    const nextName =
+      interviewers[nextIndex]?.name || interviewers[0]?.name || "Interviewer";
+
+    setMessages((m) => [
+      ...m,
+      {
+        type: "interviewer",
+        name: nextName,
+        text,
+      },
+    ]);
+
+    speak(text, nextName);
+  };
+
+  // Events from the live socket; events replayed after a reconnect that
+  // were already handled are skipped by sequence number.
+  const handleLiveEvent = (event) => {
+    if (event.seq) {
+      if (event.seq <= lastSeqRef.current) return;
+      lastSeqRef.current = event.seq;
+    }
+
+    switch (event.type) {
+      case "state":
+        // A new server-side session (restart or another worker) numbers from
+        // its own start; catch up on a question we have not shown yet.
+        if (event.last_seq < lastSeqRef.current) lastSeqRef.current = event.last_seq;
+        if (event.status === "active" && event.turn_index > turnIndex) {
+          setTurnIndex(event.turn_index);
+          setLoading(false);
+          showNextQuestion(event.question, event.interviewer_name);
+        }
+        break;
+      case "question":
+        setTurnIndex(event.turn_index);
+        setLoading(false);
+        showNextQuestion(event.question, event.interviewer_name);
+        break;
+      case "feedback_delta":
+        setMessages((m) =>
+          m.map((msg) =>
+            msg.type === "feedback" && msg.pending && msg.turn === event.turn_index
+              ? { ...msg, streamed: (msg.streamed || "") + event.text }
+              : msg
+          )
+        );
+        break;
+      case "feedback":
+        setMessages((m) =>
+          m.map((msg) =>
+            msg.type === "feedback" && msg.turn === event.turn_index
+              ? {
+                  ...feedbackMessage(
+                    event.feedback,
+                    event.penalty_seconds,
+                    event.penalty_reason
+                  ),
+                  turn: event.turn_index,
+                }
+              : msg
+          )
+        );
+        applyPenalty(event.penalty_seconds);
+        break;
+      case "completed":
+        setLoading(false);
+        endInterview();
+        break;
+      case "error":
+        setLoading(false);
+        setMessages((m) => [...m, { type: "system", text: event.detail }]);
+        break;
+      default:
+        break;
+    }
+  };
+  liveEventRef.current = handleLiveEvent;
+
+  useEffect(() => {
+    if (isHistory || !session.session_id) return;
+
+    let closed = false;
+    let retry = null;
+
+    const connect = () => {
+      const ws = openMockInterviewSocket(session.session_id, {
+        lastSeq: lastSeqRef.current,
+      });
+      ws.onmessage = (e) => {
+        try {
+          liveEventRef.current(JSON.parse(e.data));
+        } catch (err) {
+          console.error(err);
+        }
+      };
+      ws.onclose = () => {
+        if (socketRef.current === ws) socketRef.current = null;
+        if (!closed && !interviewEndedRef.current) {
+          retry = setTimeout(connect, SOCKET_RETRY_MS);
+        }
+      };
+      socketRef.current = ws;
+    };
+
+    connect();
+
+    return () => {
+      closed = true;
+      clearTimeout(retry);
+      if (socketRef.current) socketRef.current.close();
+      socketRef.current = null;
+    };
+  }, [isHistory, session.session_id]);
+
   const submitAnswer = async (skipped = false) => {
     if (isHistory) return;
     if (!question) return alert("Start the interview first.");
@@ -254,12 +444,34 @@ export default function InterviewPanel({ session, onClose, onHistoryRefresh }) {
 
     setLoading(true);
 
+    const ws = socketRef.current;
+    if (ws && ws.readyState === WebSocket.OPEN) {
+      // The reply (next question, streamed feedback) arrives as socket events.
+      ws.send(
+        JSON.stringify({
+          type: "answer",
+          turn_index: turnIndex,
+          answer: answerText,
+          skipped,
+          elapsed_seconds: 8,
+        })
+      );
+      setMessages((m) => [
+        ...m,
+        { type: "user", text: skipped ? "[Skipped]" : answerText },
+        { type: "feedback", pending: true, turn: turnIndex },
+      ]);
+      return;
+    }
+
     try {
       const res = await sendMockAnswer(session.session_id, answerText, {
         skipped,
         elapsed_seconds: 8,
+        turn_index: turnIndex,
       });
 
+      const answeredTurn = res.turn_index ?? turnIndex;
       
       setMessages((m) => [
         ...m,
@@ -267,49 +479,21 @@ export default function InterviewPanel({ session, onClose, onHistoryRefresh }) {
           type: "user",
           text: skipped ? "[Skipped]" : answerText,
         },
-        {
-          type: "feedback",
-          summary: res.feedback.summary,
-          strengths: res.feedback.strengths || [],
-          improvements: res.feedback.improvements || [],
-          score: res.feedback.score,
-          penalty: res.penalty_seconds,
-          penalty_reason: res.penalty_reason,
-        },
+        res.feedback_pending
+          ? { type: "feedback", pending: true, turn: answeredTurn }
+          : feedbackMessage(res.feedback, res.penalty_seconds, res.penalty_reason),
       ]);
 
-     
-      const penalty = Number(res.penalty_seconds) || 0;
-      if (penalty > 0) {
-        setRemainingSeconds((prev) => Math.max(0, prev - penalty));
+      if (res.feedback_pending) {
+        loadFeedback(answeredTurn);
+      } else {
+        applyPenalty(res.penalty_seconds);
       }
 
 
       if (res.should_continue && res.next_question) {
-        const nextIndex =
-          interviewers.length > 0
-            ? (currentIndex + 1) % interviewers.length
-            : 0;
-
-        setCurrentIndex(nextIndex);
-        setQuestion(res.next_question);
-        setAnswerText("");
-
-        const nextName =
-          interviewers[nextIndex]?.name ||
-          interviewers[0]?.name ||
-          "Interviewer";
-
-        setMessages((m) => [
-          ...m,
-          {
-            type: "interviewer",
-            name: nextName,
-            text: res.next_question,
-          },
-        ]);
-
-        speak(res.next_question, nextName);
+        setTurnIndex(answeredTurn + 1);
+        showNextQuestion(res.next_question);
       } else {
         await endInterview();
       }
@@ -327,6 +511,8 @@ export default function InterviewPanel({ session, onClose, onHistoryRefresh }) {
   const endInterview = async () => {
     if (interviewEnded) return;
     setInterviewEnded(true);
+    interviewEndedRef.current = true;
+    if (socketRef.current) socketRef.current.close();
     clearInterval(timerRef.current);
     stopAllSpeech();
 
@@ -689,7 +875,14 @@ export default function InterviewPanel({ session, onClose, onHistoryRefresh }) {
                     </div>
                   )}
 
-                  {msg.type === "feedback" && (
+                  {msg.type === "feedback" && msg.pending && (
+                    <div className="flex items-start gap-2 text-fuchsia-400">
+                      <Loader2 className="w-3 h-3 mt-0.5 shrink-0 animate-spin" />
+                      <span>{msg.streamed || "Evaluating your answer..."}</span>
+                    </div>
+                  )}
+
+                  {msg.type === "feedback" && !msg.pending && (
                     <div className="space-y-1">
                       <div className="font-bold text-fuchsia-400 flex items-center gap-1">
                         <CheckCircle className="w-3 h-3" />
@@ -21,7 +21,7 @@ import {
 } from "lucide-react";
 
 import { useAppContext } from "../../context/AppContext";
-import { updateRoadmapContent } from "../../utils/api";
+import { patchRoadmapContent } from "../../utils/api";
 
 
 const detectResourceType = (url = "") => {
@@ -315,7 +315,7 @@ const RoadmapViewer = ({ setView, currentRoadmap, onRegenerate }) => {
     return total === 0 ? 0 : Math.round((done / total) * 100);
   };
 
-  const syncUpdate = (updatedRoadmap) => {
+  const syncUpdate = (updatedRoadmap, changes) => {
     const newPercent = calculateProgress(updatedRoadmap);
     updatedRoadmap.completion_percentage = newPercent;
     
@@ -324,7 +324,7 @@ const RoadmapViewer = ({ setView, currentRoadmap, onRegenerate }) => {
     
     const rId = updatedRoadmap.roadmap_id || updatedRoadmap.metadata?.roadmap_id;
     if (rId) {
-        updateRoadmapContent(rId, updatedRoadmap, newPercent).catch(console.error);
+        patchRoadmapContent(rId, changes).catch(console.error);
     }
   };
 
@@ -332,7 +332,7 @@ const RoadmapViewer = ({ setView, currentRoadmap, onRegenerate }) => {
     const clone = JSON.parse(JSON.stringify(localRoadmap));
     const topic = clone.curriculum[phaseIdx].topics[topicIdx];
     topic.completed = !topic.completed;
-    syncUpdate(clone);
+    syncUpdate(clone, { topics: [{ phase: phaseIdx, topic: topicIdx, completed: topic.completed }] });
   };
 
   const handleSkillToggle = (category, idx) => {
@@ -346,7 +346,7 @@ const RoadmapViewer = ({ setView, currentRoadmap, onRegenerate }) => {
         list[idx].completed = !item.completed;
     }
     
-    syncUpdate(clone);
+    syncUpdate(clone, { skills: [{ category, index: idx, completed: list[idx].completed }] });
   };
 
   const openResource = (url) => {
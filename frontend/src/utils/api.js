@@ -245,6 +245,12 @@ export const updateRoadmapContent = async (roadmap_id, fullJson, percent) => {
   return res.data;
 };
 
+// changes: { topics: [{phase, topic, completed}], skills: [{category, index, completed}], operations, version }
+export const patchRoadmapContent = async (roadmap_id, changes) => {
+  const res = await api.patch(`/api/roadmap/${roadmap_id}/content`, changes);
+  return res.data;
+};
+
 export async function getMockReport(sessionId) {
   const res = await api.get(`/api/mock-interview/${sessionId}/report`);
   return res.data;
@@ -274,6 +280,7 @@ export async function sendMockAnswer(sessionId, answerText, options = {}) {
     elapsed_seconds: options.elapsed_seconds || 0,
     skipped: options.skipped || false,
     penalty_seconds: options.penalty_seconds || 0,
+    turn_index: options.turn_index ?? null,
   };
 
   const res = await api.post(`/api/mock-interview/${sessionId}/answer`, payload);
@@ -281,6 +288,30 @@ export async function sendMockAnswer(sessionId, answerText, options = {}) {
 }
 
 
+export async function getMockFeedback(sessionId, turnIndex) {
+  const res = await api.get(
+    `/api/mock-interview/${sessionId}/feedback/${turnIndex}`
+  );
+  return res.data;
+}
+
+
+// Live transport for a running interview; see the backend's
+// /api/mock-interview/{id}/ws for the message protocol. The token goes in
+// the first message rather than the URL, which ends up in access logs.
+export function openMockInterviewSocket(sessionId, { lastSeq = 0, audio = false } = {}) {
+  const token = authToken || localStorage.getItem("authToken") || "";
+  const params = new URLSearchParams({
+    last_seq: String(lastSeq),
+    audio: String(audio),
+  });
+  const base = API_BASE_URL.replace(/^http/, "ws");
+  const ws = new WebSocket(`${base}/api/mock-interview/${sessionId}/ws?${params}`);
+  ws.addEventListener("open", () => ws.send(JSON.stringify({ type: "auth", token })));
+  return ws;
+}
+
+
 export async function transcribeMockAudio(formData) {
   const res = await api.post(
     "/api/mock-interview/transcribe-audio",
@@ -288,4 +319,4 @@ export async function transcribeMockAudio(formData) {
     { headers: { "Content-Type": "multipart/form-data" } }
   );
   return res.data;
-}
\ No newline at end of file
+}
\ No newline at end of file